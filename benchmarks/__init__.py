@@ -0,0 +1,5 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
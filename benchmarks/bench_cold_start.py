@@ -0,0 +1,57 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter so every measurement starts from a cold import cache.
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    status = client.get("/api/hc").status_code
+served = time.perf_counter()
+print(json.dumps({"import_s": imported - start, "first_request_s": served - imported, "total_s": served - start,
+                  "status": status, "pandas_loaded": "pandas" in sys.modules}))
+"""
+
+
+def measure(database_url: str) -> dict:
+    env = dict(os.environ, DATABASE_URL=database_url)
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT_DIR, env=env, capture_output=True, text=True,
+                         check=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    return {k: round(v, 4) if isinstance(v, float) else v for k, v in result.items()}
+
+
+def run(repeat: int = 3, database_url: str = None) -> list[dict]:
+    """
+    Time `import main` through the first served request: once against an empty database (tables
+    created), then repeat times against the same, already migrated, database.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = database_url or f"sqlite:///{os.path.join(tmp, 'cold_start.db')}"
+        results = [dict(name="cold_start", database="new", **measure(database_url))]
+        for _ in range(repeat):
+            results.append(dict(name="cold_start", database="current", **measure(database_url)))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process start to first served request")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary sqlite database")
+    args = parser.parse_args()
+    for result in run(args.repeat, args.database_url):
+        print(result)
@@ -0,0 +1,169 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.getcwd())
+
+from benchmarks import datagen
+from benchmarks.bench_trade_query import orm_trades_statement
+from ibtrading import mapper
+from ibtrading.domain import TradeDataFilter
+from ibtrading.mapper import order_record_mapper
+from ibtrading.repo import trade_repo
+from ibtrading.service import helper, tradepnl
+from ibtrading.service.trade_service import TradeService
+from ibtrading.settings import Settings
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AUTHORIZE_CALLS = 1000
+LOGIN_CALLS = 3  # bcrypt, a few hundred milliseconds each
+
+
+def _measure(name: str, fn, items: int, repeat: int) -> dict:
+    durations = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+    median = statistics.median(durations)
+    return {"name": name, "items": items, "best_s": round(min(durations), 6), "median_s": round(median, 6),
+            "per_item_us": round(median / items * 1e6, 3) if items else None}
+
+
+def _git_commit() -> str:
+    out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True)
+    return out.stdout.strip() or None
+
+
+def _trade_cases(db, repeat: int) -> list:
+    repo = trade_repo.TradeRepo(db)
+    service = TradeService(repo)
+    filter = TradeDataFilter()
+    trades = repo.list_trades_v2(filter)
+    by_contract = {}
+    for trade in trades:
+        by_contract.setdefault(trade.contract_id, []).append(trade)
+
+    def calculate_pnl():
+        for contract_trades in by_contract.values():
+            tradepnl.calculate_pnl(contract_trades)
+
+    results = [_measure("TradeRepo.list_trades_v2", lambda: repo.list_trades_v2(filter), len(trades), repeat),
+               _measure("TradeService.calculate_cumulative_pnl_groups",
+                        lambda: service.calculate_cumulative_pnl_groups(trades), len(trades), repeat),
+               _measure("tradepnl.calculate_pnl", calculate_pnl, len(trades), repeat),
+               _measure("mapper.map2trade_record", lambda: [mapper.map2trade_record(t) for t in trades],
+                        len(trades), repeat)]
+
+    # The mappers alone, over rows fetched once
+    with db.get_session() as sess:
+        columns = sess.execute(trade_repo._trade_columns_statement(filter)).all()
+        rows = sess.execute(orm_trades_statement(filter)).all()
+        results += [
+            _measure("mapper.map2trade_data_from_columns",
+                     lambda: [mapper.map2trade_data_from_columns(row) for row in columns], len(columns), repeat),
+            _measure("mapper.map2trade_data", lambda: [mapper.map2trade_data(trade=t, order=o, contract=c,
+                                                                             webhook_log=wl) for t, o, c, wl in rows],
+                     len(rows), repeat),
+            _measure("mapper.map2order_data", lambda: [mapper.map2order_data(o, c, wl) for _, o, c, wl in rows],
+                     len(rows), repeat),
+            _measure("mapper.map2contract_data",
+                     lambda: [order_record_mapper.map2contract_data(c) for _, _, c, _ in rows], len(rows), repeat),
+        ]
+    return results
+
+
+def _auth_cases(repeat: int) -> list:
+    auth = helper.get_auth_service()
+
+    def login():
+        for _ in range(LOGIN_CALLS):
+            auth.login_rate_limiter.reset()
+            assert not auth.login("admin", "Admin@321").error
+
+    token = auth.login("admin", "Admin@321").session.access_token
+
+    def authorize():
+        for _ in range(AUTHORIZE_CALLS):
+            auth.authorize(token)
+
+    def authorize_uncached():
+        for _ in range(AUTHORIZE_CALLS):
+            auth.principal_cache.clear()
+            auth.authorize(token)
+
+    return [_measure("AuthService.authorize", authorize, AUTHORIZE_CALLS, repeat),
+            _measure("AuthService.authorize_uncached", authorize_uncached, AUTHORIZE_CALLS, repeat),
+            _measure("AuthService.login", login, LOGIN_CALLS, repeat)]
+
+
+def run(trades: int = 50_000, contracts: int = 20, seed: int = 42, repeat: int = 5, database_url: str = None) -> dict:
+    """
+    Fill a scratch database with datagen and time the trade listing, PnL, mapper and auth paths.
+    database_url defaults to a temporary sqlite database; it must be empty, the data is inserted.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        Settings.DATABASE_URL = database_url or f"sqlite:///{os.path.join(tmp, 'bench_suite.db')}"
+        db = helper.get_datasource()
+        data = datagen.populate(db, trades, contracts, seed)
+        results = _trade_cases(db, repeat) + _auth_cases(repeat)
+        db.engine.dispose()
+    meta = {"commit": _git_commit(), "python": platform.python_version(), "platform": platform.platform(),
+            "created_at": datetime.now().isoformat(timespec="seconds"), "repeat": repeat, "data": data}
+    return {"meta": meta, "results": results}
+
+
+def compare(current: dict, previous: dict, threshold: float = 0.1) -> list:
+    """
+    Median time of each benchmark relative to a previous run; slower by more than threshold is a regression.
+    """
+    baseline = {r["name"]: r for r in previous["results"]}
+    rows = []
+    for result in current["results"]:
+        before = baseline.get(result["name"])
+        if before is None or not before["median_s"]:
+            continue
+        ratio = result["median_s"] / before["median_s"]
+        rows.append({"name": result["name"], "previous_s": before["median_s"], "current_s": result["median_s"],
+                     "ratio": round(ratio, 3), "regression": ratio > 1 + threshold})
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trade listing, PnL, mapper and auth benchmarks on synthetic data")
+    parser.add_argument("--trades", type=int, default=50_000)
+    parser.add_argument("--contracts", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary sqlite database")
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="JSON results of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Slowdown counted as a regression")
+    args = parser.parse_args()
+    report = run(args.trades, args.contracts, args.seed, args.repeat, args.database_url)
+    for result in report["results"]:
+        print(result)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            rows = compare(report, json.load(f), args.threshold)
+        for row in rows:
+            print(row)
+        if any(row["regression"] for row in rows):
+            sys.exit(1)
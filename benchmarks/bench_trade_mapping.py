@@ -0,0 +1,107 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.append(os.getcwd())
+
+from ibtrading import mapper
+from ibtrading.domain import OrderDirection, OrderStatus, OrderType
+from ibtrading.model import TradeRecord, OrderRecord, ContractRecord, WebhookRecord
+
+
+def generate_rows(n: int, contracts: int = 20, seed: int = 42) -> list:
+    """
+    (trade, order, contract, webhook_log) rows as returned by the trade listing query: one order and webhook log
+    per trade, contracts shared.
+    """
+    rng = random.Random(seed)
+    t0 = datetime(2020, 1, 1)
+    contract_records = [ContractRecord(id=i, contract_id=1000 + i, symbol=f"S{i}", sec_type="FUT", exchange="CME",
+                                       currency="USD", multiplier="20", vt_symbol=f"S{i}.CME")
+                        for i in range(contracts)]
+    rows = []
+    for i in range(n):
+        contract = contract_records[i % contracts]
+        dt = t0 + timedelta(minutes=i)
+        action = rng.choice(["ENTRY_LONG", "EXIT_LONG", "ENTRY_SHORT", "EXIT_SHORT"])
+        webhook_log = WebhookRecord(id=i, ref_id=f"ref{i}", vt_symbol=contract.vt_symbol, dt=dt, open=100.0,
+                                    high=101.0, low=99.0, close=100.5, volume=10.0, action="buy",
+                                    market_action=action, market_position="long", market_position_size=1.0,
+                                    message="", created_at=dt)
+        order = OrderRecord(id=i, order_id=i, perm_id=i, client_id=1, account_id="DU1",
+                            contract_id=contract.contract_id, ref_id=webhook_log.ref_id,
+                            direction=OrderDirection.BUY, market_action=action, order_type=OrderType.MARKET,
+                            order_time=dt, tif="DAY", status=OrderStatus.Filled, quantity=1.0, filled_quantity=1.0,
+                            remaining_quantity=0.0, avg_fill_price=100.25, is_active=False)
+        trade = TradeRecord(id=i, trade_id=i // 2, order_id=i, client_id=1, account_id="DU1",
+                            contract_id=contract.contract_id, direction=OrderDirection.BUY, quantity=1, price=100.25,
+                            avg_price=100.25, trade_time=dt, status=OrderStatus.Filled, commission=1.2, pnl=0.0,
+                            released_pnl=0.0, unrealized_pnl=0.0, total_pnl=12.5, total_commission=2.4,
+                            cumulative_pnl=12.5 * i, cumulative_commission=2.4 * i, created_at=dt, updated_at=dt)
+        rows.append((trade, order, contract, webhook_log))
+    return rows
+
+
+def map_trade_data(rows: list) -> list:
+    return [mapper.map2trade_data(trade=t, order=o, contract=c, webhook_log=wl) for t, o, c, wl in rows]
+
+
+def map_trade_rows(rows: list):
+    return mapper.map2trade_row_page(rows)
+
+
+def _best_of(fn, rows: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _retained_bytes(fn, rows: list) -> int:
+    """
+    Bytes still allocated by the result of fn(rows), i.e. what holding the mapped trades costs.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn(rows)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del result
+    return retained
+
+
+def run(sizes=(10_000, 100_000), repeat: int = 3) -> list[dict]:
+    results = []
+    for n in sizes:
+        rows = generate_rows(n)
+        for name, fn in (("map2trade_data", map_trade_data), ("map2trade_row", map_trade_rows)):
+            seconds = _best_of(fn, rows, repeat)
+            retained = _retained_bytes(fn, rows)
+            results.append({"name": name, "trades": n, "map_s": round(seconds, 6),
+                            "us_per_row": round(seconds / n * 1e6, 3),
+                            "mb_per_100k": round(retained / n * 100_000 / 2 ** 20, 1)})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-row cost and memory of TradeData vs TradeRow mapping")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for result in run(args.sizes, args.repeat):
+        print(result)
@@ -0,0 +1,122 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, asc
+
+sys.path.append(os.getcwd())
+
+from ibtrading import mapper
+from ibtrading.domain import OrderDirection, OrderStatus, OrderType, TradeDataFilter
+from ibtrading.model import TradeRecord, OrderRecord, ContractRecord, WebhookRecord
+from ibtrading.repo import trade_repo
+from ibtrading.repo.datasource import DataSource
+from ibtrading.settings import Settings
+
+INSERT_CHUNK_SIZE = 10_000
+
+
+def populate(db: DataSource, n: int, contracts: int = 20, seed: int = 42):
+    """
+    n trades, each with its own order and webhook log, over a few contracts.
+    """
+    rng = random.Random(seed)
+    t0 = datetime(2020, 1, 1)
+    with db.get_session() as sess:
+        sess.execute(insert(ContractRecord), [dict(contract_id=1000 + i, symbol=f"S{i}", sec_type="FUT",
+                                                   exchange="CME", currency="USD", multiplier="20",
+                                                   vt_symbol=f"S{i}.CME", created_at=t0, updated_at=t0)
+                                              for i in range(contracts)])
+        for start in range(0, n, INSERT_CHUNK_SIZE):
+            webhook_logs, orders, trades = [], [], []
+            for i in range(start, min(n, start + INSERT_CHUNK_SIZE)):
+                contract_id = 1000 + i % contracts
+                dt = t0 + timedelta(minutes=i)
+                action = rng.choice(["ENTRY_LONG", "EXIT_LONG", "ENTRY_SHORT", "EXIT_SHORT"])
+                webhook_logs.append(dict(ref_id=f"ref{i}", symbol=f"S{i % contracts}", action="buy",
+                                         market_action=action, market_position="long", market_position_size=1.0,
+                                         dt=dt, dt_now=dt, open=100.0, high=101.0, low=99.0, close=100.5,
+                                         volume=10.0, vt_symbol=f"S{i % contracts}.CME", payload="{}",
+                                         fingerprint=f"fp{i}", created_at=dt, updated_at=dt))
+                orders.append(dict(order_id=i, perm_id=i, client_id=1, account_id="DU1", contract_id=contract_id,
+                                   ref_id=f"ref{i}", direction=OrderDirection.BUY, market_action=action,
+                                   order_type=OrderType.MARKET, order_time=dt, tif="DAY", status=OrderStatus.Filled,
+                                   quantity=1.0, filled_quantity=1.0, remaining_quantity=0.0,
+                                   avg_fill_price=100.25, is_active=False, created_at=dt, updated_at=dt))
+                trades.append(dict(trade_id=i // 2, order_id=i, client_id=1, account_id="DU1",
+                                   contract_id=contract_id, direction=OrderDirection.BUY, quantity=1, price=100.25,
+                                   avg_price=100.25, trade_time=dt, status=OrderStatus.Filled, commission=1.2,
+                                   pnl=0.0, released_pnl=0.0, unrealized_pnl=0.0, total_pnl=12.5,
+                                   total_commission=2.4, created_at=dt, updated_at=dt))
+            sess.execute(insert(WebhookRecord), webhook_logs)
+            sess.execute(insert(OrderRecord), orders)
+            sess.execute(insert(TradeRecord), trades)
+        sess.commit()
+
+
+def orm_trades_statement(filter: TradeDataFilter):
+    """
+    The statement of list_trades_v2 as it was: four ORM entities per row.
+    """
+    return (select(TradeRecord, OrderRecord, ContractRecord, WebhookRecord)
+            .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
+            .outerjoin(ContractRecord, ContractRecord.contract_id == OrderRecord.contract_id)
+            .outerjoin(WebhookRecord, WebhookRecord.ref_id == OrderRecord.ref_id)
+            .filter(*trade_repo._trade_filters(filter))
+            .order_by(asc(TradeRecord.created_at)))
+
+
+def list_trades_orm(db: DataSource, filter: TradeDataFilter) -> list:
+    """
+    list_trades_v2 as it was: four ORM entities per row, then map2trade_data.
+    """
+    with db.get_session() as sess:
+        rows = sess.execute(orm_trades_statement(filter)).all()
+        return [mapper.map2trade_data(trade=t, order=o, contract=c, webhook_log=wl) for t, o, c, wl in rows]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=(100_000,), repeat: int = 3) -> list[dict]:
+    results = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            Settings.DATABASE_URL = f"sqlite:///{os.path.join(tmp, 'trade_query.db')}"
+            db = DataSource()
+            populate(db, n)
+            repo = trade_repo.TradeRepo(db)
+            filter = TradeDataFilter()
+            orm = _best_of(lambda: list_trades_orm(db, filter), repeat)
+            core = _best_of(lambda: repo.list_trades_v2(filter), repeat)
+            rows = _best_of(lambda: repo.list_trade_rows(filter), repeat)
+            db.engine.dispose()
+        results.append({"name": "list_trades_v2", "trades": n, "orm_s": round(orm, 4), "core_s": round(core, 4),
+                        "core_trade_rows_s": round(rows, 4), "speedup": round(orm / core, 2) if core else None})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ORM entities vs Core columns for the 4-way trade join")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for result in run(args.sizes, args.repeat):
+        print(result)
@@ -0,0 +1,74 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from ibtrading.service import tradepnl, tradepnl_batch
+
+
+def generate_history(n: int, seed: int = 42) -> list:
+    """
+    A single contract's fills: ENTRY legs followed by one EXIT leg of the same side.
+    """
+    rng = random.Random(seed)
+    t0 = datetime(2020, 1, 1)
+    trades = []
+    while len(trades) < n:
+        side = rng.choice(["LONG", "SHORT"])
+        entries = [rng.randint(1, 3) for _ in range(rng.randint(1, 3))]
+        for action, quantity in [("ENTRY_" + side, q) for q in entries] + [("EXIT_" + side, sum(entries))]:
+            i = len(trades)
+            trades.append(SimpleNamespace(id=i, market_action=action, quantity=quantity,
+                                          avg_price=round(rng.uniform(100, 200) * 4) / 4,
+                                          commission=round(rng.uniform(0.5, 2.5), 2),
+                                          trade_time=t0 + timedelta(minutes=i), created_at=t0 + timedelta(minutes=i),
+                                          total_pnl=None, total_commission=None, trade_id=None))
+    return trades[:n]
+
+
+def _best_of(fn, trades, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        data = copy.copy(trades)
+        start = time.perf_counter()
+        fn(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=(1_000, 10_000, 100_000), repeat: int = 3) -> list[dict]:
+    results = []
+    for n in sizes:
+        trades = generate_history(n)
+        sequential = _best_of(tradepnl.calculate_pnl, trades, repeat)
+        batch = _best_of(tradepnl_batch.calculate_pnl_batch, trades, repeat)
+        frame = pd.DataFrame({c: [getattr(t, c) for t in trades] for c in tradepnl_batch.FRAME_COLUMNS})
+        columnar = _best_of(lambda _: tradepnl_batch.calculate_pnl_frame(frame), trades, repeat)
+        results.append({"name": "tradepnl.calculate_pnl", "trades": n,
+                        "sequential_s": round(sequential, 6), "batch_s": round(batch, 6),
+                        "frame_s": round(columnar, 6),
+                        "speedup": round(sequential / batch, 2) if batch else None,
+                        "frame_speedup": round(sequential / columnar, 2) if columnar else None})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sequential vs batch trade set PnL")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    for result in run(args.sizes, args.repeat):
+        print(result)
@@ -0,0 +1,250 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+sys.path.append(os.getcwd())
+
+from ibtrading.domain import ContractData, OrderData, OrderDirection, OrderStatus, OrderType, TradeData
+from ibtrading.repo.sqlprofiler import SqlProfiler
+from ibtrading.settings import Settings
+
+# TradingView tickers and exchanges of the alerts, as in the README payload
+SYMBOLS = [("NQ1!", "CME_MINI_DL", 20900.0), ("ES1!", "CME_MINI_DL", 6000.0), ("YM1!", "CBOT_MINI_DL", 44000.0),
+           ("RTY1!", "CME_MINI_DL", 2400.0), ("GC1!", "COMEX", 2650.0), ("CL1!", "NYMEX", 70.0)]
+WRITE_VERBS = ("INSERT", "UPDATE", "DELETE")
+
+
+def alert_payloads(n: int, symbols: int = 4, duplicates: float = 0.0, seed: int = 42) -> list:
+    """
+    n TradingView alerts in the README payload format: per symbol, an entry (buy/long or sell/short) followed by
+    the exit (flat), one bar apart. A duplicates share of the alerts are retried deliveries of an earlier alert.
+    """
+    rng = random.Random(seed)
+    bar_time = datetime(2024, 11, 29, 8, 0)
+    positions = {}  # Symbol -> open side and size
+    prices = {symbol: price for symbol, _, price in SYMBOLS[:symbols]}
+    payloads = []
+    while len(payloads) < n:
+        if payloads and rng.random() < duplicates:
+            payloads.append(rng.choice(payloads))
+            continue
+        symbol, exchange, _ = SYMBOLS[rng.randrange(symbols)]
+        bar_time += timedelta(minutes=1)
+        prices[symbol] *= 1 + rng.gauss(0, 0.001)
+        close = round(prices[symbol] * 4) / 4
+        position = positions.pop(symbol, None)
+        if position is None:
+            side, contracts = rng.choice(["long", "short"]), rng.randint(1, 3)
+            positions[symbol] = (side, contracts)
+            action, market_position, position_size = ("buy" if side == "long" else "sell"), side, contracts
+        else:
+            side, contracts = position
+            action, market_position, position_size = ("sell" if side == "long" else "buy"), "flat", 0
+        payloads.append({"action": action, "contracts": str(contracts), "symbol": symbol,
+                         "position_size": str(position_size if side == "long" else -position_size),
+                         "market_position": market_position, "market_position_size": str(position_size),
+                         "time": bar_time.isoformat() + "Z", "close": f"{close:.2f}", "open": f"{close - 1:.2f}",
+                         "high": f"{close + 1.5:.2f}", "low": f"{close - 1.5:.2f}", "volume": str(rng.randint(1, 500)),
+                         "timeframe": "1", "exchange": exchange,
+                         "timenow": (bar_time + timedelta(seconds=1)).isoformat() + "Z", "currency": "USD",
+                         "sec_type": "FUT", "last_trade_date_or_contract_month": "20241220", "message": "load test "})
+    return payloads
+
+
+def _percentile(values: list, p: float):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def send_alerts(client: httpx.AsyncClient, path: str, payloads: list, rate: float = 0, burst: int = 1,
+                      concurrency: int = 16) -> dict:
+    """
+    POST the payloads, burst at a time, bursts spaced to average rate alerts per second (0: as fast as
+    concurrency allows). With a rate, latency counts from the scheduled send time, so time spent waiting for
+    a free connection is included as a sender that does not wait for acks (TradingView) would see it.
+    """
+    slots = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+    started = time.perf_counter()
+
+    async def send(payload: dict, scheduled: float):
+        nonlocal errors
+        async with slots:
+            start = scheduled if rate else time.perf_counter()
+            try:
+                response = await client.post(path, json=payload)
+                ok = response.status_code == 200 and not response.json().get("error")
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            if not ok:
+                errors += 1
+
+    tasks = []
+    for i in range(0, len(payloads), burst):
+        scheduled = started + i / rate if rate else started
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.extend(asyncio.create_task(send(payload, scheduled)) for payload in payloads[i:i + burst])
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    return {"alerts": len(payloads), "errors": errors, "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(len(payloads) / elapsed, 1),
+            "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+            "p99_ms": round(_percentile(latencies, 99) * 1000, 2), "max_ms": round(max(latencies) * 1000, 2)}
+
+
+class StubBroker:
+    """
+    Stands in for the IB gateway: fills every saved webhook at its close price and saves the fill through
+    OrderRepo.save_trades, one transaction per fill as execution events are saved live.
+    """
+
+    def __init__(self, order_repo, account_id: str = "DU1"):
+        self.order_repo = order_repo
+        self.account_id = account_id
+        self.contract_ids = {}
+        self.next_perm_id = 1
+
+    def fill(self, webhook) -> TradeData:
+        contract_id = self.contract_ids.setdefault(webhook.vt_symbol, 1000 + len(self.contract_ids))
+        contract = ContractData(contract_id=contract_id, symbol=webhook.symbol, sec_type="FUT",
+                                last_trade_date_or_contract_month=webhook.last_trade_date_or_contract_month,
+                                exchange=webhook.exchange, currency=webhook.currency, multiplier="20",
+                                vt_symbol=webhook.vt_symbol)
+        direction = OrderDirection.BUY if webhook.action.upper() == "BUY" else OrderDirection.SELL
+        perm_id, self.next_perm_id = self.next_perm_id, self.next_perm_id + 1
+        quantity = int(webhook.contracts)
+        order = OrderData(order_id=perm_id, perm_id=perm_id, client_id=1, account_id=self.account_id,
+                          contract_id=contract_id, order_type=OrderType.MARKET, direction=direction,
+                          market_action=webhook.market_action, quantity=quantity, status=OrderStatus.Filled,
+                          filled_quantity=quantity, avg_fill_price=webhook.close, is_active=False,
+                          order_time=webhook.time, ref_id=webhook.ref_id)
+        return TradeData(order_id=perm_id, client_id=1, account_id=self.account_id, contract_id=contract_id,
+                         direction=direction, market_action=webhook.market_action, quantity=quantity,
+                         price=webhook.close, avg_price=webhook.close, trade_time=webhook.time,
+                         status=OrderStatus.Filled, commission=round(0.62 * quantity, 2), order=order,
+                         contract=contract)
+
+    def fill_all(self) -> int:
+        webhooks = sorted(self.order_repo.iter_webhook_logs(), key=lambda w: (w.time, w.id))
+        for webhook in webhooks:
+            self.order_repo.save_trades([self.fill(webhook)])
+        return len(webhooks)
+
+
+def _writes(profiler: SqlProfiler) -> dict:
+    statements = [s for s in profiler.statements(limit=profiler.max_statements + 1)
+                  if s["statement"].startswith(WRITE_VERBS)]
+    return {"statements": sum(s["count"] for s in statements), "rows": sum(s["rows"] for s in statements)}
+
+
+def _amplification(writes: dict, items: int) -> dict:
+    return {"write_statements": writes["statements"], "rows_written": writes["rows"],
+            "write_statements_per_item": round(writes["statements"] / items, 2) if items else None,
+            "rows_written_per_item": round(writes["rows"] / items, 2) if items else None}
+
+
+async def _wait_for_queue(service, timeout: float = 60):
+    deadline = time.perf_counter() + timeout
+    while service.queue.pending() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+
+
+async def run_in_process(payloads: list, mode: str = "sync", rate: float = 0, burst: int = 1, concurrency: int = 16,
+                         fills: bool = True, api_key: str = "APIKEY123") -> list[dict]:
+    """
+    Drive the app over an ASGI transport against a temporary database. Database writes are counted with a
+    SqlProfiler on the engine; the local queue file of queue mode is not counted.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        Settings.DATABASE_URL = f"sqlite:///{os.path.join(tmp, 'webhook_load.db')}"
+        Settings.WEBHOOK_INGEST_MODE = mode
+        Settings.WEBHOOK_QUEUE_PATH = os.path.join(tmp, "webhook_queue.db")
+        import main
+        from ibtrading.service import helper
+
+        db = helper.get_datasource()
+        profiler = SqlProfiler(slow_query_ms=float("inf"))
+        profiler.attach(db.engine)
+        results = []
+        async with main.app.router.lifespan_context(main.app):
+            service = helper.get_webhook_service()
+            profiler.reset()  # Startup tasks (user seeding) are not part of the load
+            transport = httpx.ASGITransport(app=main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+                ingest = await send_alerts(client, f"/api/v1/webhook/{api_key}", payloads, rate, burst, concurrency)
+            if mode == "queue":
+                # Acked before saved: also time the workers taking to save the backlog after the last ack
+                start = time.perf_counter()
+                await _wait_for_queue(service)
+                ingest["queue_drain_s"] = round(time.perf_counter() - start, 3)
+            results.append(dict(name="webhook_ingest", mode=mode, concurrency=concurrency, rate=rate, burst=burst,
+                                **ingest, **_amplification(_writes(profiler), len(payloads))))
+            if fills:
+                profiler.reset()
+                broker = StubBroker(service.order_repo)
+                start = time.perf_counter()
+                filled = broker.fill_all()
+                elapsed = time.perf_counter() - start
+                results.append(dict(name="stub_broker_fills", fills=filled, elapsed_s=round(elapsed, 3),
+                                    throughput_per_s=round(filled / elapsed, 1) if elapsed else None,
+                                    **_amplification(_writes(profiler), filled)))
+        profiler.detach()
+        db.engine.dispose()
+    return results
+
+
+async def run_remote(url: str, payloads: list, rate: float = 0, burst: int = 1, concurrency: int = 16,
+                     api_key: str = "APIKEY123") -> list[dict]:
+    """
+    Drive a running server, e.g. python main.py. Only latency and throughput are measured.
+    """
+    async with httpx.AsyncClient(base_url=url, timeout=30,
+                                 limits=httpx.Limits(max_connections=concurrency)) as client:
+        ingest = await send_alerts(client, f"/api/v1/webhook/{api_key}", payloads, rate, burst, concurrency)
+    return [dict(name="webhook_ingest", url=url, concurrency=concurrency, rate=rate, burst=burst, **ingest)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay TradingView alert bursts against the webhook endpoint")
+    parser.add_argument("--alerts", type=int, default=2000)
+    parser.add_argument("--symbols", type=int, default=4, choices=range(1, len(SYMBOLS) + 1))
+    parser.add_argument("--rate", type=float, default=0, help="Alerts per second; 0 sends as fast as possible")
+    parser.add_argument("--burst", type=int, default=1, help="Alerts sent at once, e.g. on a bar close")
+    parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight at most")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="Share of alerts delivered twice")
+    parser.add_argument("--mode", choices=["sync", "queue"], default="sync", help="WEBHOOK_INGEST_MODE in process")
+    parser.add_argument("--no-fills", action="store_true", help="Skip filling the alerts with the stub broker")
+    parser.add_argument("--url", default=None, help="Server to drive instead of the app in process")
+    parser.add_argument("--api-key", default="APIKEY123")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    args = parser.parse_args()
+    alerts = alert_payloads(args.alerts, args.symbols, args.duplicates, args.seed)
+    if args.url:
+        report = asyncio.run(run_remote(args.url, alerts, args.rate, args.burst, args.concurrency, args.api_key))
+    else:
+        report = asyncio.run(run_in_process(alerts, args.mode, args.rate, args.burst, args.concurrency,
+                                            not args.no_fills, args.api_key))
+    for result in report:
+        print(result)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,150 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import insert
+
+sys.path.append(os.getcwd())
+
+from ibtrading.domain import OrderDirection, OrderStatus, OrderType
+from ibtrading.model import TradeRecord, OrderRecord, ContractRecord, WebhookRecord
+from ibtrading.repo.datasource import DataSource
+from ibtrading.service import tradepnl
+from ibtrading.utils import ibutil
+
+INSERT_CHUNK_SIZE = 10_000
+ACCOUNT_ID = "DU1"
+START_TIME = datetime(2020, 1, 1)
+LAST_TRADE_MONTH = "20201218"
+
+# Order side of each market action
+DIRECTIONS = {"ENTRY_LONG": OrderDirection.BUY, "EXIT_LONG": OrderDirection.SELL,
+              "ENTRY_SHORT": OrderDirection.SELL, "EXIT_SHORT": OrderDirection.BUY}
+
+
+def generate_fills(trades: int, contracts: int = 20, seed: int = 42) -> list:
+    """
+    trades fills over contracts, as trade sets: 1-3 ENTRY fills of one side, then 1-2 EXIT fills closing the same
+    quantity. Sets of different contracts interleave in time; prices follow a random walk per contract.
+    Each trade set is priced with tradepnl.calculate_pnl and given a sequential trade_id, and closed sets carry the
+    account's cumulative PnL and commission at their close. The last set may be left open.
+    """
+    rng = random.Random(seed)
+    prices = [rng.uniform(100, 5000) for _ in range(contracts)]
+    now = START_TIME
+    fills = []
+    while len(fills) < trades:
+        c = rng.randrange(contracts)
+        side = rng.choice(["LONG", "SHORT"])
+        entries = [rng.randint(1, 3) for _ in range(rng.randint(1, 3))]
+        quantity = sum(entries)
+        exits = [quantity] if quantity == 1 or rng.random() < 0.7 else [quantity // 2, quantity - quantity // 2]
+        for action, qty in [("ENTRY_" + side, q) for q in entries] + [("EXIT_" + side, q) for q in exits]:
+            now += timedelta(seconds=rng.randint(5, 1800))
+            prices[c] = max(1.0, prices[c] * (1 + rng.gauss(0, 0.002)))
+            i = len(fills) + 1
+            fills.append(SimpleNamespace(id=i, contract_id=1000 + c, market_action=action, quantity=qty,
+                                         avg_price=round(prices[c] * 4) / 4, commission=round(0.62 * qty, 2),
+                                         trade_time=now, created_at=now, trade_id=None, total_pnl=None,
+                                         total_commission=None, cumulative_pnl=None, cumulative_commission=None))
+    fills = fills[:trades]
+
+    trade_sets = []
+    for c in range(contracts):
+        trade_sets.extend(tradepnl.calculate_pnl([f for f in fills if f.contract_id == 1000 + c]))
+    trade_sets = [s for s in trade_sets if s]
+    cumulative_pnl = cumulative_commission = 0.0
+    for trade_id, trade_set in enumerate(sorted(trade_sets, key=lambda s: s[-1].trade_time), start=1):
+        cumulative_pnl += trade_set[0].total_pnl
+        cumulative_commission += trade_set[0].total_commission
+        for f in trade_set:
+            f.trade_id = trade_id  # calculate_pnl uses a timestamp, which would not be reproducible
+            f.cumulative_pnl = round(cumulative_pnl, 2)
+            f.cumulative_commission = round(cumulative_commission, 2)
+    return fills
+
+
+def _webhook_log(f) -> dict:
+    """
+    webhook_log row of a fill, with the fields of the README payload as populate_webhook_payload stores them.
+    """
+    symbol = f"S{f.contract_id - 1000}"
+    entry = f.market_action.startswith("ENTRY")
+    values = dict(ref_id=f"ref{f.id}", contracts=float(f.quantity), symbol=symbol,
+                  position_size=float(f.quantity) if entry else 0.0, action=DIRECTIONS[f.market_action].value,
+                  market_position=f.market_action.split("_")[1] if entry else "FLAT", market_action=f.market_action,
+                  market_position_size=float(f.quantity) if entry else 0.0, dt=f.trade_time, close=f.avg_price,
+                  open=f.avg_price, high=f.avg_price + 0.5, low=f.avg_price - 0.5, volume=float(f.quantity * 10),
+                  timeframe="1", exchange="CME", dt_now=f.trade_time, currency="USD", strategy="datagen",
+                  order_type="MARKET", sec_type="CONTFUT", last_trade_date_or_contract_month=LAST_TRADE_MONTH,
+                  message=f.market_action.replace("_", " ").title(),
+                  vt_symbol=ibutil.generate_vt_symbol_from_webhook(symbol=symbol, sec_type="CONTFUT",
+                                                                   last_trade_date_or_contract_month=LAST_TRADE_MONTH,
+                                                                   timeframe="1", currency="USD", exchange="CME"),
+                  fingerprint=f"fp{f.id}", created_at=f.trade_time, updated_at=f.trade_time)
+    names = {"dt": "time", "dt_now": "timenow"}  # As WebhookPayload
+    values["payload"] = {names.get(k, k): v.isoformat() if isinstance(v, datetime) else v for k, v in values.items()}
+    return values
+
+
+def _rows(fills: list) -> tuple:
+    webhook_logs, orders, trades = [], [], []
+    for f in fills:
+        direction = DIRECTIONS[f.market_action]
+        webhook_logs.append(_webhook_log(f))
+        orders.append(dict(order_id=f.id, perm_id=f.id, client_id=1, account_id=ACCOUNT_ID, contract_id=f.contract_id,
+                           ref_id=f"ref{f.id}", direction=direction, market_action=f.market_action,
+                           order_type=OrderType.MARKET, order_time=f.trade_time, tif="DAY", status=OrderStatus.Filled,
+                           quantity=float(f.quantity), filled_quantity=float(f.quantity), remaining_quantity=0.0,
+                           avg_fill_price=f.avg_price, is_active=False, created_at=f.trade_time,
+                           updated_at=f.trade_time))
+        trades.append(dict(trade_id=f.trade_id, order_id=f.id, client_id=1, account_id=ACCOUNT_ID,
+                           contract_id=f.contract_id, direction=direction, market_action=f.market_action,
+                           quantity=f.quantity, price=f.avg_price, avg_price=f.avg_price, trade_time=f.trade_time,
+                           status=OrderStatus.Filled, commission=f.commission, pnl=0.0, released_pnl=0.0,
+                           unrealized_pnl=0.0, total_pnl=f.total_pnl, total_commission=f.total_commission,
+                           cumulative_pnl=f.cumulative_pnl, cumulative_commission=f.cumulative_commission,
+                           created_at=f.trade_time, updated_at=f.trade_time))
+    return webhook_logs, orders, trades
+
+
+def populate(db: DataSource, trades: int, contracts: int = 20, seed: int = 42) -> dict:
+    """
+    Fill db with the contracts and fills of generate_fills: one webhook log, order and trade per fill.
+    """
+    fills = generate_fills(trades, contracts, seed)
+    with db.get_session() as sess:
+        sess.execute(insert(ContractRecord), [dict(contract_id=1000 + i, symbol=f"S{i}", sec_type="FUT",
+                                                   exchange="CME", currency="USD", multiplier="20",
+                                                   vt_symbol=f"S{i}.CME", created_at=START_TIME,
+                                                   updated_at=START_TIME)
+                                              for i in range(contracts)])
+        for start in range(0, len(fills), INSERT_CHUNK_SIZE):
+            webhook_logs, orders, trade_rows = _rows(fills[start:start + INSERT_CHUNK_SIZE])
+            sess.execute(insert(WebhookRecord), webhook_logs)
+            sess.execute(insert(OrderRecord), orders)
+            sess.execute(insert(TradeRecord), trade_rows)
+        sess.commit()
+    return {"contracts": contracts, "trades": len(fills), "trade_sets": len({f.trade_id for f in fills if f.trade_id}),
+            "seed": seed}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill a database with synthetic contracts, orders, trades and "
+                                                 "webhook logs")
+    parser.add_argument("--database-url", required=True, help="e.g. sqlite:////tmp/bench.db; tables are created")
+    parser.add_argument("--trades", type=int, default=100_000)
+    parser.add_argument("--contracts", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    from ibtrading.settings import Settings
+    Settings.DATABASE_URL = args.database_url
+    print(populate(DataSource(), args.trades, args.contracts, args.seed))
@@ -0,0 +1,47 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+
+from fastapi import APIRouter, Depends
+
+from ibtrading.api.auth_router import authorize_admin
+from ibtrading.domain import User, ErrorCode, SqlProfileResponse, SqlStatementStats, SlowQuery
+from ibtrading.repo.sqlprofiler import get_sql_profiler
+from ibtrading.utils import loggerutil
+
+logger = loggerutil.get_logger(__name__)
+
+router = APIRouter(tags=["Admin"])
+
+SQL_PROFILE_SORT_KEYS = ("total_ms", "mean_ms", "max_ms", "count", "rows", "n_plus_one")
+
+
+@router.get("/api/v1/admin/sql-profile", response_model=SqlProfileResponse)
+async def sql_profile(sort: str = "total_ms", limit: int = 50, user: User = Depends(authorize_admin)):
+    """
+    Statements aggregated by the SQL profiler (SQL_PROFILER_ENABLED), most expensive first, and the recent slow queries
+    """
+    try:
+        if sort not in SQL_PROFILE_SORT_KEYS:
+            return SqlProfileResponse(error=True, code=ErrorCode.INVALID_REQUEST,
+                                      message=f"sort must be one of {', '.join(SQL_PROFILE_SORT_KEYS)}")
+        profiler = get_sql_profiler()
+        return SqlProfileResponse(enabled=profiler.enabled,
+                                  statements=[SqlStatementStats(**s) for s in profiler.statements(sort, limit)],
+                                  slow_queries=[SlowQuery(**q) for q in profiler.slow_queries()])
+    except Exception as e:
+        logger.exception(f"Error: {e}")
+        return SqlProfileResponse(error=True, code=ErrorCode.INTERNAL_ERROR, message=str(e))
+
+
+@router.delete("/api/v1/admin/sql-profile", response_model=SqlProfileResponse)
+async def reset_sql_profile(user: User = Depends(authorize_admin)):
+    try:
+        profiler = get_sql_profiler()
+        profiler.reset()
+        return SqlProfileResponse(enabled=profiler.enabled, message="SQL profile reset")
+    except Exception as e:
+        logger.exception(f"Error: {e}")
+        return SqlProfileResponse(error=True, code=ErrorCode.INTERNAL_ERROR, message=str(e))
@@ -10,7 +10,7 @@ from fastapi.params import Security
 from fastapi.security import OAuth2PasswordBearer, APIKeyHeader
 from fastapi.security import OAuth2PasswordRequestForm
 
-from ibtrading.domain import LogoutResponse, Session, ErrorCode
+from ibtrading.domain import LogoutResponse, Session, ErrorCode, User
 from ibtrading.domain.auth import LoginResponse
 from ibtrading.service.helper import get_auth_service
 from ibtrading.utils import loggerutil
@@ -30,12 +30,18 @@ async def get_authorization_token(authorization: str = Depends(oauth2_scheme)):
 
 
 async def authorize(authorization: str = Depends(oauth2_scheme)):
-    res = auth_service.authorize(authorization)
+    res = await auth_service.authorize_async(authorization)
     if res.error:
         raise HTTPException(status_code=res.code.value, detail=res.message)
     return res.session.user
 
 
+async def authorize_admin(user: User = Depends(authorize)):
+    if user is None or user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin role required")
+    return user
+
+
 #
 # async def authorize1(authorization: str = Header(None)):
 #     if not authorization:
@@ -62,7 +68,7 @@ async def api_key_auth(api_key: str = Security(api_key_header)):
 @router.post("/api/v1/auth/login", response_model=LoginResponse)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     try:
-        res = auth_service.login(form_data.username, form_data.password)
+        res = await auth_service.login_async(form_data.username, form_data.password)
         return res
     except ValueError as ve:
         logger.error(f"Validation error: {ve}")
@@ -75,7 +81,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
 @router.post("/api/v1/auth/token", response_model=Session)
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     try:
-        res = auth_service.login(form_data.username, form_data.password)
+        res = await auth_service.login_async(form_data.username, form_data.password)
         if res.error:
             logger.error(f"Invalid credentials for user: {form_data.username}")
             raise HTTPException(status_code=res.code.value, detail=res.message)
@@ -0,0 +1,85 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import time
+import weakref
+
+from ibtrading.repo.sqlprofiler import get_sql_profiler
+from ibtrading.utils import metricsutil
+
+HTTP_REQUESTS = metricsutil.counter("ibtrading_http_requests_total", "HTTP requests by route and status",
+                                    ("method", "route", "status"))
+HTTP_DURATION = metricsutil.histogram("ibtrading_http_request_duration_seconds",
+                                      "HTTP request latency until the response is sent", ("method", "route"))
+HTTP_IN_PROGRESS = metricsutil.gauge("ibtrading_http_requests_in_progress", "HTTP requests being handled")
+
+UNMATCHED_ROUTE = "unmatched"
+
+_route_templates = weakref.WeakKeyDictionary()  # app -> {endpoint: route path}
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route that handled a request (/api/v1/webhook/{api_key}), known once the request is routed.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return UNMATCHED_ROUTE
+    app = scope["app"]
+    routes = _route_templates.get(app)
+    if routes is None:
+        routes = _route_templates[app] = {getattr(r, "endpoint", None): r.path for r in app.routes}
+    return routes.get(endpoint, UNMATCHED_ROUTE)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency and status of every HTTP request.
+    Requests are labelled with the route template (/api/v1/webhook/{api_key}), not the requested path, so keys and ids
+    do not end up in labels; requests matching no route share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        HTTP_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_PROGRESS.dec()
+            route = route_template(scope)
+            HTTP_DURATION.observe((scope["method"], route), time.perf_counter() - start)
+            HTTP_REQUESTS.inc((scope["method"], route, str(status)))
+
+
+class SqlProfilerMiddleware:
+    """
+    ASGI middleware running every HTTP request in a SQL profiler scope, so a SELECT repeated within one request is
+    reported as a possible N+1 under its method and route.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with get_sql_profiler().scope(lambda: f"{scope['method']} {route_template(scope)}"):
+            await self.app(scope, receive, send)
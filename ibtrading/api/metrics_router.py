@@ -0,0 +1,48 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from ibtrading.service import helper
+from ibtrading.service.webhook_service import INGEST_MODE_QUEUE
+from ibtrading.utils import metricsutil
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _cache_stats() -> dict:
+    return {"auth_principal": helper.get_auth_service().principal_cache.stats(),
+            "contract": helper.get_contract_cache().stats()}
+
+
+def _cache_values(field: str):
+    return lambda: {(cache,): stats.get(field) for cache, stats in _cache_stats().items()}
+
+
+def _webhook_queue_pending():
+    service = helper.get_webhook_service()
+    return service.queue.pending() if service.mode == INGEST_MODE_QUEUE else None
+
+
+metricsutil.callback_gauge("ibtrading_cache_entries", "Entries in in-process caches", _cache_values("size"),
+                           ("cache",))
+metricsutil.callback_gauge("ibtrading_cache_hits_total", "In-process cache hits", _cache_values("hits"), ("cache",),
+                           type="counter")
+metricsutil.callback_gauge("ibtrading_cache_misses_total", "In-process cache misses", _cache_values("misses"),
+                           ("cache",), type="counter")
+metricsutil.callback_gauge("ibtrading_cache_evictions_total", "In-process cache evictions",
+                           _cache_values("evictions"), ("cache",), type="counter")
+metricsutil.callback_gauge("ibtrading_webhook_queue_pending", "Webhooks queued and not yet saved",
+                           _webhook_queue_pending)
+
+
+@router.get("/metrics", status_code=200)
+def metrics():
+    """
+    Metrics of this process in the Prometheus text format
+    Not async: reading the webhook queue depth queries its database
+    """
+    return Response(content=metricsutil.REGISTRY.render(), headers={"Content-Type": metricsutil.CONTENT_TYPE})
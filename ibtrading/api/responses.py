@@ -0,0 +1,58 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from typing import Any, Iterable, Iterator, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from ibtrading import mapper
+from ibtrading.domain import ListTradeResponse, TradeRowPage
+from ibtrading.utils import jsonutil
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse encoded with orjson (see jsonutil.dumps). Content may hold domain dataclasses as they are,
+    without the pydantic validation and serialization of response_model.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return jsonutil.dumps(content)
+
+
+def list_trade_response(res: ListTradeResponse) -> FastJSONResponse:
+    return FastJSONResponse(mapper.map2trade_response_content(res))
+
+
+def compact_trade_row_response(error: Optional[ListTradeResponse], page: Optional[TradeRowPage]) -> FastJSONResponse:
+    """
+    Compact trade listing from TradeService.list_trade_rows.
+    """
+    if error is not None:
+        return FastJSONResponse(mapper.map2trade_response_content(error))
+    return FastJSONResponse(mapper.map2compact_trade_row_response(page))
+
+
+def wants_ndjson(request: Request, stream: bool = False) -> bool:
+    """
+    Streaming is requested with the stream query parameter or an Accept: application/x-ndjson header.
+    """
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_lines(items: Iterable[Any]) -> Iterator[bytes]:
+    for item in items:
+        yield jsonutil.dumps(item) + b"\n"
+
+
+def ndjson_response(items: Iterable[Any]) -> StreamingResponse:
+    """
+    One JSON document per line, encoded as items are produced. A plain iterator is consumed in the threadpool,
+    so database reads behind it do not block the event loop.
+    """
+    return StreamingResponse(ndjson_lines(items), media_type=NDJSON_MEDIA_TYPE)
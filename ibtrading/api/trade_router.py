@@ -5,9 +5,10 @@
 """
 
 from fastapi import APIRouter
-from fastapi import Depends
+from fastapi import Depends, Request
 
 from ibtrading.api.auth_router import authorize, get_authorization_token
+from ibtrading.api.responses import list_trade_response, wants_ndjson, ndjson_response, compact_trade_row_response
 from ibtrading.domain import User, ListTradeResponse, ListOrderResponse, ListPortfolioResponse, \
     ListPositionResponse, \
     ListContractResponse, ListAccountResponse, ErrorCode, ListTradeRequest
@@ -21,18 +22,22 @@ router = APIRouter(tags=["Trades"])
 
 
 @router.get("/api/v1/trades", response_model=ListTradeResponse)
-async def list_trades(authorization: str = Depends(get_authorization_token)):
+async def list_trades(compact: bool = False, authorization: str = Depends(get_authorization_token)):
     try:
-        req = ListTradeRequest(authorization=authorization)
-        return await get_trade_service().list_trades(req)
+        req = ListTradeRequest(authorization=authorization, compact=compact)
+        if compact:
+            return compact_trade_row_response(*await get_trade_service().list_trade_rows(req))
+        return list_trade_response(await get_trade_service().list_trades(req))
     except Exception as e:
         logger.exception(f"Error: {e}")
         return ListTradeResponse(error=True, code=ErrorCode.INTERNAL_ERROR, message=str(e))
 
 
 @router.get("/api/v1/orders", response_model=ListOrderResponse)
-async def list_orders(user: User = Depends(authorize)):
+async def list_orders(request: Request, stream: bool = False, user: User = Depends(authorize)):
     try:
+        if wants_ndjson(request, stream):
+            return ndjson_response(get_order_service().stream_orders())
         return await get_order_service().list_orders()
     except Exception as e:
         logger.exception(f"Error: {e}")
@@ -58,8 +63,10 @@ async def list_position(user: User = Depends(authorize)):
 
 
 @router.get("/api/v1/contracts", response_model=ListContractResponse)
-async def list_contracts(user: User = Depends(authorize)):
+async def list_contracts(request: Request, stream: bool = False, user: User = Depends(authorize)):
     try:
+        if wants_ndjson(request, stream):
+            return ndjson_response(get_order_service().stream_contracts())
         return await get_order_service().list_contracts()
     except Exception as e:
         logger.exception(f"Error: {e}")
@@ -67,8 +74,10 @@ async def list_contracts(user: User = Depends(authorize)):
 
 
 @router.get("/api/v1/account", response_model=ListAccountResponse)
-async def list_account_summary(user: User = Depends(authorize)):
+async def list_account_summary(request: Request, stream: bool = False, user: User = Depends(authorize)):
     try:
+        if wants_ndjson(request, stream):
+            return ndjson_response(get_order_service().stream_account_values())
         return await  get_order_service().list_account_summary()
     except Exception as e:
         logger.exception(f"Error: {e}")
@@ -76,8 +85,10 @@ async def list_account_summary(user: User = Depends(authorize)):
 
 
 @router.get("/api/v1/webhooklogs", response_model=ListWebhookPayloadResponse)
-async def list_webhooklogs(user: User = Depends(authorize)):
+async def list_webhooklogs(request: Request, stream: bool = False, user: User = Depends(authorize)):
     try:
+        if wants_ndjson(request, stream):
+            return ndjson_response(get_order_service().stream_webhook_logs())
         return await get_order_service().list_webhook_logs()
     except Exception as e:
         logger.exception(f"Error: {e}")
@@ -6,11 +6,15 @@
 
 from fastapi import APIRouter
 from fastapi import Depends
+from fastapi.responses import StreamingResponse
 
 from ibtrading.api.auth_router import get_authorization_token
-from ibtrading.domain import ListTradeRequest, ListTradeResponse, ErrorCode
+from ibtrading.api.responses import list_trade_response, compact_trade_row_response
+from ibtrading.domain import ListTradeRequest, ListTradeResponse, ErrorCode, ExportTradeRequest, \
+    ListTradeGroupRequest, ListTradeGroupResponse
+from ibtrading.domain.commons import BaseResponse
 from ibtrading.service.helper import get_trade_service
-from ibtrading.utils import loggerutil
+from ibtrading.utils import loggerutil, exportutil
 
 logger = loggerutil.get_logger(__name__)
 
@@ -22,9 +26,46 @@ async def list_trades_v2(req: ListTradeRequest = ListTradeRequest(),
                          authorization: str = Depends(get_authorization_token)):
     try:
         req.authorization = authorization
+        if req.compact:
+            return compact_trade_row_response(*await get_trade_service().list_trade_rows(req))
 
         data = await get_trade_service().list_trades(req)
-        return data
+        return list_trade_response(data)
     except Exception as e:
         logger.exception(f"Error: {e}")
         return ListTradeResponse(error=True, code=ErrorCode.INTERNAL_ERROR, message=str(e))
+
+
+@router.post("/api/v2/trades/export")
+async def export_trades(req: ExportTradeRequest = ExportTradeRequest(),
+                        authorization: str = Depends(get_authorization_token)):
+    """
+    Stream the trades matching req.filter as flat columns (trade, order_*, contract_*) in CSV, Arrow IPC stream
+    or Parquet. Errors are returned as a JSON BaseResponse.
+    """
+    try:
+        req.authorization = authorization
+        error, chunks = await get_trade_service().export_trades(req)
+        if error is not None:
+            return error
+        media_type, extension = exportutil.EXPORT_FORMATS[req.format]
+        return StreamingResponse(chunks, media_type=media_type,
+                                 headers={"Content-Disposition": f'attachment; filename="trades.{extension}"'})
+    except Exception as e:
+        logger.exception(f"Error: {e}")
+        return BaseResponse(error=True, code=ErrorCode.INTERNAL_ERROR, message=str(e))
+
+
+@router.post("/api/v2/trade-groups", response_model=ListTradeGroupResponse)
+async def list_trade_groups(req: ListTradeGroupRequest = ListTradeGroupRequest(),
+                            authorization: str = Depends(get_authorization_token)):
+    """
+    Trade groups (open and closed trade sets) with their entry/exit prices, PnL and times, and a summary of the
+    closed groups matching the filter.
+    """
+    try:
+        req.authorization = authorization
+        return await get_trade_service().list_trade_groups(req)
+    except Exception as e:
+        logger.exception(f"Error: {e}")
+        return ListTradeGroupResponse(error=True, code=ErrorCode.INTERNAL_ERROR, message=str(e))
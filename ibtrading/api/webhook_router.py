@@ -0,0 +1,25 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+
+from fastapi import APIRouter
+
+from ibtrading.domain import WebhookPayload, ErrorCode
+from ibtrading.domain.webhook import WebhookResponse
+from ibtrading.service.helper import get_webhook_service
+from ibtrading.utils import loggerutil
+
+logger = loggerutil.get_logger(__name__)
+
+router = APIRouter(tags=["Webhook"])
+
+
+@router.post("/api/v1/webhook/{api_key}", response_model=WebhookResponse)
+async def webhook(api_key: str, req: WebhookPayload):
+    try:
+        return await get_webhook_service().receive(api_key, req)
+    except Exception as e:
+        logger.exception(f"Error: {e}")
+        return WebhookResponse(error=True, code=ErrorCode.INTERNAL_ERROR, message=str(e))
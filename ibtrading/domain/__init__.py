@@ -12,7 +12,11 @@ from .contract import ContractData
 from .order import OrderData, OrderStatus, OrderType, OrderDirection, RefData
 from .order_req_res import *
 from .portfolio import PortfolioData
+from .sql_profile import SqlStatementStats, SlowQuery, SqlProfileResponse
 from .trade import TradeData
+from .trade_group import TradeGroupData, TradeGroupFilter, TradeGroupSummary, ListTradeGroupRequest, \
+    ListTradeGroupResponse
 from .trade_req_res import *
+from .trade_row import TradeRow, OrderRow, TradeRowPage
 from .user import User
 from .webhook import WebhookPayload, WebhookResponse
@@ -0,0 +1,36 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from ibtrading.domain.commons import BaseResponse
+
+
+class SqlStatementStats(BaseModel):
+    statement: str = None
+    count: int = 0
+    total_ms: float = 0.0
+    mean_ms: float = 0.0
+    max_ms: float = 0.0
+    rows: int = 0
+    n_plus_one: int = 0
+    last_scope: Optional[str] = None
+
+
+class SlowQuery(BaseModel):
+    statement: str = None
+    duration_ms: float = 0.0
+    parameters: str = None
+    scope: Optional[str] = None
+    at: datetime = None
+
+
+class SqlProfileResponse(BaseResponse):
+    enabled: bool = False
+    statements: List[SqlStatementStats] = []
+    slow_queries: List[SlowQuery] = []
@@ -0,0 +1,68 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from ibtrading.domain.commons import BaseRequest, BaseResponse, Pagination
+from ibtrading.domain.contract import ContractData
+
+
+class TradeGroupData(BaseModel):
+    id: Optional[int] = None  # None for open groups, which have no trade_group row
+    trade_id: Optional[int] = None
+    account_id: Optional[str] = None
+    contract_id: Optional[int] = None
+    contract: Optional[ContractData] = None
+    direction: Optional[str] = None
+    status: str = None
+    entry_quantity: int = 0
+    exit_quantity: int = 0
+    entry_price: Optional[float] = None
+    exit_price: Optional[float] = None
+    total_pnl: Optional[float] = None
+    total_pnl_percent: Optional[float] = None
+    total_commission: Optional[float] = None
+    trade_count: int = 0
+    open_time: Optional[datetime] = None
+    close_time: Optional[datetime] = None
+
+
+class TradeGroupFilter(BaseModel):
+    symbols: Optional[List[str]] = Field(default=None, description="List of symbols to filter")
+    security_types: Optional[List[str]] = Field(default=None, description="List of security types")
+    accounts: Optional[List[str]] = Field(default=None, description="List of account IDs")
+    status: Optional[str] = Field(default=None, description="OPEN or CLOSED")
+    from_dt: Optional[datetime] = Field(default=None, description="Opened at or after")
+    to_dt: Optional[datetime] = Field(default=None, description="Opened at or before")
+    pagination: Optional[Pagination] = Field(default=None, description="Pagination info")
+
+
+class TradeGroupSummary(BaseModel):
+    """
+    Aggregates over the closed groups matching a filter, across all pages.
+    """
+    closed_count: int = 0
+    open_count: int = 0
+    win_count: int = 0
+    loss_count: int = 0
+    win_rate: float = 0.0  # Percent of the closed groups with a positive PnL
+    total_pnl: float = 0.0
+    total_commission: float = 0.0
+    average_pnl: float = 0.0
+    best_pnl: Optional[float] = None
+    worst_pnl: Optional[float] = None
+
+
+class ListTradeGroupRequest(BaseRequest):
+    filter: TradeGroupFilter = Field(default_factory=TradeGroupFilter)
+
+
+class ListTradeGroupResponse(BaseResponse):
+    groups: List[TradeGroupData] = []
+    summary: TradeGroupSummary = None
+    pagination: Pagination = None
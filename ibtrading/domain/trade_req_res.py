@@ -25,6 +25,14 @@ class TradeDataFilter(BaseModel):
 
 class ListTradeRequest(BaseRequest):
     filter: TradeDataFilter = Field(default_factory=TradeDataFilter)
+    compact: bool = Field(default=False, description="Send each trade once, grouped_trades as indices into "
+                                                       "trades, and contracts/ref data once in side dictionaries")
+
+
+class ExportTradeRequest(BaseRequest):
+    filter: TradeDataFilter = Field(default_factory=TradeDataFilter)
+    format: str = Field(default="csv", description="csv, arrow (Arrow IPC stream) or parquet")
+    batch_size: int = Field(default=5000, ge=100, le=50000, description="Rows read and encoded per chunk")
 
 
 class ListTradeResponse(BaseResponse):
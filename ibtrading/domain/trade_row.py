@@ -0,0 +1,93 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ibtrading.domain.commons import Pagination
+from ibtrading.domain.contract import ContractData
+from ibtrading.domain.order import OrderDirection, OrderStatus, OrderType, RefData
+
+
+@dataclass(slots=True)
+class OrderRow:
+    """
+    Read-only view of an order for trade listings: the fields of OrderData without its contract and ref data,
+    which are shared per contract_id/ref_id in a TradeRowPage.
+    """
+    id: Optional[int] = None
+    order_id: Optional[int] = None
+    perm_id: Optional[int] = None
+    client_id: Optional[int] = None
+    account_id: Optional[str] = None
+    contract_id: Optional[int] = None
+    order_type: Optional[OrderType] = None
+    direction: Optional[OrderDirection] = None
+    market_action: Optional[str] = None
+    quantity: Optional[float] = None
+    limit_price: Optional[float] = None
+    stop_price: Optional[float] = None
+    trailing_percent: Optional[float] = None
+    trail_stop_price: Optional[float] = None
+    percent_offset: Optional[float] = None
+    tif: Optional[str] = "DAY"
+    status: Optional[OrderStatus] = OrderStatus.Unknown
+    message: Optional[str] = None
+    error_code: Optional[str] = None
+    filled_quantity: Optional[float] = 0
+    remaining_quantity: Optional[float] = 0
+    avg_fill_price: Optional[float] = None
+    is_active: Optional[bool] = True
+    order_time: Optional[datetime] = None
+    ref_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+@dataclass(slots=True)
+class TradeRow:
+    """
+    Read-only view of a trade for trade listings: the fields of TradeData with the order as an OrderRow and
+    no nested contract. Slotted, so a row costs two small objects instead of four dict-backed dataclasses.
+    """
+    id: Optional[int] = None
+    trade_id: Optional[int] = None
+    order_id: Optional[int] = None
+    client_id: Optional[int] = None
+    account_id: Optional[str] = None
+    contract_id: Optional[int] = None
+    direction: Optional[OrderDirection] = None
+    market_action: Optional[str] = None
+    quantity: Optional[int] = None
+    price: Optional[float] = None
+    avg_price: Optional[float] = None
+    trade_time: Optional[datetime] = None
+    status: Optional[OrderStatus] = OrderStatus.Unknown
+    commission: Optional[float] = None
+    pnl: Optional[float] = None
+    released_pnl: Optional[float] = 0.0
+    unrealized_pnl: Optional[float] = 0.0
+    total_pnl: float = 0.0
+    total_pnl_percent: float = 0.0
+    cumulative_pnl: float = 0.0
+    cumulative_pnl_percent: float = 0.0
+    total_commission: float = 0.0
+    cumulative_commission: float = 0.0
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    order: Optional[OrderRow] = None
+
+
+@dataclass
+class TradeRowPage:
+    """
+    Trades as TradeRows, with their contracts (by str(contract_id)) and webhook ref data (by ref_id) once each.
+    """
+    trades: List[TradeRow] = field(default_factory=list)
+    grouped_trades: List[List[TradeRow]] = field(default_factory=list)  # Set by TradeService, as in ListTradeResponse
+    contracts: Dict[str, ContractData] = field(default_factory=dict)
+    refs: Dict[str, RefData] = field(default_factory=dict)
+    pagination: Optional[Pagination] = None
@@ -40,6 +40,7 @@ class WebhookPayload(BaseModel):
     last_trade_date_or_contract_month: str = None  # YYYYMMDD
     message: str = None
     vt_symbol: str = None
+    fingerprint: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
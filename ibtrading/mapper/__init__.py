@@ -8,3 +8,7 @@ from ibtrading.mapper.ib_mapper import *
 from ibtrading.mapper.order_data_mapper import *
 from ibtrading.mapper.order_record_mapper import *
 from ibtrading.mapper.webhook_mapper import *
+from ibtrading.mapper.trade_response_mapper import *
+from ibtrading.mapper.trade_row_mapper import *
+from ibtrading.mapper.trade_columns_mapper import *
+from ibtrading.mapper.trade_group_mapper import *
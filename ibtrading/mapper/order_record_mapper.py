@@ -63,6 +63,10 @@ def map2trade_data(trade: TradeRecord, order: OrderRecord, contract: ContractRec
     t.unrealized_pnl = trade.unrealized_pnl
     t.total_pnl = trade.total_pnl
     t.total_commission = trade.total_commission
+    if trade.cumulative_pnl is not None:
+        t.cumulative_pnl = trade.cumulative_pnl
+    if trade.cumulative_commission is not None:
+        t.cumulative_commission = trade.cumulative_commission
 
     if order:
         o = order
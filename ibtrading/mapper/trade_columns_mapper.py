@@ -0,0 +1,98 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from typing import Iterable, Optional
+
+from ibtrading.domain import ContractData, OrderData, Pagination, RefData, TradeData
+from ibtrading.domain.trade_row import OrderRow, TradeRow, TradeRowPage
+
+# The columns map2trade_data reads, per table, named as the domain fields they are copied to.
+# Rows of TradeRepo's column statement hold them in this order: trade, order, contract, webhook log.
+TRADE_COLUMNS = ("id", "trade_id", "order_id", "client_id", "account_id", "contract_id", "direction", "quantity",
+                 "price", "avg_price", "trade_time", "status", "commission", "pnl", "released_pnl", "unrealized_pnl",
+                 "total_pnl", "total_commission", "cumulative_pnl", "cumulative_commission", "created_at",
+                 "updated_at")
+ORDER_COLUMNS = ("order_id", "perm_id", "client_id", "account_id", "contract_id", "ref_id", "direction",
+                 "market_action", "order_type", "order_time", "stop_price", "limit_price", "trailing_percent",
+                 "percent_offset", "tif", "status", "quantity", "filled_quantity", "remaining_quantity",
+                 "avg_fill_price", "is_active", "message", "error_code")
+CONTRACT_COLUMNS = ("id", "contract_id", "sec_type", "symbol", "last_trade_date_or_contract_month", "strike", "right",
+                    "multiplier", "exchange", "currency", "local_symbol", "trading_class", "include_expired",
+                    "sec_id_type", "sec_id", "description", "issuer_id", "combo_legs_desc", "combo_legs",
+                    "delta_neutral_contract", "vt_symbol", "created_at", "updated_at")
+REF_COLUMNS = ("id", "ref_id", "vt_symbol", "dt", "open", "high", "low", "close", "action", "market_action",
+               "market_position", "market_position_size", "message", "created_at", "volume")
+
+_ORDER_START = len(TRADE_COLUMNS)
+_CONTRACT_START = _ORDER_START + len(ORDER_COLUMNS)
+_REF_START = _CONTRACT_START + len(CONTRACT_COLUMNS)
+_PERM_ID = _ORDER_START + ORDER_COLUMNS.index("perm_id")
+_MARKET_ACTION = _ORDER_START + ORDER_COLUMNS.index("market_action")
+_CONTRACT_ID = _CONTRACT_START + CONTRACT_COLUMNS.index("contract_id")
+_REF_ID = _REF_START
+
+
+def _trade_values(row) -> dict:
+    values = dict(zip(TRADE_COLUMNS, row[:_ORDER_START]))
+    # As map2trade_data: a missing cumulative value keeps the dataclass default
+    if values["cumulative_pnl"] is None:
+        del values["cumulative_pnl"]
+    if values["cumulative_commission"] is None:
+        del values["cumulative_commission"]
+    return values
+
+
+def _contract_data(row) -> Optional[ContractData]:
+    if row[_CONTRACT_ID] is None:
+        return None
+    return ContractData(**dict(zip(CONTRACT_COLUMNS, row[_CONTRACT_START:_REF_START])))
+
+
+def _ref_data(row) -> Optional[RefData]:
+    if row[_REF_ID] is None:
+        return None
+    values = dict(zip(REF_COLUMNS, row[_REF_START:]))
+    volume = values.pop("volume")
+    ref = RefData(**values)
+    ref.volume = volume  # Not a RefData field, but map2_ref_data sets it too
+    return ref
+
+
+def map2trade_data_from_columns(row) -> TradeData:
+    """
+    map2trade_data for a row of plain column values (see TRADE_COLUMNS) instead of four ORM objects.
+    """
+    t = TradeData(**_trade_values(row))
+    if row[_PERM_ID] is None:
+        return t
+    order = OrderData(**dict(zip(ORDER_COLUMNS, row[_ORDER_START:_CONTRACT_START])))
+    order.ref_data = _ref_data(row)
+    t.order = order
+    t.market_action = order.market_action
+    t.contract = _contract_data(row)
+    return t
+
+
+def map2trade_row_page_from_columns(rows: Iterable, pagination: Optional[Pagination] = None) -> TradeRowPage:
+    """
+    map2trade_row_page for rows of plain column values (see TRADE_COLUMNS).
+    """
+    page = TradeRowPage(pagination=pagination)
+    trades = page.trades
+    contracts = page.contracts
+    refs = page.refs
+    for row in rows:
+        order = None
+        if row[_PERM_ID] is not None:
+            order = OrderRow(**dict(zip(ORDER_COLUMNS, row[_ORDER_START:_CONTRACT_START])))
+            if order.ref_id is not None and order.ref_id not in refs:
+                ref = _ref_data(row)
+                if ref is not None:
+                    refs[order.ref_id] = ref
+            contract_id = row[_CONTRACT_ID]
+            if contract_id is not None and str(contract_id) not in contracts:
+                contracts[str(contract_id)] = _contract_data(row)
+        trades.append(TradeRow(**_trade_values(row), market_action=row[_MARKET_ACTION], order=order))
+    return page
@@ -0,0 +1,20 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from ibtrading import domain
+from ibtrading.mapper import order_record_mapper
+from ibtrading.model.contract_record import ContractRecord
+from ibtrading.model.trade_group_record import TradeGroupRecord
+
+# The columns copied between a trade group summary (tradepnl.summarize_trade_group), its record and its domain object
+TRADE_GROUP_COLUMNS = ("trade_id", "account_id", "contract_id", "direction", "status", "entry_quantity",
+                       "exit_quantity", "entry_price", "exit_price", "total_pnl", "total_pnl_percent",
+                       "total_commission", "trade_count", "open_time", "close_time")
+
+
+def map2trade_group_data(group: TradeGroupRecord, contract: ContractRecord = None) -> domain.TradeGroupData:
+    g = domain.TradeGroupData(id=group.id, **{name: getattr(group, name) for name in TRADE_GROUP_COLUMNS})
+    g.contract = order_record_mapper.map2contract_data(contract)
+    return g
@@ -0,0 +1,46 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from ibtrading.domain import ListTradeResponse, ErrorCode
+from ibtrading.domain.trade_row import TradeRowPage
+
+
+def map2trade_response_content(res: ListTradeResponse) -> dict:
+    """
+    ListTradeResponse as JSON-encodable content with the same shape as its pydantic serialization, with the
+    trade dataclasses left for the encoder (see api.responses.FastJSONResponse).
+    """
+    return {
+        "error": res.error,
+        "code": res.code,
+        "message": res.message,
+        "trades": res.trades,
+        "grouped_trades": res.grouped_trades,
+        "pagination": res.pagination,
+    }
+
+
+def map2compact_trade_row_response(page: TradeRowPage) -> dict:
+    """
+    Compact trade listing from a TradeRowPage whose trades are its grouped_trades flattened: every trade is sent
+    once in trades, without a nested contract or webhook ref data; grouped_trades holds indices into trades;
+    contracts (by contract_id) and refs (by ref_id) are sent once each. Rows are left for the encoder as they are.
+    """
+    groups = []
+    start = 0
+    for group in page.grouped_trades:
+        groups.append(list(range(start, start + len(group))))
+        start += len(group)
+    return {
+        "error": False,
+        "code": ErrorCode.UNKNOWN,
+        "message": None,
+        "compact": True,
+        "trades": page.trades,
+        "grouped_trades": groups,
+        "contracts": page.contracts,
+        "refs": page.refs,
+        "pagination": page.pagination,
+    }
@@ -0,0 +1,65 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from typing import Iterable, Optional
+
+from ibtrading.domain import Pagination
+from ibtrading.domain.trade_row import OrderRow, TradeRow, TradeRowPage
+from ibtrading.mapper.order_record_mapper import map2_ref_data, map2contract_data
+from ibtrading.model import ContractRecord, OrderRecord, TradeRecord, WebhookRecord
+
+
+def map2trade_row_page(rows: Iterable[tuple], pagination: Optional[Pagination] = None) -> TradeRowPage:
+    """
+    (trade, order, contract, webhook_log) rows to a TradeRowPage. Each contract and ref is mapped once.
+    """
+    page = TradeRowPage(pagination=pagination)
+    trades = page.trades
+    for trade, order, contract, webhook_log in rows:
+        trades.append(map2trade_row(trade, order, contract, webhook_log, page.contracts, page.refs))
+    return page
+
+
+def map2trade_row(trade: TradeRecord, order: Optional[OrderRecord], contract: Optional[ContractRecord],
+                  webhook_log: Optional[WebhookRecord], contracts: dict, refs: dict) -> TradeRow:
+    """
+    Same values as map2trade_data, with the contract and ref data added to contracts/refs instead of the row.
+    """
+    if order is None:
+        order = trade.order
+    if contract is None and order is not None:
+        contract = order.contract
+    if contract is not None and contract.contract_id is not None:
+        key = str(contract.contract_id)
+        if key not in contracts:
+            contracts[key] = map2contract_data(contract)
+
+    order_row = None
+    if order is not None:
+        if webhook_log is not None and order.ref_id is not None and order.ref_id not in refs:
+            ref = map2_ref_data(webhook_log)
+            if ref is not None:
+                refs[order.ref_id] = ref
+        order_row = OrderRow(order_id=order.order_id, perm_id=order.perm_id, client_id=order.client_id,
+                             account_id=order.account_id, contract_id=order.contract_id, order_type=order.order_type,
+                             direction=order.direction, market_action=order.market_action, quantity=order.quantity,
+                             limit_price=order.limit_price, stop_price=order.stop_price,
+                             trailing_percent=order.trailing_percent, percent_offset=order.percent_offset,
+                             tif=order.tif, status=order.status, message=order.message, error_code=order.error_code,
+                             filled_quantity=order.filled_quantity, remaining_quantity=order.remaining_quantity,
+                             avg_fill_price=order.avg_fill_price, is_active=order.is_active,
+                             order_time=order.order_time, ref_id=order.ref_id)
+
+    return TradeRow(id=trade.id, trade_id=trade.trade_id, order_id=trade.order_id, client_id=trade.client_id,
+                    account_id=trade.account_id, contract_id=trade.contract_id, direction=trade.direction,
+                    market_action=order_row.market_action if order_row is not None else None,
+                    quantity=trade.quantity, price=trade.price, avg_price=trade.avg_price,
+                    trade_time=trade.trade_time, status=trade.status, commission=trade.commission, pnl=trade.pnl,
+                    released_pnl=trade.released_pnl, unrealized_pnl=trade.unrealized_pnl, total_pnl=trade.total_pnl,
+                    total_commission=trade.total_commission,
+                    cumulative_pnl=trade.cumulative_pnl if trade.cumulative_pnl is not None else 0.0,
+                    cumulative_commission=trade.cumulative_commission
+                    if trade.cumulative_commission is not None else 0.0,
+                    created_at=trade.created_at, updated_at=trade.updated_at, order=order_row)
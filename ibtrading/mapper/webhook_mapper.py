@@ -34,9 +34,20 @@ def populate_webhook_payload(req: WebhookPayload) -> WebhookPayload:
                                                            timeframe=req.timeframe,
                                                            exchange=req.exchange,
                                                            currency=req.currency)
+    req.fingerprint = generate_webhook_fingerprint(req)
     return req
 
 
+def generate_webhook_fingerprint(req: WebhookPayload) -> str:
+    """
+    Stable content hash of a populated webhook: the same alert delivered twice (e.g. a TradingView retry)
+    gets the same fingerprint, while ref_id is fresh for every delivery.
+    """
+    fields = [req.strategy, req.vt_symbol, req.action, req.time.isoformat() if req.time else None,
+              req.market_position, req.position_size, req.market_position_size, req.contracts]
+    return uuidutil.generate_md5("|".join("" if f is None else str(f) for f in fields))
+
+
 def get_market_action(action, market_position) -> str:
     if action == 'BUY' and market_position == 'LONG':
         return 'ENTRY_LONG'
@@ -79,6 +90,7 @@ def map2contract_record(payload: WebhookPayload):
         message=payload.message,
         vt_symbol=payload.vt_symbol,
         payload=payload.model_dump(mode="json"),
+        fingerprint=payload.fingerprint or generate_webhook_fingerprint(payload),
         created_at=payload.created_at,
         updated_at=payload.updated_at,
     )
@@ -115,6 +127,7 @@ def map2webhook_payload(record: model.WebhookRecord):
         last_trade_date_or_contract_month=record.last_trade_date_or_contract_month,
         message=record.message,
         vt_symbol=record.vt_symbol or "",
+        fingerprint=record.fingerprint,
         created_at=record.created_at,
         updated_at=record.updated_at,
     )
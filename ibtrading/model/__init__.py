@@ -5,8 +5,13 @@
 """
 
 from ibtrading.model.account_value_record import AccountValueRecord
+from ibtrading.model.auth_session_record import AuthSessionRecord
 from ibtrading.model.contract_record import ContractRecord
 from ibtrading.model.order_record import OrderRecord
+from ibtrading.model.pnl_checkpoint_record import PnlCheckpointRecord
 from ibtrading.model.portfolio_record import PortfolioRecord
+from ibtrading.model.trade_group_record import TradeGroupRecord
 from ibtrading.model.trade_record import TradeRecord
 from ibtrading.model.webhook_record import WebhookRecord
+from ibtrading.model.schema_version_record import SchemaVersionRecord
+from ibtrading.model.user_model import UserModel
@@ -0,0 +1,26 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+
+from sqlalchemy import Column, String, DateTime, Index
+
+from ibtrading.repo.datasource import Base
+from ibtrading.utils.dtutil import current_time
+
+
+class AuthSessionRecord(Base):
+    """
+    Access token session, used by the db session backend so all worker processes share logins.
+    """
+    __tablename__ = 'auth_session'
+    __table_args__ = (Index('ix_auth_session_expiry', 'expiry'),)
+
+    token_hash = Column(String(64), primary_key=True)  # SHA-256 of the access token
+    username = Column(String, nullable=False)
+    expiry = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=current_time)
+
+    def __repr__(self):
+        return f"AuthSession(username={self.username}, expiry={self.expiry}, created_at={self.created_at})"
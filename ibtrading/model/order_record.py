@@ -4,7 +4,7 @@
 -- Created on: 06/02/2025
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Enum, Index
 
 from ibtrading.domain import OrderType, OrderStatus
 from ibtrading.domain.order import OrderDirection
@@ -14,6 +14,13 @@ from ibtrading.utils.dtutil import current_time
 
 class OrderRecord(Base):
     __tablename__ = "order"
+    __table_args__ = (
+        Index('ix_order_perm_id', 'perm_id'),  # Join from trade.order_id
+        Index('ix_order_order_id', 'order_id'),
+        Index('ix_order_contract_id', 'contract_id'),
+        Index('ix_order_ref_id', 'ref_id'),  # Join to webhook_log.ref_id
+        Index('ix_order_created_at', 'created_at'),
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     order_id = Column(Integer, nullable=True)
     perm_id = Column(Integer, nullable=True)
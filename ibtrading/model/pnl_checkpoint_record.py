@@ -0,0 +1,35 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+
+from ibtrading.repo.datasource import Base
+from ibtrading.utils.dtutil import current_time
+
+ACCOUNT_TOTAL_CONTRACT_ID = 0  # contract_id of the account-wide running total
+
+
+class PnlCheckpointRecord(Base):
+    """
+    Running realized PnL totals, one row per (account_id, contract_id) plus one account-wide row
+    with contract_id = ACCOUNT_TOTAL_CONTRACT_ID. Updated whenever a trade group closes.
+    """
+    __tablename__ = 'pnl_checkpoint'
+    __table_args__ = (UniqueConstraint('account_id', 'contract_id', name='uq_pnl_checkpoint_account_contract'),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account_id = Column(String(32), nullable=True)
+    contract_id = Column(Integer, nullable=False, default=ACCOUNT_TOTAL_CONTRACT_ID)
+    cumulative_pnl = Column(Float, default=0.0)
+    cumulative_commission = Column(Float, default=0.0)
+    group_count = Column(Integer, default=0)
+    last_trade_id = Column(Integer, nullable=True)  # trade_id of the last applied trade group
+    last_trade_time = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=current_time)
+    updated_at = Column(DateTime, default=current_time, onupdate=current_time)
+
+    def __repr__(self):
+        return f"PnlCheckpoint(id={self.id}, account_id={self.account_id}, contract_id={self.contract_id}, cumulative_pnl={self.cumulative_pnl}, cumulative_commission={self.cumulative_commission}, group_count={self.group_count}, last_trade_id={self.last_trade_id}, last_trade_time={self.last_trade_time})"
@@ -5,7 +5,7 @@
 """
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
 
 from ibtrading.repo.datasource import Base
 from ibtrading.utils.dtutil import current_time
@@ -13,6 +13,10 @@ from ibtrading.utils.dtutil import current_time
 
 class PortfolioRecord(Base):
     __tablename__ = 'portfolio'
+    __table_args__ = (
+        Index('ix_portfolio_account_id_contract_id', 'account_id', 'contract_id'),
+        Index('ix_portfolio_contract_id', 'contract_id'),  # Join to contract.contract_id
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     account_id = Column(String(32), nullable=True)
     contract_id = Column(Integer, nullable=True)
@@ -0,0 +1,24 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+
+from ibtrading.repo.datasource import Base
+from ibtrading.utils.dtutil import current_time
+
+
+class SchemaVersionRecord(Base):
+    """
+    Single row holding the fingerprint of the model schema the database was last created/migrated for.
+    """
+    __tablename__ = 'schema_version'
+
+    id = Column(Integer, primary_key=True)
+    fingerprint = Column(String(32), nullable=False)
+    updated_at = Column(DateTime, default=current_time, onupdate=current_time)
+
+    def __repr__(self):
+        return f"SchemaVersion(id={self.id}, fingerprint={self.fingerprint}, updated_at={self.updated_at})"
@@ -0,0 +1,46 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+
+from ibtrading.repo.datasource import Base
+from ibtrading.utils.dtutil import current_time
+
+
+class TradeGroupRecord(Base):
+    """
+    One row per closed (priced) trade group of a contract, keyed by the trade_id stamped on its trades.
+    Written by OrderRepo when a fill closes a group; rebuilt from the trades by OrderRepo.rebuild_trade_groups.
+    Open groups have no row, TradeRepo.list_trade_groups derives them from the trades.
+    """
+    __tablename__ = 'trade_group'
+    __table_args__ = (
+        Index('ix_trade_group_trade_id', 'trade_id', unique=True),
+        Index('ix_trade_group_contract_id_close_time', 'contract_id', 'close_time'),  # The last close of a contract
+        Index('ix_trade_group_open_time_id', 'open_time', 'id'),  # List ordering and keyset pagination
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    trade_id = Column(Integer, nullable=True)
+    account_id = Column(String(32), nullable=True)
+    contract_id = Column(Integer, nullable=True)
+    direction = Column(String(8), nullable=True)  # LONG, SHORT
+    status = Column(String(8), nullable=False)  # CLOSED; OPEN rows were written by earlier versions
+    entry_quantity = Column(Integer, default=0)
+    exit_quantity = Column(Integer, default=0)
+    entry_price = Column(Float, nullable=True)  # Volume weighted
+    exit_price = Column(Float, nullable=True)
+    total_pnl = Column(Float, nullable=True)
+    total_pnl_percent = Column(Float, nullable=True)
+    total_commission = Column(Float, nullable=True)
+    trade_count = Column(Integer, default=0)
+    open_time = Column(DateTime, nullable=True)  # trade_time of the first fill
+    close_time = Column(DateTime, nullable=True)  # trade_time of the closing fill
+    created_at = Column(DateTime, default=current_time)
+    updated_at = Column(DateTime, default=current_time, onupdate=current_time)
+
+    def __repr__(self):
+        return f"TradeGroup(id={self.id}, trade_id={self.trade_id}, contract_id={self.contract_id}, direction={self.direction}, status={self.status}, entry_quantity={self.entry_quantity}, exit_quantity={self.exit_quantity}, total_pnl={self.total_pnl}, open_time={self.open_time}, close_time={self.close_time})"
@@ -4,7 +4,7 @@
 -- Created on: 06/02/2025
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, Index
 
 from ibtrading.domain import OrderDirection, OrderStatus
 from ibtrading.repo.datasource import Base
@@ -13,6 +13,12 @@ from ibtrading.utils.dtutil import current_time
 
 class TradeRecord(Base):
     __tablename__ = 'trade'
+    __table_args__ = (
+        Index('ix_trade_order_id', 'order_id'),  # Join to order.perm_id
+        Index('ix_trade_trade_id', 'trade_id'),
+        Index('ix_trade_created_at_id', 'created_at', 'id'),  # List ordering and keyset pagination
+        Index('ix_trade_contract_id_trade_time', 'contract_id', 'trade_time'),  # Trade set loading
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
     trade_id = Column(Integer, nullable=True)
     order_id = Column(Integer, nullable=True)  # Order permId
@@ -31,6 +37,8 @@ class TradeRecord(Base):
     unrealized_pnl = Column(Float, default=0.0)
     total_pnl = Column(Float, nullable=True)
     total_commission = Column(Float, nullable=True)
+    cumulative_pnl = Column(Float, nullable=True)  # Account running total at the close of this trade group
+    cumulative_commission = Column(Float, nullable=True)
     status = Column(Enum(OrderStatus), nullable=True)
     created_at = Column(DateTime, default=current_time)
     updated_at = Column(DateTime, default=current_time, onupdate=current_time)
@@ -39,4 +47,4 @@ class TradeRecord(Base):
     order = None
 
     def __repr__(self):
-        return f"Trade(id={self.id}, trade_id={self.trade_id}, order_id={self.order_id}, client_id={self.client_id}, account_id={self.account_id}, contract_id={self.contract_id}, direction={self.direction}, market_action={self.market_action}, quantity={self.quantity}, price={self.price}, avg_price={self.avg_price}, trade_time={self.trade_time}, commission={self.commission}, pnl={self.pnl}, released_pnl={self.released_pnl}, unrealized_pnl={self.unrealized_pnl}, total_pnl={self.total_pnl}, total_commission={self.total_commission}, status={self.status}, created_at={self.created_at}, updated_at={self.updated_at})"
+        return f"Trade(id={self.id}, trade_id={self.trade_id}, order_id={self.order_id}, client_id={self.client_id}, account_id={self.account_id}, contract_id={self.contract_id}, direction={self.direction}, market_action={self.market_action}, quantity={self.quantity}, price={self.price}, avg_price={self.avg_price}, trade_time={self.trade_time}, commission={self.commission}, pnl={self.pnl}, released_pnl={self.released_pnl}, unrealized_pnl={self.unrealized_pnl}, total_pnl={self.total_pnl}, total_commission={self.total_commission}, cumulative_pnl={self.cumulative_pnl}, cumulative_commission={self.cumulative_commission}, status={self.status}, created_at={self.created_at}, updated_at={self.updated_at})"
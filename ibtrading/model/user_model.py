@@ -1,7 +1,7 @@
 from sqlalchemy import Column, String, Boolean, Integer
-from sqlalchemy.ext.declarative import declarative_base
 
-Base = declarative_base()
+from ibtrading.repo.datasource import Base
+
 
 class UserModel(Base):
     __tablename__ = 'users'
@@ -14,4 +14,4 @@ class UserModel(Base):
     hashed_password = Column(String, nullable=False)
 
     def __repr__(self):
-        return f"<UserModel(username={self.username}, full_name={self.full_name}, role={self.role})>"
\ No newline at end of file
+        return f"<UserModel(username={self.username}, full_name={self.full_name}, role={self.role})>"
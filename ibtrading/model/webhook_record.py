@@ -4,7 +4,7 @@
 -- Created on: 06/02/2025
 """
 
-from sqlalchemy import Column, Integer, JSON, DateTime, String, Float, Text
+from sqlalchemy import Column, Integer, JSON, DateTime, String, Float, Text, Index
 
 from ibtrading.domain import WebhookPayload
 from ibtrading.repo.datasource import Base
@@ -13,6 +13,11 @@ from ibtrading.utils.dtutil import current_time
 
 class WebhookRecord(Base):
     __tablename__ = "webhook_log"
+    __table_args__ = (
+        Index('ix_webhook_log_ref_id', 'ref_id'),
+        Index('ix_webhook_log_vt_symbol_created_at', 'vt_symbol', 'created_at'),  # Last webhook per symbol
+        Index('ix_webhook_log_dt', 'dt'),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     ref_id = Column(String, nullable=True)
@@ -41,6 +46,7 @@ class WebhookRecord(Base):
     message = Column(String, nullable=True)
     vt_symbol = Column(String, nullable=True)
     payload = Column(JSON, nullable=False)
+    fingerprint = Column(String(32), nullable=True, unique=True, index=True)  # See generate_webhook_fingerprint
     created_at = Column(DateTime(timezone=True), default=current_time)
     updated_at = Column(DateTime(timezone=True), default=current_time, onupdate=current_time)
 
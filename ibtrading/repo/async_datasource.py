@@ -0,0 +1,83 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import importlib.util
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from ibtrading.repo.sqlprofiler import get_sql_profiler
+from ibtrading.settings import Settings
+from ibtrading.utils import loggerutil
+
+logger = loggerutil.get_logger(__name__)
+
+# Async driver for each backend, and the module that has to be importable to use it
+ASYNC_DRIVERS = {
+    "sqlite": ("aiosqlite", "aiosqlite"),
+    "postgresql": ("asyncpg", "asyncpg"),
+}
+
+
+def to_async_url(database_url: str) -> Optional[str]:
+    """
+    Rewrite a sync database URL (e.g. sqlite:///..., postgresql+psycopg2://...) to its async driver.
+    Returns None if the backend has no supported async driver or the driver is not installed.
+    """
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        return None
+    name, module = driver
+    if importlib.util.find_spec(module) is None:
+        return None
+    return url.set(drivername=f"{url.get_backend_name()}+{name}").render_as_string(hide_password=False)
+
+
+class AsyncDataSource:
+    """
+    AsyncEngine over the same database as DataSource, for the FastAPI request path.
+    Tables are created and migrated by the sync DataSource; this class only serves sessions.
+    """
+
+    def __init__(self, database_url: str = None):
+        database_url = database_url or Settings.DATABASE_URL
+        async_url = to_async_url(database_url)
+        if async_url is None:
+            raise ValueError(f"No async driver available for database: {make_url(database_url).get_backend_name()}")
+        if make_url(async_url).get_backend_name() == "sqlite":
+            self.engine = create_async_engine(async_url)
+        else:
+            self.engine = create_async_engine(async_url,
+                                              pool_size=Settings.DATABASE_POOL_SIZE,
+                                              max_overflow=Settings.DATABASE_MAX_OVERFLOW,
+                                              pool_timeout=60,
+                                              pool_recycle=3600)
+        if Settings.SQL_PROFILER_ENABLED:
+            get_sql_profiler().attach(self.engine.sync_engine)
+        self.Session = async_sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+
+    @staticmethod
+    def is_supported(database_url: str = None) -> bool:
+        return to_async_url(database_url or Settings.DATABASE_URL) is not None
+
+    async def ping(self):
+        try:
+            async with self.engine.connect() as connection:
+                result = await connection.execute(text("SELECT 1"))
+                logger.info(f"Async database connection established: {result.scalar()}")
+        except Exception as e:
+            logger.exception(f"Async database connection error: {e}")
+
+    def get_session(self) -> AsyncSession:
+        """
+        Creates a new AsyncSession. Use it as an async context manager.
+        """
+        return self.Session()
+
+    async def dispose(self):
+        await self.engine.dispose()
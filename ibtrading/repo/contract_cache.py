@@ -0,0 +1,114 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import copy
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from ibtrading.domain import ContractData
+from ibtrading.utils import loggerutil
+
+logger = loggerutil.get_logger(__name__)
+
+ContractKey = Tuple[Optional[str], ...]
+
+
+def contract_key(symbol: str, sec_type: str, exchange: str, currency: str, expiry: str = None,
+                 right: str = None) -> ContractKey:
+    """
+    Lookup key of a contract without a contract_id, as used by OrderRepo.get_contract. Empty values are None.
+    """
+    return tuple(v or None for v in (symbol, sec_type, exchange, currency, expiry, right))
+
+
+class ContractCache:
+    """
+    Process-wide contract metadata indexed by contract_id, by contract_key and by vt_symbol.
+    Contracts practically never change, so entries do not expire: OrderRepo warms the cache at startup, adds
+    contracts as it reads or inserts them and invalidates a contract when the transaction inserting it rolls back.
+    Lookups return copies, so callers may modify them.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[int, ContractData] = {}
+        self._by_key: Dict[ContractKey, int] = {}
+        self._by_vt_symbol: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, contract_id: int) -> Optional[ContractData]:
+        with self._lock:
+            return self._hit_or_miss(self._by_id.get(contract_id))
+
+    def find(self, key: ContractKey) -> Optional[ContractData]:
+        with self._lock:
+            return self._hit_or_miss(self._by_id.get(self._by_key.get(key)))
+
+    def get_by_vt_symbol(self, vt_symbol: str) -> Optional[ContractData]:
+        with self._lock:
+            return self._hit_or_miss(self._by_id.get(self._by_vt_symbol.get(vt_symbol)))
+
+    def contains(self, contract_id: int) -> bool:
+        with self._lock:
+            return self._hit_or_miss(self._by_id.get(contract_id)) is not None
+
+    def _hit_or_miss(self, contract: Optional[ContractData]) -> Optional[ContractData]:
+        if contract is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return copy.copy(contract)
+
+    def put(self, contract: Optional[ContractData], key: ContractKey = None):
+        """
+        Add or replace a contract. key is an extra lookup key that resolved to it, e.g. one without a right.
+        """
+        if contract is None or contract.contract_id is None:
+            return
+        contract = copy.copy(contract)
+        with self._lock:
+            self._by_id[contract.contract_id] = contract
+            self._by_key[contract_key(contract.symbol, contract.sec_type, contract.exchange, contract.currency,
+                                      contract.last_trade_date_or_contract_month,
+                                      contract.right)] = contract.contract_id
+            if key is not None:
+                self._by_key[key] = contract.contract_id
+            if contract.vt_symbol:
+                self._by_vt_symbol[contract.vt_symbol] = contract.contract_id
+
+    def warm(self, contracts: Iterable[ContractData]) -> int:
+        count = 0
+        for contract in contracts:
+            self.put(contract)
+            count += 1
+        logger.info(f"Contract cache warmed with {count} contracts.")
+        return count
+
+    def invalidate(self, contract_id: int = None):
+        """
+        Forget a contract (or every contract) so it is read from the database on next use.
+        """
+        with self._lock:
+            if contract_id is None:
+                self._by_id.clear()
+                self._by_key.clear()
+                self._by_vt_symbol.clear()
+                return
+            if self._by_id.pop(contract_id, None) is None:
+                return
+            for index in (self._by_key, self._by_vt_symbol):
+                for k in [k for k, v in index.items() if v == contract_id]:
+                    del index[k]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._by_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"size": len(self._by_id), "hits": self.hits, "misses": self.misses,
+                    "hit_rate": round(self.hits / lookups, 4) if lookups else None}
@@ -3,14 +3,18 @@
 -- Email: asokpant@gmail.com
 -- Created on: 23/10/2024
 """
+import threading
+from typing import Optional
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, insert, delete
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy import inspect
-from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
 
+from ibtrading.repo.sqlprofiler import get_sql_profiler
 from ibtrading.settings import Settings
-from ibtrading.utils import loggerutil
+from ibtrading.utils import loggerutil, uuidutil
 
 
 class Base(DeclarativeBase):
@@ -19,6 +23,24 @@ class Base(DeclarativeBase):
 
 logger = loggerutil.get_logger(__name__)
 
+SCHEMA_VERSION_ID = 1
+
+
+def schema_fingerprint(metadata=None) -> str:
+    """
+    Hash of the declared schema: tables, columns (type, nullability, keys) and indexes.
+    Changes whenever a model change would need create_or_migrate_tables to do something.
+    """
+    metadata = metadata or Base.metadata
+    parts = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        parts.append(f"table:{table.name}")
+        for column in table.columns:
+            parts.append(f"column:{column.name}:{column.type}:{column.nullable}:{column.primary_key}:{column.unique}")
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            parts.append(f"index:{index.name}:{','.join(c.name for c in index.columns)}:{index.unique}")
+    return uuidutil.generate_md5("\n".join(parts))
+
 
 class DataSource:
     def __init__(self):
@@ -27,13 +49,16 @@ class DataSource:
         """
         try:
             self.engine = create_engine(Settings.DATABASE_URL,
-                                        pool_size=20,
-                                        max_overflow=30,
+                                        pool_size=Settings.DATABASE_POOL_SIZE,
+                                        max_overflow=Settings.DATABASE_MAX_OVERFLOW,
                                         pool_timeout=60,
                                         pool_recycle=3600)
+            if Settings.SQL_PROFILER_ENABLED:
+                get_sql_profiler().attach(self.engine)
             self.ping()
             self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
-            self.create_or_migrate_tables()
+            if Settings.STARTUP_TASKS:
+                self.create_or_migrate_tables()
         except Exception as e:
             logger.exception(f"Database connection error: {e}")
             exit(1)
@@ -61,6 +86,21 @@ class DataSource:
         if session:
             session.close()
 
+    def insert_ignore(self, model, index_elements: list):
+        """
+        INSERT statement for the given model that skips rows conflicting on index_elements, using the
+        dialect-native upsert where available (sqlite, postgresql). Other dialects get a plain INSERT,
+        so callers should filter out existing rows first.
+        """
+        dialect = self.engine.dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+            return sqlite_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as pg_insert
+            return pg_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+        return insert(model)
+
     # def create_tables(self):
     #     """
     #     Creates all tables in the database using the Base metadata.
@@ -68,16 +108,27 @@ class DataSource:
     #     """
     #     Base.metadata.create_all(bind=self.engine)
 
-    def create_or_migrate_tables(self):
+    def create_or_migrate_tables(self, force: bool = False):
         """
         Create tables if they do not exist, or migrate (modify schema) if necessary.
         This method will handle both initial creation and migrations without dropping tables.
+        Skipped when the schema fingerprint stored in the database matches the models, unless force is set.
         """
         try:
+            # Register every model on Base.metadata, whichever module created the first DataSource
+            import ibtrading.model  # noqa: F401
+            fingerprint = schema_fingerprint()
+            if not force and self.get_schema_fingerprint() == fingerprint:
+                logger.info("Database schema is current, skipping migration.")
+                return
             # Create tables if they do not exist
             self.create_tables()
             # Migrate tables (adding new columns, etc.)
-            self.migrate_tables()
+            if self.migrate_tables():
+                self.save_schema_fingerprint(fingerprint)
+            else:
+                # Leave the stored fingerprint as is, so the next startup retries the migration
+                logger.warning("Database schema migration incomplete, schema fingerprint not saved.")
         except OperationalError as e:
             logger.exception(f"Error managing tables: {e}")
             exit(1)
@@ -92,28 +143,56 @@ class DataSource:
                 Base.metadata.create_all(bind=self.engine)
                 logger.info("Tables created successfully.")
             else:
+                # Tables added to the models since the database was created
+                Base.metadata.create_all(bind=self.engine, checkfirst=True)
                 logger.info("Tables already exist.")
         except OperationalError as e:
             logger.exception(f"Error creating tables: {e}")
             exit(1)
 
-    def migrate_tables(self):
+    def migrate_tables(self) -> bool:
         """
         Checks for changes in schema (e.g., new columns) and adds them without dropping tables.
+        Returns False if a column or index could not be added to some table.
         """
         try:
             # Inspect the current state of the database and compare it with the models
             inspector = inspect(self.engine)
+            migrated = True
             for table in Base.metadata.tables.values():
                 if table.name in inspector.get_table_names():
                     logger.info(f"Table '{table.name}' exists. Checking for schema changes...")
                     # Manually add missing columns or perform other migrations
-                    self.add_columns_if_needed(table)
-            logger.info("Tables migration completed successfully.")
+                    migrated &= self.add_columns_if_needed(table)
+                    migrated &= self.add_indexes_if_needed(table)
+            if migrated:
+                logger.info("Tables migration completed successfully.")
+            else:
+                logger.error("Tables migration failed for some tables.")
+            self.log_query_plans()
+            return migrated
         except OperationalError as e:
             logger.exception(f"Error migrating tables: {e}")
             exit(1)
 
+    def get_schema_fingerprint(self) -> Optional[str]:
+        """
+        Schema fingerprint stored by the last migration, or None if there is none.
+        """
+        try:
+            with self.engine.connect() as connection:
+                return connection.execute(text("SELECT fingerprint FROM schema_version WHERE id = :id"),
+                                          {"id": SCHEMA_VERSION_ID}).scalar()
+        except (OperationalError, ProgrammingError):
+            return None
+
+    def save_schema_fingerprint(self, fingerprint: str):
+        table = Base.metadata.tables["schema_version"]
+        with self.engine.begin() as connection:
+            connection.execute(delete(table))
+            connection.execute(insert(table).values(id=SCHEMA_VERSION_ID, fingerprint=fingerprint))
+        logger.info(f"Database schema fingerprint saved: {fingerprint}")
+
     def check_tables_exist(self):
         """
         Checks if the tables already exist in the database.
@@ -125,15 +204,16 @@ class DataSource:
         except OperationalError:
             return False
 
-    def add_columns_if_needed(self, table):
+    def add_columns_if_needed(self, table) -> bool:
         """
         Add missing columns to the table if they are not already present.
+        Returns False if a column could not be added.
         """
         try:
             inspector = inspect(self.engine)
             existing_columns = {col['name'] for col in inspector.get_columns(table.name)}
 
-            with self.engine.connect() as connection:
+            with self.engine.begin() as connection:  # Committed, so a rolled back ALTER is not taken as done
                 for column in table.columns:
                     if column.name not in existing_columns:
                         # Generate raw SQL for adding a column
@@ -144,16 +224,83 @@ class DataSource:
                         connection.execute(text(alter_stmt))
 
                         logger.info(f"Column '{column.name}' added to table '{table.name}'.")
+            return True
         except Exception as e:
             logger.exception(f"Error adding columns to table '{table.name}': {e}")
+            return False
+
+    def add_indexes_if_needed(self, table) -> bool:
+        """
+        Create indexes declared on the model (Column(index=True) or __table_args__) that the table lacks.
+        Returns False if an index could not be created.
+        """
+        try:
+            inspector = inspect(self.engine)
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    logger.info(f"Creating index '{index.name}' on table '{table.name}'.")
+                    index.create(bind=self.engine)
+            return True
+        except Exception as e:
+            logger.exception(f"Error adding indexes to table '{table.name}': {e}")
+            return False
+
+    def explain(self, statement) -> list:
+        """
+        Query plan of a statement, one line per row of the dialect's EXPLAIN output.
+        """
+        prefix = "EXPLAIN QUERY PLAN" if self.engine.dialect.name == "sqlite" else "EXPLAIN"
+        compiled = statement.compile(dialect=self.engine.dialect, compile_kwargs={"literal_binds": True})
+        with self.engine.connect() as connection:
+            rows = connection.exec_driver_sql(f"{prefix} {compiled}").all()
+        return [" ".join(str(v) for v in row) for row in rows]
+
+    def log_query_plans(self):
+        """
+        Log the plans of the main list queries so a missing index shows up as a table scan at startup.
+        """
+        try:
+            from ibtrading.repo.query_plans import main_list_statements  # Imports the repos, which import this module
+            for name, statement in main_list_statements().items():
+                logger.info(f"Query plan for {name}: " + " | ".join(self.explain(statement)))
+        except Exception as e:
+            logger.warning(f"Error explaining queries: {e}")
 
 
 class Repo:
-    def __init__(self, db: DataSource):
+    def __init__(self, db: DataSource, async_db=None):
+        """
+        :param async_db: optional AsyncDataSource used by the *_async methods. Without it they run the
+            sync method in the threadpool, so the event loop is never blocked either way.
+        """
         self.db = db
+        self.async_db = async_db
         self.logger = loggerutil.get_logger(self.__class__.__name__)
         self.tz = Settings.TIMEZONE
 
-# Create global instance and session factory
-data_source = DataSource()
-SessionLocal = data_source.get_session
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, *args, **kwargs)
+
+
+_data_source: Optional[DataSource] = None
+_data_source_lock = threading.Lock()
+
+
+def get_data_source() -> DataSource:
+    """
+    The process-wide DataSource, created (and the schema checked) on first use.
+    """
+    global _data_source
+    if _data_source is None:
+        with _data_source_lock:
+            if _data_source is None:
+                _data_source = DataSource()
+    return _data_source
+
+
+def SessionLocal() -> Session:
+    """
+    Session factory over the process-wide DataSource.
+    """
+    return get_data_source().get_session()
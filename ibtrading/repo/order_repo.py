@@ -4,67 +4,193 @@
 -- Created on: 23/10/2024
 """
 import logging
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Optional, Tuple
 
 from ib_async import Contract
-from sqlalchemy import or_, and_, asc, desc, text
+from sqlalchemy import or_, and_, asc, desc, text, update, insert, select, func
+from sqlalchemy.exc import IntegrityError
 
 from ibtrading import mapper
+from ibtrading.mapper import order_record_mapper
 from ibtrading.domain import WebhookPayload, OrderStatus, TradeData, PortfolioData, OrderData, ContractData, \
     AccountValueData
 from ibtrading.model.account_value_record import AccountValueRecord
 from ibtrading.model.contract_record import ContractRecord
 from ibtrading.model.order_record import OrderRecord
+from ibtrading.model.pnl_checkpoint_record import PnlCheckpointRecord, ACCOUNT_TOTAL_CONTRACT_ID
 from ibtrading.model.portfolio_record import PortfolioRecord
+from ibtrading.model.trade_group_record import TradeGroupRecord
 from ibtrading.model.trade_record import TradeRecord
 from ibtrading.model.webhook_record import WebhookRecord
+from ibtrading.repo.contract_cache import ContractCache, contract_key
 from ibtrading.repo.datasource import DataSource, Repo
+from ibtrading.repo.sqlprofiler import get_sql_profiler
+from ibtrading.repo.trade_ledger import TradeLedger, LedgerTrade, is_set_boundary
 from ibtrading.service import tradepnl
-from ibtrading.utils import strutil
+from ibtrading.settings import Settings
+from ibtrading.utils import metricsutil, strutil
+from ibtrading.utils.dtutil import current_time
 
 logger = logging.getLogger(__name__)
 
+MAX_TRADE_SET_SIZE = 10000
+BULK_QUERY_CHUNK_SIZE = 500  # Keeps IN (...) lists under the sqlite bound parameter limit
+STREAM_BATCH_SIZE = 1000  # Rows fetched per round trip by the iter_* listings
+TRADE_UPDATE_EXCLUDED = ("contract", "order", "total_pnl", "total_commission", "market_action", "trade_id")
 
+
+def _chunks(items: list, size: int = BULK_QUERY_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _column_values(record, exclude=(), skip_none=False) -> dict:
+    """
+    Column values explicitly set on a (transient) record, as parameters for a bulk insert or update.
+    """
+    values = {}
+    for column in record.__table__.columns:
+        if column.key == "id" or column.key in exclude or column.key not in record.__dict__:
+            continue
+        value = getattr(record, column.key)
+        if skip_none and value is None:
+            continue
+        values[column.key] = value
+    return values
+
+
+def _orders_statement():
+    return (select(OrderRecord, ContractRecord, WebhookRecord)
+            .outerjoin(ContractRecord, ContractRecord.contract_id == OrderRecord.contract_id)
+            .outerjoin(WebhookRecord, WebhookRecord.ref_id == OrderRecord.ref_id)
+            .order_by(desc(OrderRecord.created_at)))
+
+
+def _trades_statement():
+    return (select(TradeRecord, OrderRecord, ContractRecord, WebhookRecord)
+            .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
+            .outerjoin(ContractRecord, ContractRecord.contract_id == OrderRecord.contract_id)
+            .outerjoin(WebhookRecord, WebhookRecord.ref_id == OrderRecord.ref_id)
+            .order_by(desc(TradeRecord.created_at)))
+
+
+def _portfolio_statement(open_only: bool):
+    stmt = select(PortfolioRecord, ContractRecord).join(ContractRecord,
+                                                         PortfolioRecord.contract_id == ContractRecord.contract_id)
+    if open_only:
+        stmt = stmt.filter(PortfolioRecord.position != 0)
+    return stmt.order_by(desc(PortfolioRecord.created_at))
+
+
+def _contracts_statement():
+    return select(ContractRecord).order_by(desc(ContractRecord.created_at))
+
+
+def _account_values_statement():
+    return select(AccountValueRecord).order_by(asc(AccountValueRecord.created_at))
+
+
+def _webhook_logs_statement():
+    return select(WebhookRecord).order_by(desc(WebhookRecord.dt))
+
+
+@metricsutil.instrument
 class OrderRepo(Repo):
-    def __init__(self, db: DataSource):
-        super().__init__(db)
+    def __init__(self, db: DataSource, async_db=None, contract_cache: ContractCache = None):
+        super().__init__(db, async_db=async_db)
+        self.trade_ledger = TradeLedger(loader=self._load_trade_set)
+        self.contract_cache = contract_cache if contract_cache is not None else ContractCache()
 
-    def save_webhook_payload(self, req: WebhookPayload) -> Optional[WebhookPayload]:
+    def save_webhook_payload(self, req: WebhookPayload) -> Tuple[Optional[WebhookPayload], bool]:
+        """
+        Insert a webhook log unless one with the same fingerprint exists (a retried delivery), in which case
+        req gets the id, ref_id and created_at of the existing log. Duplicates cost one indexed insert attempt
+        and no row locks. Returns (req, duplicate), or (None, False) on failure.
+        """
         with self.db.get_session() as sess:
             try:
-
-                result = sess.query(WebhookRecord).filter_by(ref_id=req.ref_id).with_for_update().first()
-                if not result:
-                    r = mapper.map2contract_record(req)
-                    sess.add(r)
-                    sess.commit()
-                    sess.refresh(r)
-                    req.id = r.id
-                    req.created_at = r.created_at
+                values = _column_values(mapper.map2contract_record(req), skip_none=True)
+                values.setdefault("created_at", current_time())
+                try:
+                    result = sess.execute(self.db.insert_ignore(WebhookRecord, ["fingerprint"]).values(**values))
+                    inserted = result.rowcount > 0
+                except IntegrityError:  # Dialects without INSERT ... ON CONFLICT
+                    sess.rollback()
+                    inserted = False
+                if inserted:
+                    req.id = result.inserted_primary_key[0]
+                    req.created_at = values["created_at"]
                 else:
-                    req.id = result.id
-                    req.created_at = result.created_at
-                return req
+                    existing = (sess.query(WebhookRecord.id, WebhookRecord.ref_id, WebhookRecord.created_at)
+                                .filter(WebhookRecord.fingerprint == values["fingerprint"]).first())
+                    req.id = existing.id
+                    req.ref_id = existing.ref_id
+                    req.created_at = existing.created_at
+                    logger.info(f"Duplicate webhook ignored: {values['fingerprint']}")
+                req.fingerprint = values["fingerprint"]
+                sess.commit()
+                return req, not inserted
             except Exception as e:
                 sess.rollback()
                 logger.exception(f"Error saving webhook log: {e}")
-                return None
+                return None, False
+
+    def save_webhook_payloads(self, reqs: List[WebhookPayload]) -> List[WebhookPayload]:
+        """
+        Batch variant of save_webhook_payload: one insert-or-ignore executemany and one indexed lookup of the
+        ids. Returns the payloads with id, ref_id and created_at set, or an empty list on failure.
+        """
+        if not reqs:
+            return []
+        with self.db.get_session() as sess:
+            try:
+                rows = {}
+                for req in reqs:
+                    values = _column_values(mapper.map2contract_record(req), skip_none=True)
+                    values.setdefault("created_at", current_time())
+                    req.fingerprint = values["fingerprint"]
+                    rows.setdefault(req.fingerprint, values)
+                existing = set()
+                for chunk in _chunks(list(rows)):
+                    existing.update(f for (f,) in sess.query(WebhookRecord.fingerprint)
+                                    .filter(WebhookRecord.fingerprint.in_(chunk)))
+                new_rows = [values for fingerprint, values in rows.items() if fingerprint not in existing]
+                if new_rows:
+                    sess.execute(self.db.insert_ignore(WebhookRecord, ["fingerprint"]), new_rows)
+                saved = {}
+                for chunk in _chunks(list(rows)):
+                    for row in (sess.query(WebhookRecord.id, WebhookRecord.ref_id, WebhookRecord.fingerprint,
+                                           WebhookRecord.created_at)
+                                .filter(WebhookRecord.fingerprint.in_(chunk))):
+                        saved[row.fingerprint] = row
+                for req in reqs:
+                    req.id = saved[req.fingerprint].id
+                    req.ref_id = saved[req.fingerprint].ref_id
+                    req.created_at = saved[req.fingerprint].created_at
+                sess.commit()
+                return reqs
+            except Exception as e:
+                sess.rollback()
+                logger.exception(f"Error saving webhook logs: {e}")
+                return []
 
     def _save_or_update_trade(self, sess, trade: TradeData) -> None:
-        print("Save trade request: ", trade)
+        logger.debug(f"Save trade request: {trade}")
         t = mapper.map2trade_record(trade)
-        print("Mapped trade request: ", t)
         if t.contract:
             self.__save_or_update_contract(sess, t.contract)
         if t.order:
             self.__save_or_update_order(t.order, sess)
-        self.__save_trade_record(sess, t)
+        record = self.__save_trade_record(sess, t)
+        if record is None:
+            return
+        sess.flush()  # Assigns the id and defaults of a new trade
 
-        _trade = sess.query(TradeRecord).filter_by(order_id=t.order_id).with_for_update().first()
-        print("Before commit tradeee: ", _trade)
-        if _trade is not None:
-            self.calculate_and_update_trade_pnl(sess, _trade)
+        market_action = t.order.market_action if t.order is not None and t.order.market_action else None
+        entry = self.trade_ledger.record(LedgerTrade.from_record(record, market_action=market_action))
+        self._calculate_and_update_trade_pnl(sess, trade_id=entry.id, market_action=entry.market_action,
+                                             contract_id=entry.contract_id, trade_time=entry.trade_time)
 
     def __save_or_update_order(self, order: OrderRecord, sess) -> None:
         result = sess.query(OrderRecord).filter(
@@ -86,15 +212,16 @@ class OrderRepo(Repo):
         o = mapper.map2order_record(order)
         self.__save_or_update_order(o, sess)
 
-    def __save_trade_record(self, sess, trade: TradeRecord) -> bool:
+    def __save_trade_record(self, sess, trade: TradeRecord) -> Optional[TradeRecord]:
         if trade:
             if trade.order_id <= 0 or trade.status != OrderStatus.Filled:
-                return True
+                return None
 
             result = sess.query(TradeRecord).filter_by(order_id=trade.order_id).first()
             if not result:
                 sess.add(trade)
                 logger.debug(f"Trade saved: {trade}")
+                return trade
             else:
                 for attr, value in trade.__dict__.items():
                     if attr in ["contract", "order", "total_pnl", "total_commission", "market_action", "trade_id"]:
@@ -102,7 +229,8 @@ class OrderRepo(Repo):
                     if not attr.startswith('_') and attr is not None:  # Exclude internal SQLAlchemy attributes
                         setattr(result, attr, value)
                 logger.debug(f"Trade updated: {trade}")
-        return True
+                return result
+        return None
 
     def calculate_and_update_trade_pnl_v1(self, trade: TradeData, sess) -> bool:
         return self._calculate_and_update_trade_pnl(sess, trade_id=trade.id, trade_time=trade.trade_time,
@@ -114,22 +242,289 @@ class OrderRepo(Repo):
 
     def _calculate_and_update_trade_pnl(self, sess, trade_id: int, market_action, contract_id,
                                         trade_time: datetime) -> bool:
-        results = (sess.query(TradeRecord, OrderRecord)
-                   .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
-                   .filter(TradeRecord.contract_id == contract_id,
-                           TradeRecord.trade_time <= trade_time).order_by(desc(TradeRecord.trade_time)).limit(
-            5).with_for_update().all())
-        trades = []
-        for t, o in results:
-            t.market_action = o.market_action
-            trades.append(t)
+        trades = self.trade_ledger.trades(contract_id, until=trade_time)
+        if not any(t.id == trade_id for t in trades):
+            # The trade precedes the ledger's current set (e.g. a late update to a set that has since been
+            # followed by a new entry), so read its set from the database.
+            trades = self._load_trade_set(contract_id, until=trade_time, sess=sess)
+        elif (market_action is None or not market_action.startswith("ENTRY")) \
+                and not self._ledger_is_current(sess, contract_id):
+            # An exit may close the set, so it is not priced from a ledger another process has written past
+            logger.warning(f"Trade ledger of contract {contract_id} is out of date with the database, reloading it.")
+            self.trade_ledger.invalidate(contract_id)
+            trades = self._load_trade_set(contract_id, until=trade_time, sess=sess)
+        previous = {t.id: (t.trade_id, t.total_pnl, t.total_commission) for t in trades}
         _trades = tradepnl.calculate_pnl_for_ref_trade(trade_id=trade_id, market_action=market_action, trades=trades)
         if len(_trades) == 0:
             return True
+        self._apply_pnl_checkpoint(sess, _trades, previous)
         for t in _trades:
             self._update_trade_pnl(sess, t)
+        self._save_trade_group(sess, _trades, previous)
         return True
 
+    def _ledger_is_current(self, sess, contract_id: int) -> bool:
+        """
+        Compare the ledger's copy of a contract's current set with one aggregate row over the contract's trades
+        from the start of the set: their count, newest id and the sum of their trade_ids. The ledger is per
+        process, so these differ once another process has saved or priced fills of the contract.
+        """
+        trades = self.trade_ledger.trades(contract_id)
+        if not trades or trades[0].trade_time is None:
+            return False
+        count, max_id, trade_ids = (sess.query(func.count(TradeRecord.id), func.max(TradeRecord.id),
+                                               func.sum(TradeRecord.trade_id))
+                                    .filter(TradeRecord.contract_id == contract_id,
+                                            TradeRecord.trade_time >= trades[0].trade_time).one())
+        trades = [t for t in trades if t.trade_time is not None]
+        return (count, max_id, trade_ids or 0) == (len(trades), max(t.id for t in trades),
+                                                   sum(t.trade_id or 0 for t in trades))
+
+    @staticmethod
+    def _trade_set_query(sess, contract_id: int):
+        return (sess.query(TradeRecord, OrderRecord.market_action)
+                .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
+                .filter(TradeRecord.contract_id == contract_id))
+
+    def _load_trade_set(self, contract_id: int, until: datetime = None, sess=None) -> List[LedgerTrade]:
+        """
+        Read the trade set that holds a contract's latest trade (at or before until), scanning back from the
+        newest trade to the previous set boundary.
+        """
+        own_session = sess is None
+        if own_session:
+            sess = self.db.get_session()
+        try:
+            query = self._trade_set_query(sess, contract_id)
+            if until is not None:
+                query = query.filter(TradeRecord.trade_time <= until)
+            query = query.order_by(desc(TradeRecord.trade_time), desc(TradeRecord.created_at)).yield_per(100)
+            trades = []
+            for t, market_action in query:
+                entry = LedgerTrade.from_record(t, market_action=market_action)
+                if trades and is_set_boundary(entry, trades[-1]):
+                    break
+                trades.append(entry)
+                if len(trades) >= MAX_TRADE_SET_SIZE:
+                    logger.warning(f"Trade set of contract {contract_id} exceeds {MAX_TRADE_SET_SIZE} trades.")
+                    break
+            trades.reverse()
+            return trades
+        finally:
+            if own_session:
+                sess.close()
+
+    def warm_trade_ledger(self, days: int = None) -> int:
+        """
+        Load the trade ledger for every contract traded within the last given days.
+        Other contracts are loaded on their first fill.
+        """
+        days = Settings.TRADE_LEDGER_WARM_DAYS if days is None else days
+        try:
+            with self.db.get_session() as sess:
+                since = datetime.now() - timedelta(days=days)
+                contract_ids = [c for (c,) in sess.query(TradeRecord.contract_id)
+                                .filter(TradeRecord.trade_time >= since).distinct() if c is not None]
+            return self.trade_ledger.warm(contract_ids)
+        except Exception as e:
+            logger.exception("Error warming trade ledger: %s", e)
+            return 0
+
+    def _apply_pnl_checkpoint(self, sess, trade_group: list, previous: dict) -> None:
+        """
+        Add a closed trade group to the running PnL totals of its contract and account, and stamp the account
+        running totals as of the group's close on its trades.
+        If the group had already been applied (its closing trade carried a trade_id), only the change in PnL
+        and commission is added. If the account has groups that closed after it (a repriced or back-filled
+        group), the change is also added to the totals stamped on their trades.
+        """
+        closing = trade_group[-1]
+        pnl = closing.total_pnl or 0.0
+        commission = closing.total_commission or 0.0
+        group_count = 1
+        prev_trade_id, prev_pnl, prev_commission = previous.get(closing.id, (None, None, None))
+        if prev_trade_id:
+            pnl -= prev_pnl or 0.0
+            commission -= prev_commission or 0.0
+            group_count = 0
+
+        checkpoint = None
+        latest = True
+        for contract_id in (closing.contract_id, ACCOUNT_TOTAL_CONTRACT_ID):
+            checkpoint = (sess.query(PnlCheckpointRecord)
+                          .filter_by(account_id=closing.account_id, contract_id=contract_id)
+                          .with_for_update().first())
+            if checkpoint is None:
+                checkpoint = PnlCheckpointRecord(account_id=closing.account_id, contract_id=contract_id,
+                                                 cumulative_pnl=0.0, cumulative_commission=0.0, group_count=0)
+                sess.add(checkpoint)
+                sess.flush()  # Sessions don't autoflush; later groups in this transaction must find it
+            checkpoint.cumulative_pnl = round((checkpoint.cumulative_pnl or 0.0) + pnl, 2)
+            checkpoint.cumulative_commission = round((checkpoint.cumulative_commission or 0.0) + commission, 2)
+            checkpoint.group_count = (checkpoint.group_count or 0) + group_count
+            latest = (checkpoint.last_trade_time is None or closing.trade_time is None
+                      or closing.trade_time >= checkpoint.last_trade_time)
+            if latest:
+                checkpoint.last_trade_id = closing.trade_id
+                checkpoint.last_trade_time = closing.trade_time
+
+        cumulative_pnl, cumulative_commission = checkpoint.cumulative_pnl, checkpoint.cumulative_commission
+        if not latest:
+            later = self._later_trade_groups(sess, closing, {closing.trade_id, prev_trade_id})
+            cumulative_pnl = round(cumulative_pnl - sum(g.total_pnl or 0.0 for g in later), 2)
+            cumulative_commission = round(cumulative_commission - sum(g.total_commission or 0.0 for g in later), 2)
+            if later and (pnl or commission):
+                self._restamp_trades(sess, [g.trade_id for g in later], pnl, commission)
+        for t in trade_group:
+            t.cumulative_pnl = cumulative_pnl
+            t.cumulative_commission = cumulative_commission
+
+    @staticmethod
+    def _later_trade_groups(sess, closing, trade_ids: set) -> list:
+        """
+        The (trade_id, total_pnl, total_commission) of the account's other trade groups that closed after closing.
+        Their trade_group rows hold the totals their checkpoints were last given.
+        """
+        return (sess.query(TradeGroupRecord.trade_id, TradeGroupRecord.total_pnl, TradeGroupRecord.total_commission)
+                .filter(TradeGroupRecord.account_id == closing.account_id,
+                        TradeGroupRecord.status == tradepnl.TRADE_GROUP_CLOSED,
+                        TradeGroupRecord.close_time > closing.trade_time,
+                        TradeGroupRecord.trade_id.notin_([t for t in trade_ids if t]))
+                .all())
+
+    @staticmethod
+    def _restamp_trades(sess, trade_ids: list, pnl: float, commission: float) -> None:
+        """
+        Add a change in PnL and commission to the account running totals stamped on the trades of trade groups.
+        """
+        for chunk in _chunks(trade_ids):
+            rows = (sess.query(TradeRecord.id, TradeRecord.cumulative_pnl, TradeRecord.cumulative_commission)
+                    .filter(TradeRecord.trade_id.in_(chunk), TradeRecord.cumulative_pnl.isnot(None)).all())
+            updates = [{"id": id, "cumulative_pnl": round(cumulative_pnl + pnl, 2),
+                        "cumulative_commission": round((cumulative_commission or 0.0) + commission, 2)}
+                       for id, cumulative_pnl, cumulative_commission in rows]
+            if updates:
+                sess.execute(update(TradeRecord), updates)
+
+    def _save_trade_group(self, sess, trade_group: list, previous: dict = None) -> None:
+        """
+        Write the trade_group row of a priced (closed) trade set, by trade_id. The row of an earlier pricing of
+        the set under another trade_id (see previous, as in _apply_pnl_checkpoint) is replaced. Open sets have
+        no row; TradeRepo.list_trade_groups derives them from the trades.
+        """
+        values = tradepnl.summarize_trade_group(trade_group)
+        if values["status"] != tradepnl.TRADE_GROUP_CLOSED:
+            return
+        trade_ids = {values["trade_id"]}
+        if previous:
+            trade_ids |= {previous[t.id][0] for t in trade_group if t.id in previous and previous[t.id][0]}
+        rows = sess.query(TradeGroupRecord).filter(TradeGroupRecord.trade_id.in_(trade_ids)).all()
+        rows.sort(key=lambda r: r.trade_id != values["trade_id"])  # Update the row already holding trade_id
+        group = rows[0] if rows else TradeGroupRecord()
+        for stale in rows[1:]:
+            sess.delete(stale)
+        for name, value in values.items():
+            setattr(group, name, value)
+        if not rows:
+            sess.add(group)
+        sess.flush()  # Sessions don't autoflush; later groups in this transaction must find it
+
+    def rebuild_pnl_checkpoints(self) -> bool:
+        """
+        Recompute all PnL checkpoints and the cumulative values stamped on trades from the persisted
+        trade groups. Run after back-filling or correcting trades.
+        """
+        sess = self.db.get_session()
+        try:
+            with sess.begin():
+                rows = (sess.query(TradeRecord.id, TradeRecord.trade_id, TradeRecord.account_id,
+                                   TradeRecord.contract_id, TradeRecord.total_pnl, TradeRecord.total_commission,
+                                   TradeRecord.trade_time)
+                        .filter(TradeRecord.trade_id > 0)
+                        .order_by(asc(TradeRecord.trade_time), asc(TradeRecord.created_at), asc(TradeRecord.id))
+                        .all())
+                groups = {}
+                for row in rows:
+                    groups.setdefault(row.trade_id, []).append(row)  # Insertion order follows the closing trade
+
+                totals = {}
+                trade_updates = []
+                for group in sorted(groups.values(), key=lambda g: (g[-1].trade_time, g[-1].id)):
+                    closing = group[-1]
+                    for contract_id in (closing.contract_id, ACCOUNT_TOTAL_CONTRACT_ID):
+                        total = totals.setdefault((closing.account_id, contract_id),
+                                                  {"cumulative_pnl": 0.0, "cumulative_commission": 0.0,
+                                                   "group_count": 0})
+                        total["cumulative_pnl"] = round(total["cumulative_pnl"] + (closing.total_pnl or 0.0), 2)
+                        total["cumulative_commission"] = round(
+                            total["cumulative_commission"] + (closing.total_commission or 0.0), 2)
+                        total["group_count"] += 1
+                        total["last_trade_id"] = closing.trade_id
+                        total["last_trade_time"] = closing.trade_time
+                    account_total = totals[(closing.account_id, ACCOUNT_TOTAL_CONTRACT_ID)]
+                    for row in group:
+                        trade_updates.append({"id": row.id,
+                                              "cumulative_pnl": account_total["cumulative_pnl"],
+                                              "cumulative_commission": account_total["cumulative_commission"]})
+
+                sess.query(PnlCheckpointRecord).delete()
+                sess.execute(text("UPDATE trade SET cumulative_pnl=NULL, cumulative_commission=NULL"))
+                if trade_updates:
+                    sess.execute(update(TradeRecord), trade_updates)
+                for (account_id, contract_id), total in totals.items():
+                    sess.add(PnlCheckpointRecord(account_id=account_id, contract_id=contract_id, **total))
+            logger.info(f"Rebuilt {len(totals)} PnL checkpoints from {len(groups)} trade groups.")
+            return True
+        except Exception as e:
+            sess.rollback()
+            logger.exception("Error rebuilding PnL checkpoints: %s", e)
+            return False
+
+    def backfill_pnl_checkpoints(self) -> bool:
+        """
+        Run rebuild_pnl_checkpoints if a priced trade has no stored cumulative PnL, e.g. on the first start after
+        upgrading a database priced before the checkpoints existed. Returns True if the rebuild ran and succeeded.
+        """
+        try:
+            with self.db.get_session() as sess:
+                missing = (sess.query(TradeRecord.id)
+                           .filter(TradeRecord.trade_id > 0, TradeRecord.cumulative_pnl.is_(None)).first())
+        except Exception as e:
+            logger.exception("Error checking PnL checkpoints: %s", e)
+            return False
+        if missing is None:
+            return False
+        logger.info("Found priced trades without cumulative PnL, rebuilding PnL checkpoints.")
+        return self.rebuild_pnl_checkpoints()
+
+    def rebuild_trade_groups(self) -> bool:
+        """
+        Recreate the trade_group table from the trades: a CLOSED row per trade_id. Back-fills databases created
+        before the table existed and drops the OPEN rows written by earlier versions.
+        """
+        sess = self.db.get_session()
+        try:
+            with sess.begin():
+                query = (sess.query(TradeRecord, OrderRecord.market_action)
+                         .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
+                         .filter(TradeRecord.trade_id > 0)
+                         .order_by(asc(TradeRecord.trade_time), asc(TradeRecord.created_at), asc(TradeRecord.id))
+                         .yield_per(1000))
+                groups = {}
+                for t, market_action in query:
+                    groups.setdefault(t.trade_id, []).append(LedgerTrade.from_record(t, market_action))
+
+                rows = [tradepnl.summarize_trade_group(group) for group in groups.values()]
+                sess.query(TradeGroupRecord).delete()
+                for chunk in _chunks(rows):
+                    sess.execute(insert(TradeGroupRecord), chunk)
+            logger.info(f"Rebuilt {len(rows)} trade groups.")
+            return True
+        except Exception as e:
+            sess.rollback()
+            logger.exception("Error rebuilding trade groups: %s", e)
+            return False
+
     def update_trades_pnl(self, trades: list[TradeRecord]) -> bool:
         if not trades:
             return True
@@ -148,8 +543,12 @@ class OrderRepo(Repo):
         if not trade:
             return True
         update_query = text(
-            "UPDATE trade SET trade_id=:trade_id, total_pnl=:total_pnl, total_commission=:total_commission WHERE id=:id")
+            "UPDATE trade SET trade_id=:trade_id, total_pnl=:total_pnl, total_commission=:total_commission, "
+            "cumulative_pnl=COALESCE(:cumulative_pnl, cumulative_pnl), "
+            "cumulative_commission=COALESCE(:cumulative_commission, cumulative_commission) WHERE id=:id")
         result = sess.execute(update_query, {'total_pnl': trade.total_pnl, 'total_commission': trade.total_commission,
+                                             'cumulative_pnl': trade.cumulative_pnl,
+                                             'cumulative_commission': trade.cumulative_commission,
                                              'trade_id': trade.trade_id, 'id': trade.id})
         if result.rowcount > 0:
             logger.debug(f"Trade updated: {trade}")
@@ -160,10 +559,16 @@ class OrderRepo(Repo):
 
     def __save_or_update_contract(self, sess, contract: ContractRecord) -> bool:
         if contract:
+            if contract.contract_id is not None and self.contract_cache.contains(contract.contract_id):
+                return True
             result = sess.query(ContractRecord).filter_by(contract_id=contract.contract_id).first()
             if not result:
                 sess.add(contract)
+                sess.flush()  # Assigns the id and defaults before the contract is cached
                 logger.debug(f"Contract saved: {contract}")
+                result = contract
+            # Write-through; callers invalidate the contract if the transaction rolls back
+            self.contract_cache.put(mapper.map2contract_data(result))
 
         return True
 
@@ -176,6 +581,8 @@ class OrderRepo(Repo):
             return True
         except Exception as e:
             sess.rollback()
+            self.trade_ledger.invalidate(trade.contract_id)
+            self.contract_cache.invalidate(trade.contract_id)
             logger.exception("Error saving trade to database: %s", e)
             return False
 
@@ -191,29 +598,177 @@ class OrderRepo(Repo):
             logger.exception("Error saving order to database: %s", e)
             return False
 
-    def save_trades(self, trades: List[TradeData]) -> bool:
+    def save_trades(self, trades: List[TradeData], bulk: bool = False) -> bool:
+        """
+        Save a batch of trades. By default each trade is saved and priced in its own transaction.
+        With bulk=True the whole batch is upserted in one transaction with a few set-based statements
+        per table and PnL is recomputed once per affected contract, e.g. when reconciling executions.
+        """
         sess = self.db.get_session()
         try:
-            for trade in trades:
-                with sess.begin():
-                    self._save_or_update_trade(sess, trade)
+            with get_sql_profiler().scope("OrderRepo.save_trades"):
+                if bulk:
+                    with sess.begin():
+                        self._bulk_save_trades(sess, trades)
+                else:
+                    for trade in trades:
+                        with sess.begin():
+                            self._save_or_update_trade(sess, trade)
             return True
         except Exception as e:
             sess.rollback()
+            self.trade_ledger.invalidate()
+            for contract_id in {t.contract_id for t in trades if t is not None}:
+                self.contract_cache.invalidate(contract_id)
             logger.exception("Error saving trades to database: %s", e)
             return False
 
+    def _bulk_save_trades(self, sess, trades: List[TradeData]) -> None:
+        records = [mapper.map2trade_record(t) for t in trades if t is not None]
+        self.__bulk_save_contracts(sess, [t.contract for t in records if t.contract])
+        self.__bulk_save_orders(sess, [t.order for t in records if t.order])
+        saved = self.__bulk_save_trade_records(sess, records)
+        logger.info(f"Bulk saved {len(saved)} trades of {len(records)}.")
+
+        earliest = {}
+        for t in saved:
+            if t.contract_id is not None and t.trade_time is not None:
+                if t.contract_id not in earliest or t.trade_time < earliest[t.contract_id]:
+                    earliest[t.contract_id] = t.trade_time
+        changed, previous = [], {}
+        for contract_id, since in earliest.items():
+            sets, prev = self._reprice_contract_trades(sess, contract_id, since)
+            changed.extend(sets)
+            previous.update(prev)
+            self.trade_ledger.invalidate(contract_id)
+
+        # Apply groups in closing order across contracts so account running totals follow trade time
+        trade_updates = []
+        for trade_set in sorted(changed, key=lambda g: (g[-1].trade_time, g[-1].id)):
+            self._apply_pnl_checkpoint(sess, trade_set, previous)
+            trade_updates.extend({"id": t.id, "trade_id": t.trade_id, "total_pnl": t.total_pnl,
+                                  "total_commission": t.total_commission, "cumulative_pnl": t.cumulative_pnl,
+                                  "cumulative_commission": t.cumulative_commission} for t in trade_set)
+        if trade_updates:
+            sess.execute(update(TradeRecord), trade_updates)
+        for trade_set in changed:
+            self._save_trade_group(sess, trade_set, previous)
+
+    def __bulk_save_contracts(self, sess, contracts: List[ContractRecord]) -> None:
+        unique = {}
+        for c in contracts:
+            if c.contract_id is not None:
+                unique.setdefault(c.contract_id, c)
+        existing = {k for k in unique if self.contract_cache.contains(k)}
+        for chunk in _chunks([k for k in unique if k not in existing]):
+            existing.update(c for (c,) in sess.query(ContractRecord.contract_id)
+                            .filter(ContractRecord.contract_id.in_(chunk)))
+        rows = [_column_values(c, skip_none=True) for k, c in unique.items() if k not in existing]
+        if rows:
+            sess.execute(self.db.insert_ignore(ContractRecord, ["contract_id"]), rows)
+
+    def __bulk_save_orders(self, sess, orders: List[OrderRecord]) -> None:
+        # Later reports of the same order overwrite earlier ones field by field, as in __save_or_update_order
+        unique = {}
+        for o in orders:
+            key = ("perm_id", o.perm_id) if o.perm_id and o.perm_id > 0 else ("order_id", o.order_id)
+            values = _column_values(o, skip_none=True)
+            unique.setdefault(key, {}).update(values)
+
+        perm_ids = [v for (k, v) in unique if k == "perm_id"]
+        order_ids = [v["order_id"] for v in unique.values() if v.get("order_id") and v["order_id"] > 0]
+        by_perm_id, by_order_id = {}, {}
+        for chunk in _chunks(perm_ids):
+            for id, perm_id in sess.query(OrderRecord.id, OrderRecord.perm_id).filter(OrderRecord.perm_id.in_(chunk)):
+                by_perm_id.setdefault(perm_id, id)
+        for chunk in _chunks(order_ids):
+            for id, order_id in (sess.query(OrderRecord.id, OrderRecord.order_id)
+                                 .filter(OrderRecord.order_id.in_(chunk))):
+                by_order_id.setdefault(order_id, id)
+
+        inserts, updates = [], []
+        for values in unique.values():
+            id = by_perm_id.get(values.get("perm_id")) or by_order_id.get(values.get("order_id"))
+            if id is None:
+                inserts.append(values)
+            else:
+                updates.append(dict(values, id=id))
+        if inserts:
+            sess.execute(insert(OrderRecord), inserts)
+        if updates:
+            sess.execute(update(OrderRecord), updates)
+
+    def __bulk_save_trade_records(self, sess, trades: List[TradeRecord]) -> List[TradeRecord]:
+        # Same rules as __save_trade_record: only filled trades with an order permId, keyed by order_id
+        unique = {}
+        for t in trades:
+            if not t.order_id or t.order_id <= 0 or t.status != OrderStatus.Filled:
+                continue
+            if t.order_id in unique:
+                first = unique[t.order_id]
+                for key, value in _column_values(t, exclude=TRADE_UPDATE_EXCLUDED).items():
+                    setattr(first, key, value)
+            else:
+                unique[t.order_id] = t
+
+        existing = {}
+        for chunk in _chunks(list(unique)):
+            for id, order_id in (sess.query(TradeRecord.id, TradeRecord.order_id)
+                                 .filter(TradeRecord.order_id.in_(chunk))):
+                existing.setdefault(order_id, id)
+
+        inserts, updates = [], []
+        for order_id, t in unique.items():
+            if order_id in existing:
+                updates.append(dict(_column_values(t, exclude=TRADE_UPDATE_EXCLUDED), id=existing[order_id]))
+            else:
+                inserts.append(_column_values(t, skip_none=True))
+        if inserts:
+            sess.execute(insert(TradeRecord), inserts)
+        if updates:
+            sess.execute(update(TradeRecord), updates)
+        return list(unique.values())
+
+    def _reprice_contract_trades(self, sess, contract_id: int, since: datetime):
+        """
+        Reprice every trade set of a contract from the set holding the trade at since onwards.
+        Returns the sets whose totals changed and the previous (trade_id, total_pnl, total_commission)
+        of every repriced trade.
+        """
+        head = self._load_trade_set(contract_id, until=since, sess=sess)
+        start = head[0].trade_time if head else since
+        query = (self._trade_set_query(sess, contract_id)
+                 .filter(TradeRecord.trade_time >= start)
+                 .order_by(asc(TradeRecord.trade_time), asc(TradeRecord.created_at)).yield_per(1000))
+        trades = [LedgerTrade.from_record(t, market_action=market_action) for t, market_action in query]
+        previous = {t.id: (t.trade_id, t.total_pnl, t.total_commission) for t in trades}
+
+        from ibtrading.service import tradepnl_batch  # numpy/pandas are only loaded for bulk saves
+
+        changed = []
+        for trade_set in tradepnl_batch.calculate_pnl_batch(trades):
+            if not trade_set:
+                continue
+            trade_ids = {previous[t.id][0] for t in trade_set}
+            if len(trade_ids) == 1 and None not in trade_ids:
+                trade_id = trade_ids.pop()
+                for t in trade_set:
+                    t.trade_id = trade_id  # Keep the group id of a set that already existed
+                if all(previous[t.id][1:] == (t.total_pnl, t.total_commission) for t in trade_set):
+                    continue
+            changed.append(trade_set)
+        return changed, previous
+
     def save_contact(self, contract: ContractData) -> bool:
         sess = self.db.get_session()
         try:
             with sess.begin():
-                result = sess.query(ContractRecord).filter_by(contract_id=contract.contract_id).first()
-                if not result:
-                    c = mapper.map2contract_record(contract)
-                    sess.add(c)
+                # mapper.map2contract_record is the webhook payload variant
+                self.__save_or_update_contract(sess, order_record_mapper.map2contract_record(contract))
             return True
         except Exception as e:
             sess.rollback()
+            self.contract_cache.invalidate(contract.contract_id)
             logger.exception("Error saving contract to database: %s", e)
             return False
 
@@ -235,6 +790,7 @@ class OrderRepo(Repo):
             return True
         except Exception as e:
             sess.rollback()
+            self.contract_cache.invalidate(p.contract_id)
             logger.exception("Error saving portfolio to database: %s", e)
             return False
 
@@ -260,26 +816,38 @@ class OrderRepo(Repo):
     def list_orders(self) -> List[OrderData]:
         with self.db.get_session() as sess:
             try:
-                query = (
-                    sess.query(OrderRecord, ContractRecord, WebhookRecord)
-                    .outerjoin(ContractRecord, ContractRecord.contract_id == OrderRecord.contract_id)
-                    .outerjoin(WebhookRecord, WebhookRecord.ref_id == OrderRecord.ref_id))
-                orders = query.order_by(desc(OrderRecord.created_at)).all()
-
+                orders = sess.execute(_orders_statement()).all()
                 return [mapper.map2order_data(order=o, contract=c, webhook_log=wl) for o, c, wl in orders]
             except Exception as e:
                 logger.exception("Error fetching open positions from database: %s", e)
                 return []
 
+    async def list_orders_async(self) -> List[OrderData]:
+        if self.async_db is None:
+            return await self.run_sync(self.list_orders)
+        async with self.async_db.get_session() as sess:
+            try:
+                orders = (await sess.execute(_orders_statement())).all()
+                return [mapper.map2order_data(order=o, contract=c, webhook_log=wl) for o, c, wl in orders]
+            except Exception as e:
+                logger.exception("Error fetching orders from database: %s", e)
+                return []
+
     def list_trades(self) -> List[TradeData]:
         with self.db.get_session() as sess:
             try:
-                query = (
-                    sess.query(TradeRecord, OrderRecord, ContractRecord, WebhookRecord)
-                    .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
-                    .outerjoin(ContractRecord, ContractRecord.contract_id == OrderRecord.contract_id)
-                    .outerjoin(WebhookRecord, WebhookRecord.ref_id == OrderRecord.ref_id))
-                orders = query.order_by(desc(TradeRecord.created_at)).all()
+                orders = sess.execute(_trades_statement()).all()
+                return [mapper.map2trade_data(trade=t, order=o, contract=c, webhook_log=wl) for t, o, c, wl in orders]
+            except Exception as e:
+                logger.exception("Error fetching trades from database: %s", e)
+                return []
+
+    async def list_trades_async(self) -> List[TradeData]:
+        if self.async_db is None:
+            return await self.run_sync(self.list_trades)
+        async with self.async_db.get_session() as sess:
+            try:
+                orders = (await sess.execute(_trades_statement())).all()
                 return [mapper.map2trade_data(trade=t, order=o, contract=c, webhook_log=wl) for t, o, c, wl in orders]
             except Exception as e:
                 logger.exception("Error fetching trades from database: %s", e)
@@ -306,32 +874,58 @@ class OrderRepo(Repo):
     def list_portfolio(self) -> List[PortfolioData]:
         sess = self.db.get_session()
         try:
-            portfolios = (sess.query(PortfolioRecord, ContractRecord)
-                          .join(ContractRecord,
-                                PortfolioRecord.contract_id == ContractRecord.contract_id)
-                          .filter(PortfolioRecord.position != 0)
-                          .order_by(desc(PortfolioRecord.created_at)).all())
+            portfolios = sess.execute(_portfolio_statement(open_only=True)).all()
             return [mapper.map2portfolio_data(p, contract=c) for p, c in portfolios]
         except Exception as e:
             logger.exception("Error fetching portfolio from database: %s", e)
             return []
 
+    async def list_portfolio_async(self) -> List[PortfolioData]:
+        if self.async_db is None:
+            return await self.run_sync(self.list_portfolio)
+        async with self.async_db.get_session() as sess:
+            try:
+                portfolios = (await sess.execute(_portfolio_statement(open_only=True))).all()
+                return [mapper.map2portfolio_data(p, contract=c) for p, c in portfolios]
+            except Exception as e:
+                logger.exception("Error fetching portfolio from database: %s", e)
+                return []
+
     def list_position(self) -> List[PortfolioData]:
         sess = self.db.get_session()
         try:
-            positions = (sess.query(PortfolioRecord, ContractRecord)
-                         .join(ContractRecord,
-                               PortfolioRecord.contract_id == ContractRecord.contract_id)
-                         .order_by(desc(PortfolioRecord.created_at)).all())
+            positions = sess.execute(_portfolio_statement(open_only=False)).all()
             return [mapper.map2portfolio_data(p, contract=c) for p, c in positions]
         except Exception as e:
             logger.exception("Error fetching portfolio from database: %s", e)
             return []
 
+    async def list_position_async(self) -> List[PortfolioData]:
+        if self.async_db is None:
+            return await self.run_sync(self.list_position)
+        async with self.async_db.get_session() as sess:
+            try:
+                positions = (await sess.execute(_portfolio_statement(open_only=False))).all()
+                return [mapper.map2portfolio_data(p, contract=c) for p, c in positions]
+            except Exception as e:
+                logger.exception("Error fetching portfolio from database: %s", e)
+                return []
+
     def list_contracts(self) -> List[ContractData]:
         with self.db.get_session() as sess:
             try:
-                contracts = sess.query(ContractRecord).order_by(desc(ContractRecord.created_at)).all()
+                contracts = sess.execute(_contracts_statement()).scalars().all()
+                return [mapper.map2contract_data(c) for c in contracts]
+            except Exception as e:
+                logger.exception("Error fetching contracts from database: %s", e)
+                return []
+
+    async def list_contracts_async(self) -> List[ContractData]:
+        if self.async_db is None:
+            return await self.run_sync(self.list_contracts)
+        async with self.async_db.get_session() as sess:
+            try:
+                contracts = (await sess.execute(_contracts_statement())).scalars().all()
                 return [mapper.map2contract_data(c) for c in contracts]
             except Exception as e:
                 logger.exception("Error fetching contracts from database: %s", e)
@@ -340,22 +934,77 @@ class OrderRepo(Repo):
     def list_account_summary(self) -> List[AccountValueData]:
         sess = self.db.get_session()
         try:
-            values = sess.query(AccountValueRecord).order_by(asc(AccountValueRecord.created_at)).all()
+            values = sess.execute(_account_values_statement()).scalars().all()
             return [mapper.map2account_value_data(v) for v in values]
         except Exception as e:
             logger.exception("Error fetching account values from database: %s", e)
             return []
 
+    async def list_account_summary_async(self) -> List[AccountValueData]:
+        if self.async_db is None:
+            return await self.run_sync(self.list_account_summary)
+        async with self.async_db.get_session() as sess:
+            try:
+                values = (await sess.execute(_account_values_statement())).scalars().all()
+                return [mapper.map2account_value_data(v) for v in values]
+            except Exception as e:
+                logger.exception("Error fetching account values from database: %s", e)
+                return []
+
     def list_webhook_logs(self) -> List[WebhookPayload]:
         sess = self.db.get_session()
         try:
-            logs = sess.query(WebhookRecord).order_by(desc(WebhookRecord.dt)).all()
+            logs = sess.execute(_webhook_logs_statement()).scalars().all()
             data = [mapper.map2webhook_payload(log) for log in logs]
             return data
         except Exception as e:
             logger.exception("Error fetching webhook logs from database: %s", e)
             return []
 
+    async def list_webhook_logs_async(self) -> List[WebhookPayload]:
+        if self.async_db is None:
+            return await self.run_sync(self.list_webhook_logs)
+        async with self.async_db.get_session() as sess:
+            try:
+                logs = (await sess.execute(_webhook_logs_statement())).scalars().all()
+                return [mapper.map2webhook_payload(log) for log in logs]
+            except Exception as e:
+                logger.exception("Error fetching webhook logs from database: %s", e)
+                return []
+
+    def iter_orders(self, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[OrderData]:
+        return self._iter_mapped(_orders_statement(),
+                                 lambda row: mapper.map2order_data(order=row[0], contract=row[1], webhook_log=row[2]),
+                                 "orders", batch_size=batch_size)
+
+    def iter_contracts(self, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[ContractData]:
+        return self._iter_mapped(_contracts_statement(), lambda row: mapper.map2contract_data(row[0]), "contracts",
+                                 batch_size=batch_size)
+
+    def iter_account_values(self, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[AccountValueData]:
+        return self._iter_mapped(_account_values_statement(), lambda row: mapper.map2account_value_data(row[0]),
+                                 "account values", batch_size=batch_size)
+
+    def iter_webhook_logs(self, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[WebhookPayload]:
+        return self._iter_mapped(_webhook_logs_statement(), lambda row: mapper.map2webhook_payload(row[0]),
+                                 "webhook logs", batch_size=batch_size)
+
+    def _iter_mapped(self, statement, map_row: Callable, what: str, batch_size: int) -> Iterator:
+        """
+        Streaming counterpart of the list_* methods: rows are fetched batch_size at a time through a server side
+        cursor and mapped one by one, so memory stays bounded by one batch. The session stays open until the
+        iterator is exhausted or closed.
+        """
+        with self.db.get_session() as sess:
+            try:
+                result = sess.execute(statement.execution_options(yield_per=batch_size))
+                for row in result:
+                    yield map_row(row)
+            except Exception as e:
+                # The response is already streaming, so a truncated result must not look complete
+                logger.exception("Error streaming %s from database: %s", what, e)
+                raise
+
     def get_open_positions(self, symbol, sec_type, exchange, currency, right=None, contract_id: int = None) -> List[
         PortfolioData]:
         with self.db.get_session() as sess:
@@ -402,6 +1051,15 @@ class OrderRepo(Repo):
                 return None
 
     def get_contract(self, contract: Contract) -> Optional[ContractData]:
+        key = None
+        if contract.conId > 0:
+            cached = self.contract_cache.get(contract.conId)
+        else:
+            key = contract_key(contract.symbol, contract.secType, contract.exchange, contract.currency,
+                               contract.lastTradeDateOrContractMonth, contract.right)
+            cached = self.contract_cache.find(key)
+        if cached is not None:
+            return cached
         with self.db.get_session() as sess:
             try:
                 query = sess.query(ContractRecord)
@@ -417,23 +1075,57 @@ class OrderRepo(Repo):
                         query = query.filter_by(right=contract.right)
                 result = query.first()
                 if result:
-                    return mapper.map2contract_data(result)
+                    data = mapper.map2contract_data(result)
+                    self.contract_cache.put(data, key=key)
+                    return data
             except Exception as e:
                 logger.exception("Error fetching contract from database: %s", e)
                 return None
 
     def get_contract_by_id(self, contract_id: int) -> Optional[ContractData]:
+        cached = self.contract_cache.get(contract_id)
+        if cached is not None:
+            return cached
         with self.db.get_session() as sess:
             try:
                 query = sess.query(ContractRecord)
                 query = query.filter_by(contract_id=contract_id)
                 result = query.first()
                 if result:
-                    return mapper.map2contract_data(result)
+                    data = mapper.map2contract_data(result)
+                    self.contract_cache.put(data)
+                    return data
+            except Exception as e:
+                logger.exception("Error fetching contract from database: %s", e)
+                return None
+
+    def get_contract_by_vt_symbol(self, vt_symbol: str) -> Optional[ContractData]:
+        cached = self.contract_cache.get_by_vt_symbol(vt_symbol)
+        if cached is not None:
+            return cached
+        with self.db.get_session() as sess:
+            try:
+                result = sess.query(ContractRecord).filter_by(vt_symbol=vt_symbol).first()
+                if result:
+                    data = mapper.map2contract_data(result)
+                    self.contract_cache.put(data)
+                    return data
             except Exception as e:
                 logger.exception("Error fetching contract from database: %s", e)
                 return None
 
+    def warm_contract_cache(self) -> int:
+        """
+        Load every contract into the contract cache; the table holds one row per traded instrument.
+        """
+        try:
+            with self.db.get_session() as sess:
+                contracts = [mapper.map2contract_data(c) for c in sess.execute(_contracts_statement()).scalars()]
+            return self.contract_cache.warm(contracts)
+        except Exception as e:
+            logger.exception("Error warming contract cache: %s", e)
+            return 0
+
     def get_last_webhook(self, req: WebhookPayload):
         with (self.db.get_session() as sess):
             try:
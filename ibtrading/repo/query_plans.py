@@ -0,0 +1,34 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from datetime import datetime
+
+from ibtrading.domain import TradeDataFilter
+from ibtrading.model import TradeRecord, WebhookRecord, OrderRecord
+from ibtrading.repo import order_repo, trade_repo
+from sqlalchemy import select, desc
+
+
+def main_list_statements() -> dict:
+    """
+    The hot list/lookup queries of the repos, by name, with representative parameters.
+    Used to log query plans at startup (DataSource.log_query_plans) and by manage.py explain.
+    """
+    now = datetime.now()
+    return {
+        "list_trades_v2": trade_repo._trade_columns_statement(TradeDataFilter(from_dt=now)),
+        "list_orders": order_repo._orders_statement(),
+        "list_trades": order_repo._trades_statement(),
+        "list_portfolio": order_repo._portfolio_statement(open_only=True),
+        "list_webhook_logs": order_repo._webhook_logs_statement(),
+        "load_trade_set": (select(TradeRecord, OrderRecord.market_action)
+                           .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
+                           .filter(TradeRecord.contract_id == 0, TradeRecord.trade_time <= now)
+                           .order_by(desc(TradeRecord.trade_time), desc(TradeRecord.created_at))),
+        "open_trade_groups": trade_repo._open_trades_statement({0: now, 1: None}),
+        "get_last_webhook": (select(WebhookRecord)
+                             .filter(WebhookRecord.created_at < now, WebhookRecord.vt_symbol == "")
+                             .order_by(desc(WebhookRecord.created_at)).limit(1)),
+    }
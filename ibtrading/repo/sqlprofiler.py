@@ -0,0 +1,259 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import contextlib
+import contextvars
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Union
+
+from sqlalchemy import event
+
+from ibtrading.settings import Settings
+from ibtrading.utils import loggerutil
+
+logger = loggerutil.get_logger(__name__)
+slow_query_logger = loggerutil.get_logger("ibtrading.sql.slow")
+
+OTHER_STATEMENTS = "<other>"  # Bucket for statements beyond max_statements
+SLOW_QUERY_HISTORY = 100
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")  # (?, ?, ?) of an expanded IN or a VALUES row
+_VALUES_ROWS = re.compile(r"(\(\?\.\.\.\))(?:\s*,\s*\(\?\.\.\.\))+")
+_NAMED_PARAM = re.compile(r"(?<!:):\w+|%\(\w+\)s|\$\d+")
+
+
+def normalize(statement: str) -> str:
+    """
+    Statement text with literals and bound parameters replaced by ? and parameter lists collapsed to (?...),
+    so executions differing only in values (or in the length of an IN list) aggregate together.
+    """
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _STRING_LITERAL.sub("?", statement)
+    statement = _NAMED_PARAM.sub("?", statement)
+    statement = _NUMBER_LITERAL.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("(?...)", statement)
+    return _VALUES_ROWS.sub(r"\1", statement)
+
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    """
+    Types of the bound parameters, e.g. (int, str) or [50 x (int, str)]; never their values.
+    """
+    if executemany:
+        rows = list(parameters or [])
+        return f"[{len(rows)} x {parameter_shape(rows[0]) if rows else '()'}]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _is_select(statement: str) -> bool:
+    return statement[:6].upper() == "SELECT" or statement[:4].upper() == "WITH"
+
+
+class StatementStats:
+    __slots__ = ("statement", "count", "total_seconds", "max_seconds", "rows", "n_plus_one", "last_scope")
+
+    def __init__(self, statement: str):
+        self.statement = statement
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.n_plus_one = 0  # Scopes in which the statement ran at least the N+1 threshold times
+        self.last_scope: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {"statement": self.statement, "count": self.count,
+                "total_ms": round(self.total_seconds * 1000, 3),
+                "mean_ms": round(self.total_seconds * 1000 / self.count, 3) if self.count else 0.0,
+                "max_ms": round(self.max_seconds * 1000, 3), "rows": self.rows, "n_plus_one": self.n_plus_one,
+                "last_scope": self.last_scope}
+
+
+class ProfileScope:
+    """
+    Statement counts of one unit of work (an HTTP request, a batch save), for N+1 detection.
+    Shared with the threadpool: run_in_threadpool copies the context, so worker threads see the same scope.
+    """
+
+    def __init__(self, name: Union[str, Callable[[], str]]):
+        self._name = name
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self._name() if callable(self._name) else self._name
+
+    def count(self, statement: str) -> int:
+        with self._lock:
+            n = self.counts[statement] = self.counts.get(statement, 0) + 1
+            return n
+
+
+_current_scope: contextvars.ContextVar[Optional[ProfileScope]] = contextvars.ContextVar("sql_profile_scope",
+                                                                                        default=None)
+
+
+class SqlProfiler:
+    """
+    Opt-in SQL profiler hooked into engine cursor events (SQL_PROFILER_ENABLED).
+    Aggregates execution time per normalized statement, flags a SELECT run n_plus_one_threshold times within one
+    profile scope as an N+1 pattern, and logs statements slower than slow_query_ms with their parameter shapes to
+    the ibtrading.sql.slow logger.
+    """
+
+    def __init__(self, slow_query_ms: float = None, n_plus_one_threshold: int = None, max_statements: int = None):
+        self.slow_query_seconds = (Settings.SQL_SLOW_QUERY_MS if slow_query_ms is None else slow_query_ms) / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold or Settings.SQL_N_PLUS_ONE_THRESHOLD
+        self.max_statements = max_statements or Settings.SQL_PROFILER_MAX_STATEMENTS
+        self.engines = []
+        self._slow_queries = deque(maxlen=SLOW_QUERY_HISTORY)
+        self._stats: Dict[str, StatementStats] = {}
+        self._normalized: Dict[str, str] = {}  # Statement text -> normalized, the regexes are the costly part
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def attach(self, engine):
+        """
+        Listen to the cursor events of a sync Engine (for an AsyncEngine pass engine.sync_engine).
+        """
+        if engine in self.engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+        self.engines.append(engine)
+        logger.info(f"SQL profiler attached to {engine.url.render_as_string(hide_password=True)}")
+
+    def detach(self):
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+            event.remove(engine, "handle_error", self._handle_error)
+        self.engines = []
+
+    @contextlib.contextmanager
+    def scope(self, name: Union[str, Callable[[], str]]):
+        """
+        Profile scope for N+1 detection. Nested scopes join the outer one.
+        name may be a callable, for names only known later (the route of a request is matched inside the scope).
+        """
+        if not self.enabled or _current_scope.get() is not None:
+            yield
+            return
+        token = _current_scope.set(ProfileScope(name))
+        try:
+            yield
+        finally:
+            _current_scope.reset(token)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sql_profiler_start", []).append(time.perf_counter())
+
+    def _handle_error(self, context):
+        # A failed statement gets no after_cursor_execute; drop its start time so pooled connections don't
+        # accumulate them
+        conn = context.connection
+        if conn is not None and context.execution_context is not None:
+            starts = conn.info.get("sql_profiler_start")
+            if starts:
+                starts.pop()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("sql_profiler_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        self.record(statement, elapsed, rowcount=cursor.rowcount, parameters=parameters, executemany=executemany)
+
+    def record(self, statement: str, elapsed: float, rowcount: int = -1, parameters=None, executemany: bool = False):
+        normalized = self._normalized.get(statement)
+        if normalized is None:
+            normalized = normalize(statement)
+            if len(self._normalized) < self.max_statements * 4:
+                self._normalized[statement] = normalized
+        scope = _current_scope.get()
+        scope_name = scope.name if scope is not None else None
+        n_plus_one = False
+        if scope is not None and _is_select(normalized):
+            n_plus_one = scope.count(normalized) == self.n_plus_one_threshold
+
+        with self._lock:
+            stats = self._stats.get(normalized)
+            if stats is None:
+                key = normalized if len(self._stats) < self.max_statements else OTHER_STATEMENTS
+                stats = self._stats.get(key)
+                if stats is None:
+                    stats = self._stats[key] = StatementStats(key)
+            stats.count += 1
+            stats.total_seconds += elapsed
+            stats.max_seconds = max(stats.max_seconds, elapsed)
+            if rowcount is not None and rowcount > 0:
+                stats.rows += rowcount
+            if scope_name is not None:
+                stats.last_scope = scope_name
+            if n_plus_one:
+                stats.n_plus_one += 1
+
+        if n_plus_one:
+            logger.warning(f"Possible N+1 in {scope_name}: ran {self.n_plus_one_threshold} times: {normalized}")
+        if elapsed >= self.slow_query_seconds:
+            shape = parameter_shape(parameters, executemany)
+            with self._lock:
+                self._slow_queries.append({"statement": normalized, "duration_ms": round(elapsed * 1000, 3),
+                                           "parameters": shape, "scope": scope_name, "at": datetime.now()})
+            slow_query_logger.warning(f"Slow query ({elapsed * 1000:.1f} ms) {normalized} parameters={shape}"
+                                      + (f" scope={scope_name}" if scope_name is not None else ""))
+
+    def statements(self, sort: str = "total_ms", limit: int = 50) -> List[dict]:
+        """
+        Aggregated statements, largest sort key (total_ms, mean_ms, max_ms, count, n_plus_one) first.
+        """
+        with self._lock:
+            rows = [s.to_dict() for s in self._stats.values()]
+        rows.sort(key=lambda r: r.get(sort) or 0, reverse=True)
+        return rows[:limit]
+
+    def slow_queries(self) -> List[dict]:
+        """
+        The last SLOW_QUERY_HISTORY slow queries, newest first.
+        """
+        with self._lock:
+            return list(reversed(self._slow_queries))
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow_queries.clear()
+
+
+_sql_profiler: Optional[SqlProfiler] = None
+_sql_profiler_lock = threading.Lock()
+
+
+def get_sql_profiler() -> SqlProfiler:
+    """
+    The process-wide SqlProfiler. It does nothing until attached to an engine.
+    """
+    global _sql_profiler
+    if _sql_profiler is None:
+        with _sql_profiler_lock:
+            if _sql_profiler is None:
+                _sql_profiler = SqlProfiler()
+    return _sql_profiler
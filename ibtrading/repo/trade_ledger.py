@@ -0,0 +1,155 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from ibtrading.utils import loggerutil
+
+logger = loggerutil.get_logger(__name__)
+
+
+class LedgerTrade:
+    """
+    The fields of a trade needed to price its trade set, detached from any database session.
+    """
+    __slots__ = ("id", "order_id", "account_id", "contract_id", "market_action", "quantity", "avg_price",
+                 "commission", "trade_time", "created_at", "trade_id", "total_pnl", "total_commission",
+                 "cumulative_pnl", "cumulative_commission")
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            setattr(self, name, kwargs.get(name))
+
+    @classmethod
+    def from_record(cls, trade, market_action: str = None) -> 'LedgerTrade':
+        return cls(id=trade.id, order_id=trade.order_id, account_id=trade.account_id, contract_id=trade.contract_id,
+                   market_action=market_action or trade.market_action, quantity=trade.quantity,
+                   avg_price=trade.avg_price, commission=trade.commission, trade_time=trade.trade_time,
+                   created_at=trade.created_at, trade_id=trade.trade_id, total_pnl=trade.total_pnl,
+                   total_commission=trade.total_commission, cumulative_pnl=trade.cumulative_pnl,
+                   cumulative_commission=trade.cumulative_commission)
+
+    def sort_key(self):
+        return self.trade_time or datetime.min, self.created_at or datetime.min
+
+    def __repr__(self):
+        return f"LedgerTrade(id={self.id}, order_id={self.order_id}, contract_id={self.contract_id}, market_action={self.market_action}, quantity={self.quantity}, avg_price={self.avg_price}, trade_time={self.trade_time}, trade_id={self.trade_id}, total_pnl={self.total_pnl})"
+
+
+def is_set_boundary(previous: LedgerTrade, current: LedgerTrade) -> bool:
+    """
+    True if current starts a new trade set after previous (see tradepnl.calculate_pnl).
+    """
+    if current.market_action is None or previous.market_action is None:
+        return True
+    return current.market_action.startswith("ENTRY") and previous.market_action.startswith("EXIT")
+
+
+def current_trade_set(trades: list) -> list:
+    """
+    The trailing trade set of a contract's trades in (trade_time, created_at) order.
+    """
+    current = []
+    for t in reversed(trades):
+        if current and is_set_boundary(t, current[-1]):
+            break
+        current.append(t)
+    current.reverse()
+    return current
+
+
+class TradeLedger:
+    """
+    Per-contract, in-memory copy of the current trade set: the trades since the last set boundary,
+    in (trade_time, created_at) order. Contracts are loaded from the database on first use via loader
+    and then kept current by record() on every saved fill, so pricing an entry needs no reads. The ledger
+    only sees this process's fills: before an exit prices it, OrderRepo checks it against an aggregate of the
+    set's rows and reloads the contract when another process has written to it.
+    """
+
+    def __init__(self, loader: Callable[[int], List[LedgerTrade]]):
+        self._loader = loader
+        self._contracts: Dict[int, List[LedgerTrade]] = {}
+        self._lock = threading.RLock()
+
+    def _load(self, contract_id: int) -> List[LedgerTrade]:
+        with self._lock:
+            trades = self._contracts.get(contract_id)
+        if trades is not None:
+            return trades
+        loaded = self._loader(contract_id)
+        with self._lock:
+            return self._contracts.setdefault(contract_id, loaded)
+
+    def warm(self, contract_ids) -> int:
+        count = 0
+        for contract_id in contract_ids:
+            self._load(contract_id)
+            count += 1
+        logger.info(f"Trade ledger warmed for {count} contracts.")
+        return count
+
+    def trades(self, contract_id: int, until: datetime = None) -> List[LedgerTrade]:
+        """
+        The contract's current trade set, optionally limited to trades at or before until.
+        """
+        trades = self._load(contract_id)
+        with self._lock:
+            if until is None:
+                return list(trades)
+            return [t for t in trades if t.trade_time is None or t.trade_time <= until]
+
+    def find(self, contract_id: int, trade_id: int) -> Optional[LedgerTrade]:
+        with self._lock:
+            for t in self._contracts.get(contract_id, []):
+                if t.id == trade_id:
+                    return t
+        return None
+
+    def record(self, trade: LedgerTrade) -> LedgerTrade:
+        """
+        Insert or update a fill in its contract's ledger and drop trades that precede the last set boundary.
+        Pricing fields (trade_id, totals) of an existing entry are kept.
+        """
+        trades = self._load(trade.contract_id)
+        with self._lock:
+            existing = next((t for t in trades if t.id == trade.id), None)
+            if existing is not None:
+                for name in ("order_id", "account_id", "quantity", "avg_price", "commission", "trade_time",
+                             "created_at"):
+                    value = getattr(trade, name)
+                    if value is not None:
+                        setattr(existing, name, value)
+                if trade.market_action is not None:
+                    existing.market_action = trade.market_action
+                trade = existing
+            else:
+                trades.append(trade)
+            trades.sort(key=LedgerTrade.sort_key)
+
+            start = 0
+            for i in range(len(trades) - 1, 0, -1):
+                if is_set_boundary(trades[i - 1], trades[i]):
+                    start = i
+                    break
+            # A late update to an earlier set is returned but not kept; that set is priced from the database.
+            del trades[:start]
+            return trade
+
+    def invalidate(self, contract_id: int = None):
+        """
+        Forget a contract (or every contract) so it is reloaded from the database on next use.
+        """
+        with self._lock:
+            if contract_id is None:
+                self._contracts.clear()
+            else:
+                self._contracts.pop(contract_id, None)
+
+    def size(self) -> int:
+        with self._lock:
+            return sum(len(t) for t in self._contracts.values())
@@ -4,22 +4,211 @@
 -- Created on: 23/10/2024
 """
 import logging
-from typing import List
+from typing import Callable, Iterator, List, Optional, Tuple
 
-from sqlalchemy import asc
+from sqlalchemy import asc, desc, or_, and_, select, func, case
 from sqlalchemy.sql.operators import like_op
 
 from ibtrading import domain, mapper
-from ibtrading.domain import TradeDataFilter
-from ibtrading.model import TradeRecord, OrderRecord, ContractRecord, WebhookRecord
+from ibtrading.domain import TradeDataFilter, Pagination
+from ibtrading.mapper.trade_columns_mapper import TRADE_COLUMNS, ORDER_COLUMNS, CONTRACT_COLUMNS, REF_COLUMNS
+from ibtrading.model import TradeRecord, OrderRecord, ContractRecord, WebhookRecord, TradeGroupRecord
 from ibtrading.repo.datasource import DataSource, Repo
+from ibtrading.repo.trade_ledger import LedgerTrade, current_trade_set
+from ibtrading.service import tradepnl
+from ibtrading.utils import cursorutil, metricsutil
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_LIMIT = 100
+EXPORT_BATCH_SIZE = 5000
+OPEN_GROUP_CONTRACT_CHUNK = 200
 
+
+class _Keyset:
+    """
+    Keyset pagination of select() statements on a (datetime, id) pair of columns, whose positions are the
+    cursors of cursorutil.
+    """
+
+    def __init__(self, time_column, id_column):
+        self.time_column = time_column
+        self.id_column = id_column
+
+    def after(self, key):
+        time, id = key
+        return or_(self.time_column > time, and_(self.time_column == time, self.id_column > id))
+
+    def before(self, key):
+        time, id = key
+        return or_(self.time_column < time, and_(self.time_column == time, self.id_column < id))
+
+    def not_after(self, key):
+        time, id = key
+        return or_(self.time_column < time, and_(self.time_column == time, self.id_column <= id))
+
+    def not_before(self, key):
+        time, id = key
+        return or_(self.time_column > time, and_(self.time_column == time, self.id_column >= id))
+
+    def order(self, descending: bool = False) -> tuple:
+        direction = desc if descending else asc
+        return direction(self.time_column), direction(self.id_column)
+
+    def key(self, record) -> tuple:
+        return getattr(record, self.time_column.key), getattr(record, self.id_column.key)
+
+    @staticmethod
+    def start(pagination: Pagination) -> Tuple[Optional[tuple], bool]:
+        """
+        The (cursor position, backward) of a requested page. Paging backward when only prev_cursor is set.
+        :raises ValueError: if the cursor is malformed.
+        """
+        req = pagination or Pagination()
+        backward = bool(req.prev_cursor) and not req.next_cursor
+        return cursorutil.decode_cursor(req.prev_cursor if backward else req.next_cursor), backward
+
+    def rows(self, sess, statement, cursor: Optional[tuple], backward: bool, limit: int) -> list:
+        """
+        Up to limit + 1 rows of statement beyond cursor, in page order (descending when paging backward).
+        """
+        if backward:
+            statement = statement.where(self.before(cursor)).order_by(*self.order(descending=True))
+        else:
+            statement = (statement.where(self.after(cursor)) if cursor else statement).order_by(*self.order())
+        return sess.execute(statement.limit(limit + 1)).all()
+
+    @staticmethod
+    def page(rows: list, key: Callable, cursor: Optional[tuple], backward: bool, has_more: bool,
+             limit: int) -> Pagination:
+        """
+        Put the rows of a page (in page order, without the extra row) in ascending order and return the
+        pagination cursors of the neighbouring pages, taking the position of a row from key(row).
+        """
+        if backward:
+            rows.reverse()
+            has_prev, has_next = has_more, True
+        else:
+            has_prev, has_next = cursor is not None, has_more
+        pagination = Pagination(limit=limit)
+        if rows:
+            if has_prev:
+                pagination.prev_cursor = cursorutil.encode_cursor(*key(rows[0]))
+            if has_next:
+                pagination.next_cursor = cursorutil.encode_cursor(*key(rows[-1]))
+        return pagination
+
+
+TRADE_KEYSET = _Keyset(TradeRecord.created_at, TradeRecord.id)
+TRADE_GROUP_KEYSET = _Keyset(TradeGroupRecord.open_time, TradeGroupRecord.id)
+
+
+def _page_limit(filter) -> int:
+    req = filter.pagination or Pagination()
+    return req.limit if req.limit and req.limit > 0 else DEFAULT_PAGE_LIMIT
+
+
+def _trade_filters(filter: TradeDataFilter) -> list:
+    criteria = []
+    if filter.query:
+        criteria.append(like_op(ContractRecord.vt_symbol, filter.query))
+    if filter.from_dt is not None:
+        criteria.append(TradeRecord.created_at >= filter.from_dt)
+    if filter.to_dt is not None:
+        criteria.append(TradeRecord.created_at <= filter.to_dt)
+    if filter.symbols:
+        criteria.append(ContractRecord.symbol.in_(filter.symbols))
+    if filter.security_types:
+        criteria.append(ContractRecord.sec_type.in_(filter.security_types))
+    return criteria
+
+
+def _trade_columns_statement(filter: TradeDataFilter):
+    """
+    select() of the trade/order/contract/webhook log join for the trade listings, ordered by created_at: only the
+    columns the trade mappers read (see trade_columns_mapper), returned as plain rows with no ORM objects to
+    hydrate or track in the identity map.
+    """
+    columns = [getattr(TradeRecord, name).label(name) for name in TRADE_COLUMNS]
+    columns += [getattr(OrderRecord, name).label(f"order_{name}") for name in ORDER_COLUMNS]
+    columns += [getattr(ContractRecord, name).label(f"contract_{name}") for name in CONTRACT_COLUMNS]
+    columns += [getattr(WebhookRecord, name).label(f"ref_{name}") for name in REF_COLUMNS]
+    return (select(*columns)
+            .select_from(TradeRecord)
+            .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
+            .outerjoin(ContractRecord, ContractRecord.contract_id == OrderRecord.contract_id)
+            .outerjoin(WebhookRecord, WebhookRecord.ref_id == OrderRecord.ref_id)
+            .filter(*_trade_filters(filter))
+            .order_by(asc(TradeRecord.created_at)))
+
+
+def _export_columns() -> list:
+    """
+    Flat export columns: every trade column, then the order and contract columns prefixed with order_/contract_.
+    """
+    columns = [c.label(c.name) for c in TradeRecord.__table__.columns]
+    columns += [c.label(f"order_{c.name}") for c in OrderRecord.__table__.columns if c.name != "id"]
+    columns += [c.label(f"contract_{c.name}") for c in ContractRecord.__table__.columns if c.name != "id"]
+    return columns
+
+
+def trade_export_columns() -> List[Tuple[str, object]]:
+    """
+    (name, SQLAlchemy type) of each column of TradeRepo.iter_trade_rows rows.
+    """
+    return [(c.name, c.type) for c in _export_columns()]
+
+
+def _export_statement(filter: TradeDataFilter):
+    return (select(*_export_columns())
+            .select_from(TradeRecord)
+            .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
+            .outerjoin(ContractRecord, ContractRecord.contract_id == OrderRecord.contract_id)
+            .filter(*_trade_filters(filter))
+            .order_by(asc(TradeRecord.created_at), asc(TradeRecord.id)))
+
+
+def _trade_group_filters(filter: domain.TradeGroupFilter) -> list:
+    """
+    Criteria of filter on trade_group joined with contract, except status.
+    :raises ValueError: if filter.status is not a trade group status.
+    """
+    if filter.status and filter.status not in (tradepnl.TRADE_GROUP_OPEN, tradepnl.TRADE_GROUP_CLOSED):
+        raise ValueError(f"Invalid trade group status: {filter.status}")
+    criteria = []
+    if filter.accounts:
+        criteria.append(TradeGroupRecord.account_id.in_(filter.accounts))
+    if filter.from_dt is not None:
+        criteria.append(TradeGroupRecord.open_time >= filter.from_dt)
+    if filter.to_dt is not None:
+        criteria.append(TradeGroupRecord.open_time <= filter.to_dt)
+    if filter.symbols:
+        criteria.append(ContractRecord.symbol.in_(filter.symbols))
+    if filter.security_types:
+        criteria.append(ContractRecord.sec_type.in_(filter.security_types))
+    return criteria
+
+
+def _open_trades_statement(last_close: dict):
+    """
+    The unpriced trades of each contract of last_close after its last closed group (last_close[contract_id], None
+    if it has none), read by index range on (contract_id, trade_time) rather than over every unpriced trade.
+    """
+    bounds = [TradeRecord.contract_id == contract_id if close_time is None
+              else and_(TradeRecord.contract_id == contract_id, TradeRecord.trade_time > close_time)
+              for contract_id, close_time in last_close.items()]
+    return (select(TradeRecord, OrderRecord.market_action)
+            .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
+            .where(or_(*bounds), or_(TradeRecord.trade_id.is_(None), TradeRecord.trade_id <= 0),
+                   TradeRecord.trade_time.isnot(None))
+            .order_by(asc(TradeRecord.contract_id), asc(TradeRecord.trade_time), asc(TradeRecord.created_at),
+                      asc(TradeRecord.id)))
+
+
+@metricsutil.instrument
 class TradeRepo(Repo):
-    def __init__(self, db: DataSource):
-        super().__init__(db)
+    def __init__(self, db: DataSource, async_db=None):
+        super().__init__(db, async_db=async_db)
 
     def list_trades_v1(self, filter: TradeDataFilter) -> List[domain.TradeData]:
         with self.db.get_session() as sess:
@@ -38,24 +227,252 @@ class TradeRepo(Repo):
     def list_trades_v2(self, filter: TradeDataFilter) -> List[domain.TradeData]:
         with self.db.get_session() as sess:
             try:
-                query = (
-                    sess.query(TradeRecord, OrderRecord, ContractRecord, WebhookRecord)
-                    .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
-                    .outerjoin(ContractRecord, ContractRecord.contract_id == OrderRecord.contract_id)
-                    .outerjoin(WebhookRecord, WebhookRecord.ref_id == OrderRecord.ref_id))
-                if filter.query:
-                    query = query.filter(like_op(ContractRecord.vt_symbol, filter.query))
-                if filter.from_dt is not None:
-                    query = query.filter(TradeRecord.created_at >= filter.from_dt)
-                if filter.to_dt is not None:
-                    query = query.filter(TradeRecord.created_at <= filter.to_dt)
-                if filter.symbols:
-                    query = query.filter(ContractRecord.symbol.in_(filter.symbols))
-                if filter.security_types:
-                    query = query.filter(ContractRecord.sec_type.in_(filter.security_types))
+                rows = sess.execute(_trade_columns_statement(filter)).all()
+                return [mapper.map2trade_data_from_columns(row) for row in rows]
+            except Exception as e:
+                logger.exception("Error fetching trades from database: %s", e)
+                return []
 
-                orders = query.order_by(asc(TradeRecord.created_at)).all()
-                return [mapper.map2trade_data(trade=t, order=o, contract=c, webhook_log=wl) for t, o, c, wl in orders]
+    async def list_trades_v2_async(self, filter: TradeDataFilter) -> List[domain.TradeData]:
+        if self.async_db is None:
+            return await self.run_sync(self.list_trades_v2, filter)
+        async with self.async_db.get_session() as sess:
+            try:
+                rows = (await sess.execute(_trade_columns_statement(filter))).all()
+                return [mapper.map2trade_data_from_columns(row) for row in rows]
             except Exception as e:
                 logger.exception("Error fetching trades from database: %s", e)
                 return []
+
+    def iter_trade_rows(self, filter: TradeDataFilter, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        """
+        Flat trade/order/contract rows (see trade_export_columns) matching filter, ordered by (created_at, id),
+        in batches of up to batch_size. Rows are fetched through a streaming cursor, so memory stays bounded by
+        one batch; the session stays open until the iterator is exhausted or closed.
+        """
+        with self.db.get_session() as sess:
+            try:
+                result = sess.execute(_export_statement(filter).execution_options(yield_per=batch_size))
+                for partition in result.partitions():
+                    yield [tuple(row) for row in partition]
+            except Exception as e:
+                # The response is already streaming, so a truncated result must not look complete
+                logger.exception("Error exporting trades from database: %s", e)
+                raise
+
+    async def list_trades_page_async(self, filter: TradeDataFilter) -> Tuple[List[domain.TradeData], Pagination]:
+        # Paging issues several dependent queries; run the sync implementation off the event loop.
+        return await self.run_sync(self.list_trades_page, filter)
+
+    def list_trades_page(self, filter: TradeDataFilter) -> Tuple[List[domain.TradeData], Pagination]:
+        """
+        Keyset paginated variant of list_trades_v2, ordered by (created_at, id).
+        Pass pagination.next_cursor to move forward or pagination.prev_cursor to move backward.
+        A page is extended past its limit so that a trade group (same trade_id) is never split across pages.
+        """
+        with self.db.get_session() as sess:
+            try:
+                rows, pagination = self._page_rows(sess, filter)
+                return [mapper.map2trade_data_from_columns(row) for row in rows], pagination
+            except ValueError:
+                raise
+            except Exception as e:
+                logger.exception("Error fetching trades from database: %s", e)
+                return [], Pagination(limit=_page_limit(filter))
+
+    def list_trade_rows(self, filter: TradeDataFilter) -> domain.TradeRowPage:
+        """
+        list_trades_v2, or list_trades_page if filter.pagination is set, mapped to the TradeRow read model.
+        """
+        with self.db.get_session() as sess:
+            try:
+                if filter.pagination is not None:
+                    rows, pagination = self._page_rows(sess, filter)
+                    return mapper.map2trade_row_page_from_columns(rows, pagination=pagination)
+                return mapper.map2trade_row_page_from_columns(sess.execute(_trade_columns_statement(filter)))
+            except ValueError:
+                raise
+            except Exception as e:
+                logger.exception("Error fetching trades from database: %s", e)
+                pagination = Pagination(limit=_page_limit(filter)) if filter.pagination is not None else None
+                return domain.TradeRowPage(pagination=pagination)
+
+    async def list_trade_rows_async(self, filter: TradeDataFilter) -> domain.TradeRowPage:
+        return await self.run_sync(self.list_trade_rows, filter)
+
+    def _page_rows(self, sess, filter: TradeDataFilter) -> Tuple[list, Pagination]:
+        """
+        The rows of _trade_columns_statement on the page selected by filter.pagination, in (created_at, id)
+        order, with the pagination cursors of the neighbouring pages.
+        """
+        limit = _page_limit(filter)
+        cursor, backward = TRADE_KEYSET.start(filter.pagination)
+        statement = _trade_columns_statement(filter).order_by(None)
+        rows = TRADE_KEYSET.rows(sess, statement, cursor, backward, limit)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if rows and self._complete_trade_groups(sess, statement, rows, backward):
+            has_more = self._has_trades_beyond(sess, statement, TRADE_KEYSET.key(rows[-1]), backward)
+        pagination = TRADE_KEYSET.page(rows, TRADE_KEYSET.key, cursor, backward, has_more, limit)
+        return rows, pagination
+
+    def _complete_trade_groups(self, sess, statement, rows: list, backward: bool) -> bool:
+        """
+        Append rows until every trade group touched by the page is fully contained in it.
+        Rows are in page order (descending when paging backward). Returns True if rows were appended.
+        """
+        checked = set()
+        extended = False
+        while True:
+            group_ids = {row.trade_id for row in rows if row.trade_id and row.trade_id > 0} - checked
+            if not group_ids:
+                return extended
+            checked |= group_ids
+            bound = (sess.query(TradeRecord.created_at, TradeRecord.id)
+                     .filter(TradeRecord.trade_id.in_(group_ids))
+                     .order_by(*TRADE_KEYSET.order(descending=not backward)).first())
+            edge = TRADE_KEYSET.key(rows[-1])
+            if bound is None:
+                return extended
+            bound = tuple(bound)
+            if (bound >= edge) if backward else (bound <= edge):
+                return extended
+            if backward:
+                extra = sess.execute(statement.where(TRADE_KEYSET.before(edge), TRADE_KEYSET.not_before(bound))
+                                     .order_by(*TRADE_KEYSET.order(descending=True))).all()
+            else:
+                extra = sess.execute(statement.where(TRADE_KEYSET.after(edge), TRADE_KEYSET.not_after(bound))
+                                     .order_by(*TRADE_KEYSET.order())).all()
+            if not extra:
+                return extended
+            rows.extend(extra)
+            extended = True
+
+    def _has_trades_beyond(self, sess, statement, key, backward: bool) -> bool:
+        beyond = TRADE_KEYSET.before(key) if backward else TRADE_KEYSET.after(key)
+        return sess.execute(statement.where(beyond).limit(1)).first() is not None
+
+    def cumulative_pnl_before(self, filter: TradeDataFilter, trade) -> Tuple[float, float]:
+        """
+        Total PnL and commission of the priced trade groups listed under filter before trade, in (created_at, id)
+        order, so that the cumulative PnL of a narrowed listing carries over from its earlier pages.
+        """
+        with self.db.get_session() as sess:
+            try:
+                groups = (sess.query(TradeRecord.trade_id, func.max(TradeRecord.total_pnl).label("total_pnl"),
+                                     func.max(TradeRecord.total_commission).label("total_commission"))
+                          .outerjoin(OrderRecord, OrderRecord.perm_id == TradeRecord.order_id)
+                          .outerjoin(ContractRecord, ContractRecord.contract_id == OrderRecord.contract_id)
+                          .filter(*_trade_filters(filter), TradeRecord.trade_id > 0,
+                                  TRADE_KEYSET.before((trade.created_at, trade.id)))
+                          .group_by(TradeRecord.trade_id).subquery())
+                pnl, commission = sess.query(func.coalesce(func.sum(groups.c.total_pnl), 0.0),
+                                             func.coalesce(func.sum(groups.c.total_commission), 0.0)).one()
+                return pnl, commission
+            except Exception as e:
+                logger.exception("Error summing trade groups from database: %s", e)
+                return 0.0, 0.0
+
+    async def cumulative_pnl_before_async(self, filter: TradeDataFilter, trade) -> Tuple[float, float]:
+        return await self.run_sync(self.cumulative_pnl_before, filter, trade)
+
+    def list_trade_groups(self, filter: domain.TradeGroupFilter) -> Tuple[List[domain.TradeGroupData],
+                                                                           domain.TradeGroupSummary, Pagination]:
+        """
+        Trade groups ordered by (open_time, id), keyset paginated as list_trades_page, with the summary of every
+        group matching the filter (not only the page). Closed groups are read from the trade_group table, open
+        groups are derived from the trades (see _open_trade_groups).
+        :raises ValueError: on an invalid status or cursor.
+        """
+        criteria = _trade_group_filters(filter)
+        limit = _page_limit(filter)
+        cursor, backward = TRADE_GROUP_KEYSET.start(filter.pagination)
+        with self.db.get_session() as sess:
+            try:
+                open_groups = self._open_trade_groups(sess, filter)
+                entries = []
+                if filter.status != tradepnl.TRADE_GROUP_CLOSED:
+                    entries.extend((key, g) for key, g in open_groups
+                                   if cursor is None or (key < cursor if backward else key > cursor))
+                if filter.status != tradepnl.TRADE_GROUP_OPEN:
+                    statement = (select(TradeGroupRecord, ContractRecord)
+                                 .outerjoin(ContractRecord, ContractRecord.contract_id == TradeGroupRecord.contract_id)
+                                 .where(TradeGroupRecord.status == tradepnl.TRADE_GROUP_CLOSED, *criteria))
+                    rows = TRADE_GROUP_KEYSET.rows(sess, statement, cursor, backward, limit)
+                    entries.extend((TRADE_GROUP_KEYSET.key(g), mapper.map2trade_group_data(g, c)) for g, c in rows)
+                entries.sort(key=lambda e: e[0], reverse=backward)
+                has_more = len(entries) > limit
+                entries = entries[:limit]
+                pagination = TRADE_GROUP_KEYSET.page(entries, lambda e: e[0], cursor, backward, has_more, limit)
+                summary = self._summarize_trade_groups(sess, criteria, open_count=len(open_groups))
+                return [g for _, g in entries], summary, pagination
+            except Exception as e:
+                logger.exception("Error fetching trade groups from database: %s", e)
+                return [], domain.TradeGroupSummary(), Pagination(limit=limit)
+
+    def _open_trade_groups(self, sess, filter: domain.TradeGroupFilter) -> List[Tuple[tuple, domain.TradeGroupData]]:
+        """
+        The open group of every contract matching filter, in (open_time, id) order: the contract's trailing trade
+        set after its last closed group, while it is not priced. Only those trailing trades of the matching
+        contracts are read. Open groups have no trade_group row; they are keyed by the negated id of their first
+        trade so that they page along with the closed groups.
+        """
+        query = sess.query(ContractRecord).filter(ContractRecord.contract_id.isnot(None))
+        if filter.symbols:
+            query = query.filter(ContractRecord.symbol.in_(filter.symbols))
+        if filter.security_types:
+            query = query.filter(ContractRecord.sec_type.in_(filter.security_types))
+        contracts = {c.contract_id: c for c in query}
+        contract_ids = list(contracts)
+        trades = {}
+        for i in range(0, len(contract_ids), OPEN_GROUP_CONTRACT_CHUNK):
+            chunk = contract_ids[i:i + OPEN_GROUP_CONTRACT_CHUNK]
+            last_close = dict.fromkeys(chunk)
+            last_close.update(sess.query(TradeGroupRecord.contract_id, func.max(TradeGroupRecord.close_time))
+                              .filter(TradeGroupRecord.status == tradepnl.TRADE_GROUP_CLOSED,
+                                      TradeGroupRecord.contract_id.in_(chunk))
+                              .group_by(TradeGroupRecord.contract_id).all())
+            for t, market_action in sess.execute(_open_trades_statement(last_close)):
+                trades.setdefault(t.contract_id, []).append(LedgerTrade.from_record(t, market_action))
+
+        groups = []
+        for contract_id, contract_trades in trades.items():
+            current = current_trade_set(contract_trades)
+            if not current or tradepnl.is_closed_trade_group(current):
+                continue
+            values = tradepnl.summarize_trade_group(current)
+            if filter.accounts and values["account_id"] not in filter.accounts:
+                continue
+            if filter.from_dt is not None and values["open_time"] < filter.from_dt:
+                continue
+            if filter.to_dt is not None and values["open_time"] > filter.to_dt:
+                continue
+            group = mapper.map2trade_group_data(TradeGroupRecord(**values), contracts[contract_id])
+            groups.append(((values["open_time"], -current[0].id), group))
+        groups.sort(key=lambda g: g[0])
+        return groups
+
+    async def list_trade_groups_async(self, filter: domain.TradeGroupFilter) -> Tuple[
+            List[domain.TradeGroupData], domain.TradeGroupSummary, Pagination]:
+        return await self.run_sync(self.list_trade_groups, filter)
+
+    def _summarize_trade_groups(self, sess, criteria: list, open_count: int = 0) -> domain.TradeGroupSummary:
+        closed = TradeGroupRecord.status == tradepnl.TRADE_GROUP_CLOSED
+        pnl = func.coalesce(TradeGroupRecord.total_pnl, 0.0)
+        row = (sess.query(func.count(case((closed, 1))),
+                          func.count(case((and_(closed, pnl > 0), 1))),
+                          func.count(case((and_(closed, pnl < 0), 1))),
+                          func.sum(case((closed, pnl))),
+                          func.sum(case((closed, TradeGroupRecord.total_commission))),
+                          func.max(case((closed, pnl))),
+                          func.min(case((closed, pnl))))
+               .select_from(TradeGroupRecord)
+               .outerjoin(ContractRecord, ContractRecord.contract_id == TradeGroupRecord.contract_id)
+               .filter(*criteria).one())
+        closed_count, win_count, loss_count, total_pnl, total_commission, best_pnl, worst_pnl = row
+        return domain.TradeGroupSummary(
+            closed_count=closed_count, open_count=open_count, win_count=win_count, loss_count=loss_count,
+            win_rate=round(win_count / closed_count * 100, 2) if closed_count else 0.0,
+            total_pnl=round(total_pnl or 0.0, 2), total_commission=round(total_commission or 0.0, 2),
+            average_pnl=round((total_pnl or 0.0) / closed_count, 2) if closed_count else 0.0,
+            best_pnl=best_pnl, worst_pnl=worst_pnl)
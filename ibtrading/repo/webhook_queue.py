@@ -0,0 +1,157 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Tuple
+
+from ibtrading.utils import loggerutil
+
+logger = loggerutil.get_logger(__name__)
+
+PENDING = 0
+CLAIMED = 1
+DONE = 2
+FAILED = 3  # Dead-lettered: kept for inspection, never claimed again
+
+
+class WebhookQueue:
+    """
+    Durable local queue of webhook payloads, kept in a SQLite file in WAL mode so an enqueue is a
+    single small local write. Entries are deduplicated on a key (a hash of the raw payload) for as
+    long as they are retained, so retried deliveries are dropped on arrival.
+    An entry released max_attempts times is dead-lettered so that it cannot stall the entries behind it.
+    """
+
+    def __init__(self, path: str, retention_seconds: int = 24 * 3600, max_attempts: int = 5):
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS webhook_queue ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "dedupe_key TEXT NOT NULL UNIQUE, "
+            "payload TEXT NOT NULL, "
+            "status INTEGER NOT NULL DEFAULT 0, "
+            "attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, "
+            "updated_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_webhook_queue_status ON webhook_queue (status, id)")
+
+    def put(self, dedupe_key: str, payload: dict) -> bool:
+        """
+        Append a payload. Returns False if an entry with the same key is already queued or retained.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO webhook_queue (dedupe_key, payload, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)", (dedupe_key, json.dumps(payload), PENDING, now, now))
+            return cursor.rowcount > 0
+
+    def claim(self, limit: int) -> List[Tuple[int, dict]]:
+        """
+        Mark up to limit pending entries as claimed, oldest first, and return (id, payload) for each.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, payload FROM webhook_queue WHERE status = ? ORDER BY id LIMIT ?",
+                    (PENDING, limit)).fetchall()
+                if rows:
+                    self._conn.executemany("UPDATE webhook_queue SET status = ?, updated_at = ? WHERE id = ?",
+                                           [(CLAIMED, time.time(), id) for id, _ in rows])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(id, json.loads(payload)) for id, payload in rows]
+
+    def ack(self, ids: List[int]):
+        """
+        Mark claimed entries as processed. They are kept (for deduplication) until purged.
+        """
+        self._set_status(ids, DONE)
+
+    def release(self, ids: List[int]) -> int:
+        """
+        Return claimed entries to the queue after a failed attempt, dead-lettering those that have now
+        failed max_attempts times. Returns the number of entries dead-lettered.
+        """
+        if not ids:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "UPDATE webhook_queue SET attempts = attempts + 1, updated_at = ?, "
+                    "status = CASE WHEN attempts + 1 >= ? THEN ? ELSE ? END WHERE id = ?",
+                    [(time.time(), self.max_attempts, FAILED, PENDING, id) for id in ids])
+                failed = [id for (id,) in self._conn.execute(
+                    f"SELECT id FROM webhook_queue WHERE status = ? AND id IN ({','.join('?' * len(ids))})",
+                    (FAILED, *ids))]
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if failed:
+            logger.error(f"Dead-lettered webhook queue entries after {self.max_attempts} attempts: {failed}")
+        return len(failed)
+
+    def dead_letter(self, ids: List[int]):
+        """
+        Mark claimed entries as failed without retrying them, e.g. payloads that can never be parsed.
+        """
+        if ids:
+            logger.error(f"Dead-lettered webhook queue entries: {ids}")
+        self._set_status(ids, FAILED)
+
+    def recover(self) -> int:
+        """
+        Return entries claimed by a previous process that did not finish them. Call before starting workers.
+        """
+        with self._lock:
+            cursor = self._conn.execute("UPDATE webhook_queue SET status = ?, updated_at = ? WHERE status = ?",
+                                        (PENDING, time.time(), CLAIMED))
+            return cursor.rowcount
+
+    def purge(self) -> int:
+        """
+        Delete processed entries older than the retention period.
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM webhook_queue WHERE status = ? AND updated_at < ?",
+                                        (DONE, time.time() - self.retention_seconds))
+            return cursor.rowcount
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM webhook_queue WHERE status = ?", (PENDING,)).fetchone()[0]
+
+    def failed(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM webhook_queue WHERE status = ?", (FAILED,)).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _set_status(self, ids: List[int], status: int):
+        if not ids:
+            return
+        with self._lock:
+            self._conn.executemany("UPDATE webhook_queue SET status = ?, updated_at = ? WHERE id = ?",
+                                   [(status, time.time(), id) for id in ids])
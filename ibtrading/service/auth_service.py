@@ -3,20 +3,28 @@
 -- Email: asokpant@gmail.com
 -- Created on: 30/01/2025
 """
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Optional
 
 import bcrypt
 from ibtrading.repo.datasource import SessionLocal
-from sqlalchemy.orm import Session as DBSession
 import jwt
+from starlette.concurrency import run_in_threadpool
 
 from ibtrading.domain import User, LogoutResponse, LoginResponse, ErrorCode
 from ibtrading.domain.auth import Session, AuthResponse
 from ibtrading.domain.user import UserWithPassword
-from ibtrading.utils import loggerutil
+from ibtrading.model.user_model import UserModel
+from ibtrading.settings import Settings
+from ibtrading.utils import loggerutil, metricsutil
+from ibtrading.utils.cacheutil import TTLCache
+from ibtrading.utils.ratelimitutil import RateLimiter
 from ibtrading.utils.singleton import Singleton
 from ibtrading.repo.user_repo import UserRepository
+from ibtrading.service.session_store import SessionStore, create_session_store
 from ibtrading.service.user_service import UserService
 
 JWT_SECRET_KEY = "secret@543"
@@ -26,46 +34,27 @@ JWT_ACCESS_TOKEN_EXPIRE_SECONDS = 7 * 24 * 60 * 60
 logger = loggerutil.get_logger(__name__)
 
 
-class SessionStore:
-    def __init__(self):
-        self.sessions: Dict[str, Session] = {}
-
-    def add_session(self, username: str, token: str, expires: datetime):
-        self.sessions[token] = Session(username=username, expiry=expires, access_token=token)
-
-    def get_session(self, token: str = None) -> Optional[Session]:
-        session = self.sessions.get(token, None)
-        if session and session.expiry < datetime.now():
-            self.remove_session(token)
-            return None
-        return session
-
-    def remove_session(self, token: str):
-        return self.sessions.pop(token, None)
-
-    def cleanup_expired(self):
-        """Remove expired sessions"""
-        current_time = datetime.now()
-        expired = [
-            token for token, session in self.sessions.items()
-            if session.expiry < current_time
-        ]
-        for token in expired:
-            self.remove_session(token)
-
-
+@metricsutil.instrument
 class AuthService(metaclass=Singleton):
     _instance = None
 
     def __init__(self):
         if AuthService._instance is not None:
             return
-        self.db: DBSession = SessionLocal()
-        self.user_service = UserService(UserRepository(self.db))
+        self.user_service = UserService(UserRepository(SessionLocal))
+        # Resolved principal (User) per access token, so authorizing a request needs no database read
+        self.principal_cache = TTLCache(maxsize=Settings.AUTH_CACHE_SIZE, ttl=Settings.AUTH_CACHE_TTL_SECONDS)
+        # bcrypt verification runs on its own small pool, off the event loop and the request threadpool
+        self.login_executor = ThreadPoolExecutor(max_workers=Settings.AUTH_LOGIN_WORKERS,
+                                                 thread_name_prefix="auth-login")
+        self.login_slots = threading.BoundedSemaphore(Settings.AUTH_LOGIN_MAX_PENDING)
+        self.login_rate_limiter = RateLimiter(limit=Settings.AUTH_LOGIN_RATE_LIMIT,
+                                              window=Settings.AUTH_LOGIN_RATE_WINDOW_SECONDS)
         # Seeding default users for testing
-        self.seed()
+        if Settings.STARTUP_TASKS:
+            self.seed()
         self.api_keys = {"APIKEY123": {"role": "admin"}, "APIKEY456": {"role": "admin"}}
-        self.session_store = SessionStore()
+        self.session_store: SessionStore = create_session_store(Settings.SESSION_BACKEND)
 
     def seed(self):
         # Seed default users if not present
@@ -87,6 +76,25 @@ class AuthService(metaclass=Singleton):
             active=user_model.active
         )
 
+    def update_user(self, user: UserModel) -> Optional[UserModel]:
+        existing = self.user_service.user_repo.get_user(user.id)
+        updated = self.user_service.update_user(user)
+        if existing is not None:
+            self.invalidate_user(existing.username)
+        self.invalidate_user(user.username)
+        return updated
+
+    def delete_user(self, user: UserModel) -> bool:
+        deleted = self.user_service.delete_user(user)
+        self.invalidate_user(user.username)
+        return deleted
+
+    def invalidate_user(self, username: str) -> int:
+        """
+        Drop the cached principal of every token of a user, e.g. after the user is changed.
+        """
+        return self.principal_cache.invalidate(lambda token, user: user.username == username)
+
     def _get_password(self, username: str):
         user_model = self.user_service.get_user(username)
         return user_model.hashed_password if user_model else None
@@ -106,6 +114,23 @@ class AuthService(metaclass=Singleton):
         session.role = user.role
         return LoginResponse(error=False, session=session)
 
+    async def login_async(self, username: str, password: str) -> LoginResponse:
+        """
+        login() for async routes. Attempts are rate limited per username, at most AUTH_LOGIN_MAX_PENDING
+        logins are in flight at once, and the bcrypt check runs on login_executor.
+        """
+        if not self.login_rate_limiter.allow(username):
+            retry_after = self.login_rate_limiter.retry_after(username)
+            return LoginResponse(error=True, code=ErrorCode.TOO_MANY_REQUESTS,
+                                 message=f"Too many login attempts, retry in {retry_after:.0f} seconds")
+        if not self.login_slots.acquire(blocking=False):
+            return LoginResponse(error=True, code=ErrorCode.TOO_MANY_REQUESTS, message="Too many concurrent logins")
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.login_executor, self.login, username, password)
+        finally:
+            self.login_slots.release()
+
     def _create_access_token(self, username: str, expires_delta: timedelta = None) -> Session:
         expire = datetime.now() + (expires_delta or timedelta(seconds=JWT_ACCESS_TOKEN_EXPIRE_SECONDS))
         to_encode = dict({"sub": username, "exp": expire})
@@ -137,18 +162,24 @@ class AuthService(metaclass=Singleton):
             if token is None or token == "" or token == "null":
                 return ErrorCode.UNAUTHORIZED, "Invalid token", None
 
-            payload = self._decode_jwt(token)
-            if payload is None:
-                return ErrorCode.UNAUTHORIZED, "Invalid token", None
+            user = self.principal_cache.get(token)
+            if user is None:
+                payload = self._decode_jwt(token)
+                if payload is None:
+                    return ErrorCode.UNAUTHORIZED, "Invalid token", None
 
+            # Checked on every request, cached or not, so logout and expiry take effect at once
             session = self.session_store.get_session(token)
             if not session or session.access_token != token:
+                self.principal_cache.pop(token)
                 return ErrorCode.UNAUTHORIZED, "Unauthorized", None
 
-            username = payload.get("sub")
-            user = self.get_user(username)
             if user is None:
-                return ErrorCode.UNAUTHORIZED, "Invalid token", None
+                username = payload.get("sub")
+                user = self.get_user(username)
+                if user is None:
+                    return ErrorCode.UNAUTHORIZED, "Invalid token", None
+                self.principal_cache.set(token, user)
             session.user = user
             session.role = user.role
             return None, None, session
@@ -169,7 +200,15 @@ class AuthService(metaclass=Singleton):
             logger.exception(f"Error authorizing token: {e}")
             return AuthResponse(error=True, code=ErrorCode.INTERNAL_ERROR, message=str(e))
 
+    async def authorize_async(self, token: str) -> AuthResponse:
+        """
+        authorize() for async routes and services. The session lookup (and the user lookup on a principal cache
+        miss) may block on the session store or the database, so it runs on the threadpool.
+        """
+        return await run_in_threadpool(self.authorize, token)
+
     def logout(self, token):
+        self.principal_cache.pop(token)
         session = self.session_store.remove_session(token)
         if session is None:
             return LogoutResponse(error=True, code=ErrorCode.NOT_FOUND, message="Session not found")
@@ -3,51 +3,120 @@
 -- Email: asokpant@gmail.com
 -- Created on: 30/01/2025
 """
+import threading
+from typing import Optional
 
-from ibtrading.repo.datasource import DataSource
+from ibtrading.repo.async_datasource import AsyncDataSource
+from ibtrading.repo.contract_cache import ContractCache
+from ibtrading.repo.datasource import DataSource, get_data_source
 from ibtrading.repo.order_repo import OrderRepo
 from ibtrading.repo.trade_repo import TradeRepo
 from ibtrading.service.auth_service import AuthService
 from ibtrading.service.order_service_v1 import OrderService
 from ibtrading.service.trade_service import TradeService
+from ibtrading.service.webhook_service import WebhookService
+from ibtrading.settings import Settings
+from ibtrading.utils import loggerutil
+
+logger = loggerutil.get_logger(__name__)
 
 TV_WEBHOOK_PROCESSOR = None
 IBKR_SERVICE = None
 AUTH_SERVICE = None
 ORDER_SERVICE = None
 TRADE_SERVICE = None
+WEBHOOK_SERVICE = None
 OPTION_SERVICE = None
 DATASOURCE = None
+ASYNC_DATASOURCE = None
+CONTRACT_CACHE = None
+
+# Guards the lazy singletons below; reentrant because getters call each other
+_LOCK = threading.RLock()
 
 
 def get_datasource() -> DataSource:
     global DATASOURCE
     if DATASOURCE is None:
-        DATASOURCE = DataSource()
+        with _LOCK:
+            if DATASOURCE is None:
+                DATASOURCE = get_data_source()
     return DATASOURCE
 
 
+def get_async_datasource() -> Optional[AsyncDataSource]:
+    """
+    Async datasource for the request path, or None if the database has no installed async driver
+    (repos then run their sync queries in the threadpool).
+    """
+    global ASYNC_DATASOURCE
+    if ASYNC_DATASOURCE is None and Settings.DATABASE_ASYNC:
+        with _LOCK:
+            if ASYNC_DATASOURCE is None:
+                get_datasource()  # Creates and migrates the tables
+                if AsyncDataSource.is_supported():
+                    ASYNC_DATASOURCE = AsyncDataSource()
+                else:
+                    logger.warning("No async driver installed for the database, falling back to the threadpool.")
+    return ASYNC_DATASOURCE
+
+
+def get_contract_cache() -> ContractCache:
+    global CONTRACT_CACHE
+    if CONTRACT_CACHE is None:
+        with _LOCK:
+            if CONTRACT_CACHE is None:
+                CONTRACT_CACHE = ContractCache()
+    return CONTRACT_CACHE
+
+
+async def close_async_datasource():
+    global ASYNC_DATASOURCE
+    if ASYNC_DATASOURCE is not None:
+        await ASYNC_DATASOURCE.dispose()
+        ASYNC_DATASOURCE = None
+
+
 def get_order_service() -> OrderService:
     global ORDER_SERVICE
     if ORDER_SERVICE is None:
-        db = get_datasource()
-        order_repo = OrderRepo(db)
-        ORDER_SERVICE = OrderService(order_repo, auth_service=get_auth_service())
+        with _LOCK:
+            if ORDER_SERVICE is None:
+                db = get_datasource()
+                order_repo = OrderRepo(db, async_db=get_async_datasource(), contract_cache=get_contract_cache())
+                if Settings.STARTUP_TASKS:
+                    order_repo.backfill_pnl_checkpoints()
+                order_repo.warm_trade_ledger()
+                order_repo.warm_contract_cache()
+                ORDER_SERVICE = OrderService(order_repo, auth_service=get_auth_service())
     return ORDER_SERVICE
 
 
 def get_trade_service() -> TradeService:
     global TRADE_SERVICE
     if TRADE_SERVICE is None:
-        db = get_datasource()
-        repo = TradeRepo(db)
+        with _LOCK:
+            if TRADE_SERVICE is None:
+                db = get_datasource()
+                repo = TradeRepo(db, async_db=get_async_datasource())
 
-        TRADE_SERVICE = TradeService(trade_repo=repo, auth_service=get_auth_service())
+                TRADE_SERVICE = TradeService(trade_repo=repo, auth_service=get_auth_service())
     return TRADE_SERVICE
 
 
+def get_webhook_service() -> WebhookService:
+    global WEBHOOK_SERVICE
+    if WEBHOOK_SERVICE is None:
+        with _LOCK:
+            if WEBHOOK_SERVICE is None:
+                WEBHOOK_SERVICE = WebhookService(get_order_service().order_repo, auth_service=get_auth_service())
+    return WEBHOOK_SERVICE
+
+
 def get_auth_service() -> AuthService:
     global AUTH_SERVICE
     if AUTH_SERVICE is None:
-        AUTH_SERVICE = AuthService()
+        with _LOCK:
+            if AUTH_SERVICE is None:
+                AUTH_SERVICE = AuthService()
     return AUTH_SERVICE
@@ -3,11 +3,12 @@
 -- Email: asokpant@gmail.com
 -- Created on: 31/01/2025
 """
+from typing import Iterator
 
 from ibtrading.domain import ListTradeResponse, ListOrderResponse, ListPortfolioResponse, ListPositionResponse, \
     ListAccountResponse, AccountData, \
     ListContractResponse
-from ibtrading.domain import WebhookPayload
+from ibtrading.domain import WebhookPayload, OrderData, ContractData, AccountValueData
 from ibtrading.domain.webhook import ListWebhookPayloadResponse
 from ibtrading.repo.order_repo import OrderRepo
 from ibtrading.service.auth_service import AuthService
@@ -20,19 +21,19 @@ class OrderService(ServiceBase):
         self.order_repo = order_repo
 
     async def list_trades(self) -> ListTradeResponse:
-        return ListTradeResponse(trades=self.order_repo.list_trades())
+        return ListTradeResponse(trades=await self.order_repo.list_trades_async())
 
     async def list_orders(self) -> ListOrderResponse:
-        return ListOrderResponse(orders=self.order_repo.list_orders())
+        return ListOrderResponse(orders=await self.order_repo.list_orders_async())
 
     async def list_portfolio(self) -> ListPortfolioResponse:
-        return ListPortfolioResponse(portfolios=self.order_repo.list_portfolio())
+        return ListPortfolioResponse(portfolios=await self.order_repo.list_portfolio_async())
 
     async def list_position(self) -> ListPositionResponse:
-        return ListPositionResponse(positions=self.order_repo.list_position())
+        return ListPositionResponse(positions=await self.order_repo.list_position_async())
 
     async def list_account_summary(self) -> ListAccountResponse:
-        values = self.order_repo.list_account_summary()
+        values = await self.order_repo.list_account_summary_async()
         accounts = {}
         for value in values:
             account = accounts.get(value.account_id, None)
@@ -46,10 +47,25 @@ class OrderService(ServiceBase):
         return ListAccountResponse(accounts=data)
 
     async def list_contracts(self) -> ListContractResponse:
-        return ListContractResponse(contracts=self.order_repo.list_contracts())
+        return ListContractResponse(contracts=await self.order_repo.list_contracts_async())
 
     async def list_webhook_logs(self) -> ListWebhookPayloadResponse:
-        return ListWebhookPayloadResponse(webhooks=self.order_repo.list_webhook_logs())
+        return ListWebhookPayloadResponse(webhooks=await self.order_repo.list_webhook_logs_async())
+
+    def stream_orders(self) -> Iterator[OrderData]:
+        return self.order_repo.iter_orders()
+
+    def stream_account_values(self) -> Iterator[AccountValueData]:
+        """
+        Account values one by one, in created_at order (not grouped per account as in list_account_summary).
+        """
+        return self.order_repo.iter_account_values()
+
+    def stream_contracts(self) -> Iterator[ContractData]:
+        return self.order_repo.iter_contracts()
+
+    def stream_webhook_logs(self) -> Iterator[WebhookPayload]:
+        return self.order_repo.iter_webhook_logs()
 
     def get_last_webhook(self, req) -> WebhookPayload:
         return self.order_repo.get_last_webhook(req)
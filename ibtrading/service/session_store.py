@@ -0,0 +1,170 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import hashlib
+from abc import ABC, abstractmethod
+import heapq
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlalchemy.orm import Session as DBSession
+
+from ibtrading.domain.auth import Session
+from ibtrading.model.auth_session_record import AuthSessionRecord
+from ibtrading.utils import loggerutil
+
+SESSION_BACKEND_MEMORY = "memory"
+SESSION_BACKEND_DB = "db"
+
+logger = loggerutil.get_logger(__name__)
+
+
+class SessionStore(ABC):
+    """
+    Access token sessions. Expired sessions are never returned; cleanup_expired() deletes them and is
+    run periodically by the sweeper thread (start_sweeper). Backends implement the abstract methods.
+    """
+
+    def __init__(self):
+        self._sweeper: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @abstractmethod
+    def add_session(self, username: str, token: str, expires: datetime):
+        pass
+
+    @abstractmethod
+    def get_session(self, token: str = None) -> Optional[Session]:
+        pass
+
+    @abstractmethod
+    def remove_session(self, token: str) -> Optional[Session]:
+        pass
+
+    @abstractmethod
+    def cleanup_expired(self) -> int:
+        """Remove expired sessions, returns the number removed"""
+
+    def start_sweeper(self, interval: float):
+        if self._sweeper is not None:
+            return
+        self._stopped.clear()
+        self._sweeper = threading.Thread(target=self._sweep, args=(interval,), name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self, timeout: float = 5):
+        self._stopped.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=timeout)
+            self._sweeper = None
+
+    def _sweep(self, interval: float):
+        while not self._stopped.wait(timeout=interval):
+            try:
+                removed = self.cleanup_expired()
+                if removed:
+                    logger.debug(f"Removed {removed} expired sessions.")
+            except Exception as e:
+                logger.exception(f"Error removing expired sessions: {e}")
+
+
+class InMemorySessionStore(SessionStore):
+    """
+    Process-local sessions, with a heap ordered by expiry so cleanup only touches expired entries.
+    Only usable with a single worker process.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sessions: Dict[str, Session] = {}
+        self._expiry_heap: List[Tuple[datetime, str]] = []
+        self._lock = threading.Lock()
+
+    def add_session(self, username: str, token: str, expires: datetime):
+        with self._lock:
+            self.sessions[token] = Session(username=username, expiry=expires, access_token=token)
+            heapq.heappush(self._expiry_heap, (expires, token))
+
+    def get_session(self, token: str = None) -> Optional[Session]:
+        session = self.sessions.get(token, None)
+        if session and session.expiry < datetime.now():
+            self.remove_session(token)
+            return None
+        return session
+
+    def remove_session(self, token: str) -> Optional[Session]:
+        # The heap entry is left behind and skipped when it comes due
+        with self._lock:
+            return self.sessions.pop(token, None)
+
+    def cleanup_expired(self) -> int:
+        now = datetime.now()
+        removed = 0
+        with self._lock:
+            while self._expiry_heap and self._expiry_heap[0][0] < now:
+                expiry, token = heapq.heappop(self._expiry_heap)
+                session = self.sessions.get(token)
+                if session is not None and session.expiry == expiry:
+                    del self.sessions[token]
+                    removed += 1
+        return removed
+
+
+class DbSessionStore(SessionStore):
+    """
+    Sessions in the auth_session table, shared by every worker process on the same database.
+    Tokens are stored as SHA-256 hashes.
+    """
+
+    def __init__(self, session_factory: Callable[[], DBSession]):
+        super().__init__()
+        self.session_factory = session_factory
+
+    @staticmethod
+    def token_hash(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def add_session(self, username: str, token: str, expires: datetime):
+        with self.session_factory() as db:
+            db.merge(AuthSessionRecord(token_hash=self.token_hash(token), username=username, expiry=expires))
+            db.commit()
+
+    def get_session(self, token: str = None) -> Optional[Session]:
+        if not token:
+            return None
+        with self.session_factory() as db:
+            record = db.get(AuthSessionRecord, self.token_hash(token))
+            if record is None or record.expiry < datetime.now():
+                return None
+            return Session(username=record.username, expiry=record.expiry, access_token=token)
+
+    def remove_session(self, token: str) -> Optional[Session]:
+        with self.session_factory() as db:
+            record = db.get(AuthSessionRecord, self.token_hash(token))
+            if record is None:
+                return None
+            db.delete(record)
+            db.commit()
+            return Session(username=record.username, expiry=record.expiry, access_token=token)
+
+    def cleanup_expired(self) -> int:
+        with self.session_factory() as db:
+            result = db.execute(delete(AuthSessionRecord).where(AuthSessionRecord.expiry < datetime.now()))
+            db.commit()
+            return result.rowcount
+
+
+def create_session_store(backend: str, session_factory: Callable[[], DBSession] = None) -> SessionStore:
+    backend = (backend or SESSION_BACKEND_MEMORY).lower()
+    if backend == SESSION_BACKEND_MEMORY:
+        return InMemorySessionStore()
+    if backend == SESSION_BACKEND_DB:
+        if session_factory is None:
+            from ibtrading.repo.datasource import SessionLocal
+            session_factory = SessionLocal
+        return DbSessionStore(session_factory)
+    raise ValueError(f"Unknown session backend: {backend}")
@@ -4,13 +4,25 @@
 -- Created on: 20/03/2025
 """
 from collections import OrderedDict
+from typing import Iterator, Optional, Tuple
 
 from ibtrading.domain import ListTradeRequest, \
-    ListTradeResponse, TradeData
-from ibtrading.repo.trade_repo import TradeRepo
+    ListTradeResponse, TradeData, TradeDataFilter, ErrorCode, ExportTradeRequest, TradeRowPage, ListTradeGroupRequest, \
+    ListTradeGroupResponse
+from ibtrading.domain.commons import BaseResponse
+from ibtrading.repo.trade_repo import TradeRepo, trade_export_columns
 from ibtrading.service.service_base import ServiceBase
 from ibtrading.settings import Settings
-from ibtrading.utils import loggerutil, tradeutil
+from ibtrading.utils import loggerutil, tradeutil, exportutil
+
+
+def _covers_history(filter: TradeDataFilter) -> bool:
+    """
+    True if a listing under filter leaves out no earlier trade group, so the account running totals stored on
+    its trades apply to it. Listings narrowed by query, symbol, security type, account or start time sum their
+    own groups instead.
+    """
+    return not (filter.query or filter.symbols or filter.security_types or filter.accounts or filter.from_dt)
 
 
 class TradeService(ServiceBase):
@@ -80,21 +92,126 @@ class TradeService(ServiceBase):
             processed_trades.append(_trades_processed)
         return processed_trades
 
+    def group_trades(self, trades, stored_totals: bool = True,
+                     opening: Tuple[float, float] = (0.0, 0.0)) -> list[list[TradeData]]:
+        """
+        Group trades by trade group. With stored_totals, cumulative PnL and commission are the account running
+        totals persisted when each group closed (see OrderRepo._apply_pnl_checkpoint), without re-summing
+        history. Otherwise they are summed over the listed closed groups in order, as
+        calculate_cumulative_pnl_groups does, starting from opening: the (PnL, commission) of the groups
+        listed on earlier pages.
+        """
+        trade_groups = OrderedDict()
+        for trade in trades:
+            key = trade.trade_id if trade.trade_id and trade.trade_id > 0 else trade.order_id
+            trade_groups.setdefault(key, []).append(trade)
+
+        grouped_trades = []
+        for _key, _trades in trade_groups.items():
+            if len(_trades) > 1:
+                entry_price = 0
+                for _trade in _trades:
+                    if _trade.market_action and _trade.market_action.startswith("ENTRY"):
+                        entry_price += _trade.avg_price * _trade.quantity
+                total_pnl = _trades[0].total_pnl or 0
+                total_pnl_percent = round(total_pnl / entry_price * 100, 2) if entry_price != 0 else 0
+                for _trade in _trades:
+                    _trade.total_pnl_percent = total_pnl_percent
+            grouped_trades.append(_trades)
+
+        if not stored_totals:
+            cum_pnl, cum_commission = opening
+            for _trades in grouped_trades:
+                if not _trades[0].trade_id or _trades[0].trade_id <= 0:
+                    continue
+                cum_pnl += _trades[-1].total_pnl or 0
+                cum_commission += _trades[-1].total_commission or 0
+                for _trade in _trades:
+                    _trade.cumulative_pnl = round(cum_pnl, 2)
+                    _trade.cumulative_commission = round(cum_commission, 2)
+        return grouped_trades
+
+    async def _opening_totals(self, filter: TradeDataFilter, trades: list) -> Tuple[float, float]:
+        """
+        The (PnL, commission) a narrowed, paginated listing's cumulative PnL starts from on a page of trades.
+        """
+        if filter.pagination is None or not trades or _covers_history(filter):
+            return 0.0, 0.0
+        return await self.trade_repo.cumulative_pnl_before_async(filter, trades[0])
+
     async def list_trades(self, req: ListTradeRequest) -> ListTradeResponse:
         self.logger.info("List trade request: %s", req)
-        authres = self.auth_service.authorize(req.authorization)
+        authres = await self.auth_service.authorize_async(req.authorization)
         if authres.error:
             return ListTradeResponse(error=True, code=authres.code, message=authres.message)
-        trades = self.trade_repo.list_trades_v2(filter=req.filter)
-        grouped_trades = self.calculate_cumulative_pnl_groups(trades)
+        pagination = None
+        if req.filter.pagination is not None:
+            try:
+                trades, pagination = await self.trade_repo.list_trades_page_async(filter=req.filter)
+            except ValueError as e:
+                return ListTradeResponse(error=True, code=ErrorCode.INVALID_REQUEST, message=str(e))
+        else:
+            trades = await self.trade_repo.list_trades_v2_async(filter=req.filter)
+        grouped_trades = self.group_trades(trades, stored_totals=_covers_history(req.filter),
+                                           opening=await self._opening_totals(req.filter, trades))
         flattened_trades = tradeutil.flatten(grouped_trades)
 
         res = ListTradeResponse(trades=flattened_trades, grouped_trades=grouped_trades)
+        if pagination is not None:
+            res.pagination = pagination
         return res
 
+    async def list_trade_rows(self, req: ListTradeRequest) -> Tuple[Optional[ListTradeResponse],
+                                                                     Optional[TradeRowPage]]:
+        """
+        list_trades on the TradeRow read model, for the compact listing. Returns (error, None) or (None, page).
+        """
+        self.logger.info("List trade rows request: %s", req)
+        authres = await self.auth_service.authorize_async(req.authorization)
+        if authres.error:
+            return ListTradeResponse(error=True, code=authres.code, message=authres.message), None
+        try:
+            page = await self.trade_repo.list_trade_rows_async(filter=req.filter)
+        except ValueError as e:
+            return ListTradeResponse(error=True, code=ErrorCode.INVALID_REQUEST, message=str(e)), None
+        page.grouped_trades = self.group_trades(page.trades, stored_totals=_covers_history(req.filter),
+                                                opening=await self._opening_totals(req.filter, page.trades))
+        page.trades = tradeutil.flatten(page.grouped_trades)
+        return None, page
+
+    async def list_trade_groups(self, req: ListTradeGroupRequest) -> ListTradeGroupResponse:
+        """
+        Trade groups read from the trade_group table, without loading or re-grouping their trades.
+        """
+        self.logger.info("List trade group request: %s", req)
+        authres = await self.auth_service.authorize_async(req.authorization)
+        if authres.error:
+            return ListTradeGroupResponse(error=True, code=authres.code, message=authres.message)
+        try:
+            groups, summary, pagination = await self.trade_repo.list_trade_groups_async(filter=req.filter)
+        except ValueError as e:
+            return ListTradeGroupResponse(error=True, code=ErrorCode.INVALID_REQUEST, message=str(e))
+        return ListTradeGroupResponse(groups=groups, summary=summary, pagination=pagination)
+
+    async def export_trades(self, req: ExportTradeRequest) -> Tuple[Optional[BaseResponse],
+                                                                    Optional[Iterator[bytes]]]:
+        """
+        Returns (error, None) or (None, chunks) where chunks lazily streams the filtered trades encoded in
+        req.format. Rows are read from the database as the chunks are consumed.
+        """
+        self.logger.info("Export trade request: %s", req)
+        authres = await self.auth_service.authorize_async(req.authorization)
+        if authres.error:
+            return BaseResponse(error=True, code=authres.code, message=authres.message), None
+        if not exportutil.is_supported(req.format):
+            return BaseResponse(error=True, code=ErrorCode.INVALID_REQUEST,
+                                message=f"Unsupported export format: {req.format}"), None
+        batches = self.trade_repo.iter_trade_rows(filter=req.filter, batch_size=req.batch_size)
+        return None, exportutil.encode(req.format, trade_export_columns(), batches)
+
     async def list_trades_v0(self, req: ListTradeRequest) -> ListTradeResponse:
         self.logger.info("List trade request: %s", req)
-        authres = self.auth_service.authorize(req.authorization)
+        authres = await self.auth_service.authorize_async(req.authorization)
         if authres.error:
             return ListTradeResponse(error=True, code=authres.code, message=authres.message)
         trades = self.trade_repo.list_trades_v1(filter=req.filter)
@@ -139,3 +139,48 @@ def calculate_pnl_for_ref_trade(trade_id: int, market_action: str, trades):
     #     print(t.id, t.trade_id, t.market_action, t.trade_time, t.price, t.quantity, t.commission, t.pnl, t.total_pnl,
     #           t.total_commission)
     return _trades
+
+
+TRADE_GROUP_OPEN = "OPEN"
+TRADE_GROUP_CLOSED = "CLOSED"
+
+
+def is_closed_trade_group(trade_set) -> bool:
+    """
+    True if the trade set has been priced, i.e. all its trades carry the same trade_id.
+    """
+    trade_ids = {t.trade_id for t in trade_set}
+    return len(trade_ids) == 1 and (trade_set[0].trade_id or 0) > 0
+
+
+def summarize_trade_group(trade_set) -> dict:
+    """
+    Columns of a trade_group row for a trade set: direction, entry/exit VWAP and quantities, PnL, PnL % of the
+    entry value (as TradeService.group_trades), open/close times and status. An open set has no trade_id, PnL
+    or close time; its commission is the sum over its fills so far.
+    """
+    trades = sorted(trade_set, key=lambda x: (x.trade_time, x.created_at))
+    entries = [t for t in trades if t.market_action and t.market_action.startswith("ENTRY")]
+    exits = [t for t in trades if t.market_action and t.market_action.startswith("EXIT")]
+    entry_quantity = sum(t.quantity or 0 for t in entries)
+    exit_quantity = sum(t.quantity or 0 for t in exits)
+    entry_value = sum((t.avg_price or 0) * (t.quantity or 0) for t in entries)
+    exit_value = sum((t.avg_price or 0) * (t.quantity or 0) for t in exits)
+    actions = [t.market_action for t in entries + exits]
+    closed = is_closed_trade_group(trades)
+    last = trades[-1]
+    values = {"trade_id": last.trade_id if closed else None, "account_id": last.account_id,
+              "contract_id": last.contract_id, "direction": actions[0].split("_", 1)[1] if actions else None,
+              "status": TRADE_GROUP_CLOSED if closed else TRADE_GROUP_OPEN,
+              "entry_quantity": entry_quantity, "exit_quantity": exit_quantity,
+              "entry_price": round(entry_value / entry_quantity, 6) if entry_quantity else None,
+              "exit_price": round(exit_value / exit_quantity, 6) if exit_quantity else None,
+              "total_pnl": None, "total_pnl_percent": None,
+              "total_commission": round(sum(t.commission or 0 for t in trades), 2), "trade_count": len(trades),
+              "open_time": trades[0].trade_time, "close_time": None}
+    if closed:
+        values["total_pnl"] = last.total_pnl
+        values["total_commission"] = last.total_commission
+        values["total_pnl_percent"] = round((last.total_pnl or 0) / entry_value * 100, 2) if entry_value else 0
+        values["close_time"] = last.trade_time
+    return values
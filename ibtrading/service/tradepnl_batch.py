@@ -0,0 +1,176 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import numpy as np
+import pandas as pd
+
+from ibtrading.utils import uuidutil, loggerutil
+
+logger = loggerutil.get_logger(__name__)
+
+FRAME_COLUMNS = ["market_action", "avg_price", "quantity", "commission", "trade_time", "created_at"]
+
+
+def calculate_pnl_batch(trades, last_set_only=False):
+    """
+    Columnar equivalent of tradepnl.calculate_pnl for a whole contract history.
+    Segments the trades into trade sets and stamps total_pnl, total_commission and trade_id on every
+    member of a set with matching entry/exit quantities. Returns the same list of trade sets.
+    """
+    if len(trades) < 2:
+        return []
+    trades = sorted(trades, key=lambda x: (x.trade_time, x.created_at))
+    n = len(trades)
+    index = {}
+    codes = np.fromiter((index.setdefault(t.market_action, len(index)) for t in trades), dtype=np.int64, count=n)
+    starts, ends, valid, pnl, commission = _calculate_sets(
+        codes, list(index),
+        np.fromiter((t.avg_price for t in trades), dtype=np.float64, count=n),
+        np.fromiter((t.quantity for t in trades), dtype=np.float64, count=n),
+        np.fromiter((t.commission or 0.0 for t in trades), dtype=np.float64, count=n),
+        last_set_only=last_set_only)
+    _trades = []
+    for start, end, is_valid, total_pnl, total_commission in zip(starts.tolist(), ends.tolist(), valid.tolist(),
+                                                                  pnl.tolist(), commission.tolist()):
+        if not is_valid:
+            _trades.append([])
+            continue
+        total_pnl = round(total_pnl, 2)
+        total_commission = round(total_commission, 2)
+        trade_id = uuidutil.generate_sortable_int_uuid()
+        _trade_set = trades[start:end]
+        for trade in _trade_set:
+            trade.total_pnl = total_pnl
+            trade.total_commission = total_commission
+            trade.trade_id = trade_id
+        _trades.append(_trade_set)
+
+    if len(_trades) == 0:
+        logger.debug("No trades to process.")
+        return []
+    return _trades
+
+
+def calculate_pnl_frame(frame: pd.DataFrame, last_set_only=False) -> pd.DataFrame:
+    """
+    Calculate trade set PnL over a DataFrame holding one contract's trades (see FRAME_COLUMNS).
+    Returns the frame sorted by (trade_time, created_at) with set_no, total_pnl and total_commission
+    columns added. Rows outside a priced trade set get set_no -1 and NaN totals.
+    """
+    frame = frame.sort_values(["trade_time", "created_at"], kind="stable").reset_index(drop=True)
+    n = len(frame)
+    set_no = np.full(n, -1, dtype=np.int64)
+    total_pnl = np.full(n, np.nan)
+    total_commission = np.full(n, np.nan)
+    if n >= 2:
+        codes, uniques = pd.factorize(frame["market_action"], use_na_sentinel=False)
+        starts, ends, valid, pnl, commission = _calculate_sets(
+            codes, [a if isinstance(a, str) else None for a in uniques],
+            frame["avg_price"].to_numpy(dtype=np.float64),
+            frame["quantity"].to_numpy(dtype=np.float64),
+            frame["commission"].fillna(0.0).to_numpy(dtype=np.float64),
+            last_set_only=last_set_only)
+        sets = np.flatnonzero(valid)
+        lengths = ends[sets] - starts[sets]
+        rows = np.repeat(starts[sets] - np.cumsum(np.concatenate(([0], lengths[:-1]))), lengths) + np.arange(
+            lengths.sum())
+        set_no[rows] = np.repeat(sets, lengths)
+        total_pnl[rows] = np.repeat([round(p, 2) for p in pnl[sets].tolist()], lengths)
+        total_commission[rows] = np.repeat([round(c, 2) for c in commission[sets].tolist()], lengths)
+    return frame.assign(set_no=set_no, total_pnl=total_pnl, total_commission=total_commission)
+
+
+def _action_flags(codes: np.ndarray, actions: list):
+    """
+    Per-row boolean flags from factorized market actions, computed once per distinct action.
+    """
+    flags = {
+        "none": np.array([a is None for a in actions], dtype=bool),
+        "entry": np.array([a is not None and a.startswith("ENTRY") for a in actions], dtype=bool),
+        "exit": np.array([a is not None and a.startswith("EXIT") for a in actions], dtype=bool),
+        "long": np.array([a is not None and "LONG" in a for a in actions], dtype=bool),
+        "short": np.array([a is not None and "SHORT" in a for a in actions], dtype=bool),
+        "entry_long": np.array([a == "ENTRY_LONG" for a in actions], dtype=bool),
+        "entry_short": np.array([a == "ENTRY_SHORT" for a in actions], dtype=bool),
+    }
+    return {k: v[codes] for k, v in flags.items()}
+
+
+def _next_index(mask: np.ndarray) -> np.ndarray:
+    """
+    For every row i, the smallest k >= i where mask is set, or len(mask) if there is none.
+    """
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    return np.minimum.accumulate(idx[::-1])[::-1]
+
+
+def _calculate_sets(codes, actions, avg_price, quantity, commission, last_set_only=False):
+    """
+    Segment sorted trades the way tradepnl.calculate_pnl does and total each set that would be priced.
+    codes/actions are the factorized market actions. Returns arrays (start, end, valid, total_pnl,
+    total_commission) with one entry per trade set, in order; totals are not rounded.
+    """
+    n = len(codes)
+    f = _action_flags(codes, actions)
+    none, entry, exit_ = f["none"], f["entry"], f["exit"]
+
+    # Hard boundaries: a missing action drops the set, the row after it starts a new one, and an entry
+    # following an exit closes the previous set.
+    reset_none = none[1:]
+    reset_after_none = ~none[1:] & none[:-1]
+    close = ~none[1:] & ~none[:-1] & entry[1:] & exit_[:-1]
+    starts = np.concatenate(([0], np.flatnonzero(reset_none | reset_after_none | close) + 1))
+    ends = np.append(starts[1:], n)
+    priced = np.zeros(len(starts), dtype=bool)
+    if not last_set_only:
+        priced[:-1] = close[starts[1:] - 1]
+    priced[-1] = not none[starts[-1]]  # A trailing missing action leaves nothing to price
+    segments = np.flatnonzero(priced)
+
+    # Soft resets: a set that already holds both LONG and SHORT actions is emptied before the next append.
+    eff_starts = starts.copy()
+    longs = np.add.reduceat(f["long"].astype(np.int64), starts)
+    shorts = np.add.reduceat(f["short"].astype(np.int64), starts)
+    mixed = np.flatnonzero(priced & (longs > 0) & (shorts > 0))
+    if len(mixed):
+        next_long, next_short = _next_index(f["long"]), _next_index(f["short"])
+        for k in mixed:
+            r, e = starts[k], ends[k]
+            while True:
+                j = max(next_long[r], next_short[r])
+                if j + 1 >= e:
+                    break
+                r = j + 1
+            eff_starts[k] = r
+
+    if len(segments) == 0:
+        empty = np.zeros(0)
+        return empty.astype(np.int64), empty.astype(np.int64), empty.astype(bool), empty, empty
+
+    # Trade sets are disjoint and ordered, so summing over the compacted member rows needs one reduceat.
+    set_starts, set_ends = eff_starts[segments], ends[segments]
+    marker = np.zeros(n + 1, dtype=np.int64)
+    np.add.at(marker, set_starts, 1)
+    np.add.at(marker, set_ends, -1)
+    rows = np.cumsum(marker[:n]) > 0
+    offsets = np.concatenate(([0], np.cumsum(set_ends - set_starts)[:-1]))
+
+    value = avg_price * quantity
+
+    def _sum(values):
+        return np.add.reduceat(values[rows], offsets)
+
+    entry_value = _sum(np.where(entry, value, 0.0))
+    entry_quantity = _sum(np.where(entry, quantity, 0.0))
+    exit_value = _sum(np.where(exit_, value, 0.0))
+    exit_quantity = _sum(np.where(exit_, quantity, 0.0))
+    total_commission = _sum(commission)
+
+    pnl = np.where(f["entry_long"][set_starts], exit_value - entry_value,
+                   np.where(f["entry_short"][set_starts], entry_value - exit_value, 0.0))
+    valid = (entry_quantity != 0) & (exit_quantity != 0) & (entry_quantity == exit_quantity)
+
+    return set_starts, set_ends, valid, pnl, total_commission
@@ -22,7 +22,7 @@ class UserService:
         return self.user_repo.update_user(user)
 
     def delete_user(self, user: UserModel) -> bool:
-        return self.user_repo.delete(user)
+        return self.user_repo.delete_user(user)
 
     def list_users(self) -> list[UserModel]:
         return self.user_repo.list_all()
@@ -0,0 +1,177 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import hmac
+import threading
+import time
+from typing import List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ibtrading import mapper
+from ibtrading.domain import WebhookPayload, ErrorCode
+from ibtrading.domain.webhook import WebhookResponse
+from ibtrading.repo.order_repo import OrderRepo
+from ibtrading.repo.webhook_queue import WebhookQueue
+from ibtrading.service.auth_service import AuthService
+from ibtrading.service.service_base import ServiceBase
+from ibtrading.settings import Settings
+from ibtrading.utils import loggerutil, metricsutil
+from ibtrading.validator.webhook_validator import validate_webhook_request
+
+INGEST_MODE_SYNC = "sync"
+INGEST_MODE_QUEUE = "queue"
+
+PURGE_INTERVAL_SECONDS = 3600
+
+WEBHOOKS_RECEIVED = metricsutil.counter("ibtrading_webhooks_received_total", "Webhooks received by outcome",
+                                        ("mode", "result"))
+WEBHOOKS_DRAINED = metricsutil.counter("ibtrading_webhook_queue_drained_total",
+                                       "Queued webhooks saved, released back to the queue or dead-lettered",
+                                       ("result",))
+
+
+class WebhookService(ServiceBase):
+    """
+    Receives TradingView webhooks. In sync mode a payload is saved before the request is acknowledged.
+    In queue mode it is appended to a local WebhookQueue and acknowledged at once; a pool of worker
+    threads drains the queue into the database in batches.
+    """
+
+    def __init__(self, order_repo: OrderRepo, auth_service: AuthService = None, mode: str = None,
+                 queue: WebhookQueue = None):
+        super().__init__(auth_service=auth_service)
+        self.order_repo = order_repo
+        self.mode = (mode or Settings.WEBHOOK_INGEST_MODE).lower()
+        self.queue = queue
+        if self.mode == INGEST_MODE_QUEUE and self.queue is None:
+            self.queue = WebhookQueue(Settings.WEBHOOK_QUEUE_PATH,
+                                      max_attempts=Settings.WEBHOOK_QUEUE_MAX_ATTEMPTS)
+        self.batch_size = Settings.WEBHOOK_QUEUE_BATCH_SIZE
+        self.logger = loggerutil.get_logger(self.__class__.__name__)
+        self._workers: List[threading.Thread] = []
+        self._stopped = threading.Event()
+        self._wakeup = threading.Event()
+
+    def is_valid_api_key(self, api_key: str) -> bool:
+        if Settings.WEBHOOK_SECRET:
+            return hmac.compare_digest(api_key or "", Settings.WEBHOOK_SECRET)
+        return self.auth_service.get_api_key(api_key) is not None
+
+    async def receive(self, api_key: str, req: WebhookPayload) -> WebhookResponse:
+        if not self.is_valid_api_key(api_key):
+            WEBHOOKS_RECEIVED.inc((self.mode, "unauthorized"))
+            return WebhookResponse(error=True, code=ErrorCode.UNAUTHORIZED, message="Invalid API Key")
+        try:
+            validate_webhook_request(req)
+            req = mapper.populate_webhook_payload(req)
+        except (ValueError, AttributeError) as e:
+            WEBHOOKS_RECEIVED.inc((self.mode, "invalid"))
+            return WebhookResponse(error=True, code=ErrorCode.INVALID_REQUEST, message=str(e))
+
+        if self.mode == INGEST_MODE_QUEUE:
+            # Keyed on the webhook_log fingerprint, so a retry is dropped here as it would be on insert
+            if not self.queue.put(req.fingerprint, req.model_dump(mode="json", exclude_none=True)):
+                self.logger.info(f"Duplicate webhook dropped: {req.fingerprint}")
+                WEBHOOKS_RECEIVED.inc((self.mode, "duplicate"))
+                return WebhookResponse(message="Duplicate webhook ignored")
+            self._wakeup.set()
+            WEBHOOKS_RECEIVED.inc((self.mode, "queued"))
+            return WebhookResponse(message="Webhook queued")
+
+        saved, duplicate = await run_in_threadpool(self.order_repo.save_webhook_payload, req)
+        if saved is None:
+            WEBHOOKS_RECEIVED.inc((self.mode, "error"))
+            return WebhookResponse(error=True, code=ErrorCode.INTERNAL_ERROR, message="Error saving webhook")
+        if duplicate:
+            WEBHOOKS_RECEIVED.inc((self.mode, "duplicate"))
+            return WebhookResponse(message="Duplicate webhook ignored")
+        WEBHOOKS_RECEIVED.inc((self.mode, "saved"))
+        return WebhookResponse(message="Webhook received")
+
+    def start(self, workers: int = None):
+        """
+        Start the queue workers (queue mode only), first returning entries left claimed by a previous run.
+        """
+        if self.mode != INGEST_MODE_QUEUE or self._workers:
+            return
+        if Settings.STARTUP_TASKS:
+            # Other worker processes may share the queue, so only the process running startup tasks recovers
+            recovered = self.queue.recover()
+            if recovered:
+                self.logger.info(f"Recovered {recovered} unfinished webhooks.")
+        self._stopped.clear()
+        for i in range(workers or Settings.WEBHOOK_QUEUE_WORKERS):
+            worker = threading.Thread(target=self._run_worker, name=f"webhook-worker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        self.logger.info(f"Started {len(self._workers)} webhook queue workers.")
+
+    def stop(self, timeout: float = 10):
+        self._stopped.set()
+        self._wakeup.set()
+        for worker in self._workers:
+            worker.join(timeout=timeout)
+        self._workers = []
+
+    def drain(self) -> int:
+        """
+        Save one batch from the queue. Returns the number of payloads saved.
+        If the batch fails, its payloads are saved one at a time so that one bad payload does not hold back
+        the others; payloads that still fail are released for a later attempt (see WebhookQueue.release).
+        """
+        batch = self.queue.claim(self.batch_size)
+        if not batch:
+            return 0
+        payloads, invalid = {}, []
+        for id, payload in batch:
+            try:
+                payloads[id] = WebhookPayload(**payload)
+            except ValueError as e:
+                self.logger.error(f"Invalid queued webhook {id}: {e}")
+                invalid.append(id)
+        if invalid:
+            self.queue.dead_letter(invalid)
+            WEBHOOKS_DRAINED.inc(("dead_lettered",), len(invalid))
+
+        saved_ids, failed_ids = [], []
+        if payloads and self._save_queued(list(payloads.values())):
+            saved_ids = list(payloads)
+        elif len(payloads) > 1:
+            for id, payload in payloads.items():
+                (saved_ids if self._save_queued([payload]) else failed_ids).append(id)
+        else:
+            failed_ids = list(payloads)
+
+        if saved_ids:
+            self.queue.ack(saved_ids)
+            WEBHOOKS_DRAINED.inc(("saved",), len(saved_ids))
+        if failed_ids:
+            dead_lettered = self.queue.release(failed_ids)
+            WEBHOOKS_DRAINED.inc(("released",), len(failed_ids) - dead_lettered)
+            if dead_lettered:
+                WEBHOOKS_DRAINED.inc(("dead_lettered",), dead_lettered)
+        return len(saved_ids)
+
+    def _save_queued(self, payloads: List[WebhookPayload]) -> bool:
+        try:
+            return bool(self.order_repo.save_webhook_payloads(payloads))
+        except Exception as e:
+            self.logger.exception(f"Error saving queued webhooks: {e}")
+            return False
+
+    def _run_worker(self):
+        last_purge: Optional[float] = None
+        while not self._stopped.is_set():
+            try:
+                if self.drain() == 0:
+                    self._wakeup.wait(timeout=1)
+                    self._wakeup.clear()
+                if last_purge is None or time.time() - last_purge > PURGE_INTERVAL_SECONDS:
+                    self.queue.purge()
+                    last_purge = time.time()
+            except Exception as e:
+                self.logger.exception(f"Webhook queue worker error: {e}")
+                self._stopped.wait(timeout=1)
@@ -18,6 +18,10 @@ class Settings:
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
 
     WEBHOOK_SECRET: str = os.getenv("WEBHOOK_SECRET", "")
+    WEBHOOK_INGEST_MODE: str = os.getenv("WEBHOOK_INGEST_MODE", "sync")  # sync, queue
+    WEBHOOK_QUEUE_WORKERS: int = int(os.getenv("WEBHOOK_QUEUE_WORKERS", 2))
+    WEBHOOK_QUEUE_BATCH_SIZE: int = int(os.getenv("WEBHOOK_QUEUE_BATCH_SIZE", 50))
+    WEBHOOK_QUEUE_MAX_ATTEMPTS: int = int(os.getenv("WEBHOOK_QUEUE_MAX_ATTEMPTS", 5))  # Then dead-lettered
 
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
@@ -31,6 +35,33 @@ class Settings:
     NGROK_URL: str = os.getenv("NGROK_URL", "grossly-prepared-cobra.ngrok-free.app")
     HOME_DIR = os.getenv("HOME")
     DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{HOME_DIR}/algotrade_data/algotrade.db")
+    WEBHOOK_QUEUE_PATH: str = os.getenv("WEBHOOK_QUEUE_PATH", f"{HOME_DIR}/algotrade_data/webhook_queue.db")
+    DATABASE_ASYNC: bool = os.getenv("DATABASE_ASYNC", "True").lower() == "true"  # Async sessions for API reads
+    DATABASE_POOL_SIZE: int = int(os.getenv("DATABASE_POOL_SIZE", 20))  # Per process
+    DATABASE_MAX_OVERFLOW: int = int(os.getenv("DATABASE_MAX_OVERFLOW", 30))  # Per process
+
+    API_WORKERS: int = int(os.getenv("API_WORKERS", 1))
+    # Table migration, user seeding and webhook queue recovery. Turned off in the worker processes of
+    # a multi-worker server, where main.py runs them once before starting the workers.
+    STARTUP_TASKS: bool = os.getenv("STARTUP_TASKS", "True").lower() == "true"
+
+    AUTH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", 60))  # Cached principal per token
+    AUTH_CACHE_SIZE: int = int(os.getenv("AUTH_CACHE_SIZE", 1024))
+    AUTH_LOGIN_WORKERS: int = int(os.getenv("AUTH_LOGIN_WORKERS", 2))  # Threads verifying passwords
+    AUTH_LOGIN_MAX_PENDING: int = int(os.getenv("AUTH_LOGIN_MAX_PENDING", 16))  # Logins queued or running
+    AUTH_LOGIN_RATE_LIMIT: int = int(os.getenv("AUTH_LOGIN_RATE_LIMIT", 10))  # Attempts per username per window
+    AUTH_LOGIN_RATE_WINDOW_SECONDS: int = int(os.getenv("AUTH_LOGIN_RATE_WINDOW_SECONDS", 60))
+    SESSION_BACKEND: str = os.getenv("SESSION_BACKEND", "memory")  # memory, db (required for multiple workers)
+    SESSION_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", 300))
+
+    SQL_PROFILER_ENABLED: bool = os.getenv("SQL_PROFILER_ENABLED", "False").lower() == "true"
+    SQL_SLOW_QUERY_MS: float = float(os.getenv("SQL_SLOW_QUERY_MS", 100))  # Logged to the ibtrading.sql.slow logger
+    SQL_N_PLUS_ONE_THRESHOLD: int = int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", 10))  # Same SELECT within one request
+    SQL_PROFILER_MAX_STATEMENTS: int = int(os.getenv("SQL_PROFILER_MAX_STATEMENTS", 1000))
+
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "True").lower() == "true"  # /metrics and instrumentation
+
+    TRADE_LEDGER_WARM_DAYS: int = int(os.getenv("TRADE_LEDGER_WARM_DAYS", 7))
 
     TIMEZONE_STR = os.getenv("TIMEZONE", "America/New_York")
     TIMEZONE = pytz.timezone(TIMEZONE_STR)
@@ -0,0 +1,35 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+CURSOR_SEPARATOR = "|"
+
+
+def encode_cursor(created_at: datetime, id: int) -> Optional[str]:
+    """
+    Encode a (created_at, id) keyset position into an opaque url-safe cursor.
+    """
+    if created_at is None or id is None:
+        return None
+    raw = f"{created_at.isoformat()}{CURSOR_SEPARATOR}{id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """
+    Decode a cursor produced by encode_cursor. Returns None for empty cursors.
+    :raises ValueError: if the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, id = raw.rsplit(CURSOR_SEPARATOR, 1)
+        return datetime.fromisoformat(created_at), int(id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
@@ -4,11 +4,9 @@
 -- Created on: 30/01/2025
 """
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache
 from typing import Optional
 
-import pandas as pd
-from pandas.tseries.holiday import USFederalHolidayCalendar
-
 from ibtrading.settings import Settings
 
 WEEKDAY2NUM = {
@@ -130,12 +128,25 @@ def next_weekday_v0(reference_date: datetime = None, target_weekday: str = None,
     return future_date + timedelta(days=days_ahead)
 
 
+@lru_cache(maxsize=1)
+def _us_federal_holidays():
+    """
+    US federal holiday calendar and its holidays, built once. pandas is imported here rather than at module
+    load since most importers of this module never need it.
+    """
+    from pandas.tseries.holiday import USFederalHolidayCalendar
+    calendar = USFederalHolidayCalendar()
+    return calendar, calendar.holidays()
+
+
 def next_business_day(date, tz=None):
+    import pandas as pd
+    calendar, holidays = _us_federal_holidays()
     date = pd.to_datetime(date)
-    if date.weekday() < 5 and date not in USFederalHolidayCalendar().holidays():
+    if date.weekday() < 5 and date not in holidays:
         return date
     else:
-        us_business_day = pd.offsets.CustomBusinessDay(calendar=USFederalHolidayCalendar())
+        us_business_day = pd.offsets.CustomBusinessDay(calendar=calendar)
         return date + us_business_day
 
 
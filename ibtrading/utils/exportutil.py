@@ -0,0 +1,159 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import csv
+import enum
+import importlib.util
+import io
+from datetime import date, datetime
+from typing import Iterable, Iterator, List, Tuple
+
+FORMAT_CSV = "csv"
+FORMAT_ARROW = "arrow"
+FORMAT_PARQUET = "parquet"
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    FORMAT_CSV: ("text/csv", "csv"),
+    FORMAT_ARROW: ("application/vnd.apache.arrow.stream", "arrow"),
+    FORMAT_PARQUET: ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def is_supported(fmt: str) -> bool:
+    """
+    CSV is always available; Arrow and Parquet need the optional pyarrow package.
+    """
+    if fmt not in EXPORT_FORMATS:
+        return False
+    return fmt == FORMAT_CSV or importlib.util.find_spec("pyarrow") is not None
+
+
+def encode(fmt: str, columns: List[Tuple[str, object]], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """
+    Encode row batches as a stream of byte chunks, about one chunk per batch.
+    :param columns: (name, SQLAlchemy type) per column, used for the header/schema
+    """
+    batches = _enum_values(columns, batches)
+    if fmt == FORMAT_CSV:
+        return csv_chunks([name for name, _ in columns], batches)
+    if fmt == FORMAT_ARROW:
+        return arrow_chunks(columns, batches)
+    if fmt == FORMAT_PARQUET:
+        return parquet_chunks(columns, batches)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def _enum_values(columns: List[Tuple[str, object]], batches: Iterable[List[tuple]]) -> Iterable[List[tuple]]:
+    """
+    Replace the members in Enum columns (status, direction, ...) by their values, e.g. "Filled" rather than
+    "OrderStatus.Filled".
+    """
+    indices = [i for i, (_, type_) in enumerate(columns) if getattr(type_, "enum_class", None) is not None]
+    if not indices:
+        return batches
+    return ([tuple(v.value if i in indices and isinstance(v, enum.Enum) else v for i, v in enumerate(row))
+             for row in batch] for batch in batches)
+
+
+def csv_chunks(names: List[str], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(names)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file collecting what pyarrow writes, handed out chunk by chunk with drain().
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def arrow_schema(columns: List[Tuple[str, object]]):
+    import pyarrow as pa
+    return pa.schema([(name, _arrow_type(type_)) for name, type_ in columns])
+
+
+def _arrow_type(type_):
+    import pyarrow as pa
+    try:
+        python_type = type_.python_type
+    except NotImplementedError:
+        return pa.string()
+    if python_type is bool:
+        return pa.bool_()
+    if python_type is int:
+        return pa.int64()
+    if python_type is float:
+        return pa.float64()
+    if python_type is datetime:
+        return pa.timestamp("us")
+    if python_type is date:
+        return pa.date32()
+    return pa.string()
+
+
+def _record_batch(schema, batch: List[tuple]):
+    import pyarrow as pa
+    arrays = []
+    for field, values in zip(schema, zip(*batch)):
+        if pa.types.is_string(field.type):
+            # SQLite does not enforce column types; keep text columns text
+            values = [v if v is None or isinstance(v, str) else str(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def arrow_chunks(columns: List[Tuple[str, object]], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for batch in batches:
+            if batch:
+                writer.write_batch(_record_batch(schema, batch))
+                yield sink.drain()
+    yield sink.drain()  # Schema (if nothing was written) and end-of-stream marker
+
+
+def parquet_chunks(columns: List[Tuple[str, object]], batches: Iterable[List[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    schema = arrow_schema(columns)
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            if batch:
+                # One row group per batch
+                writer.write_table(pa.Table.from_batches([_record_batch(schema, batch)]))
+                yield sink.drain()
+    yield sink.drain()  # Footer
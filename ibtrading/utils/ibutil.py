@@ -3,6 +3,7 @@
 -- Email: asokpant@gmail.com
 -- Created on: 27/02/2025
 """
+from functools import lru_cache
 from typing import Optional
 
 from ib_async import Contract
@@ -51,9 +52,9 @@ def generate_vt_symbol(contract: Contract) -> str:
                                  contract.exchange)
 
 
+@lru_cache(maxsize=4096)  # Called for every mapped contract; the set of contracts is small
 def generate_vt_symbol_v1(symbol: str, sec_type: str, last_trade_date_or_contract_month: str, strike: float,
                           multiplier: str, right: str, currency: str, exchange: str) -> str:
-    print( symbol, sec_type, last_trade_date_or_contract_month, strike, multiplier, right, currency, exchange)
     symbol: str = symbol
     if sec_type in ["FUT", "OPT", "FOP"]:
         symbol += JOIN_SYMBOL + last_trade_date_or_contract_month
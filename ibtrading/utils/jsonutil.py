@@ -0,0 +1,41 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import dataclasses
+import enum
+import json
+from datetime import date, datetime
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Optional; the standard library encoder produces the same JSON, slower
+    orjson = None
+
+
+def _default(obj):
+    """
+    Types orjson does not encode natively. Dataclasses, enums and datetimes are native to orjson and only
+    reach here with the standard library encoder.
+    """
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(obj) -> bytes:
+    """
+    Encode obj (dicts/lists of dataclasses, enums, datetimes and pydantic models) to compact JSON bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,399 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import bisect
+import functools
+import inspect
+import threading
+import time
+import types
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+from ibtrading.settings import Settings
+from ibtrading.utils import loggerutil
+
+logger = loggerutil.get_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _histogram_lines(name: str, labelnames: Labels, labels: Labels, buckets: Sequence[float], counts: Sequence[int],
+                     total: float) -> Iterable[str]:
+    """
+    Samples of one histogram series; counts holds the observations per bucket (not cumulative), then above the last.
+    """
+    names = labelnames + ("le",)
+    cumulative = 0
+    for bound, count in zip(tuple(buckets) + (float("inf"),), counts):
+        cumulative += count
+        yield f"{name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}"
+    yield f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(total)}"
+    yield f"{name}_count{_format_labels(labelnames, labels)} {cumulative}"
+
+
+class Counter:
+    """
+    Monotonic counter per label values, e.g. requests.inc(("GET", "/api/hc", "200")).
+    """
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Labels = (), amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def collect(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    """
+    Value per label values that may go up and down, e.g. requests in progress.
+    """
+    type = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1):
+        self.inc(labels, -amount)
+
+    def set(self, labels: Labels, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram:
+    """
+    Bucketed observations per label values, rendered with cumulative le buckets, _sum and _count.
+    """
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Labels, list] = {}  # labels -> [counts per bucket and +Inf, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][i] += 1
+            entry[1] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        with self._lock:
+            entry = self._values.get(labels)
+            return sum(entry[0]) if entry else 0
+
+    def collect(self) -> Iterable[str]:
+        with self._lock:
+            values = [(labels, list(counts), total) for labels, (counts, total) in self._values.items()]
+        for labels, counts, total in values:
+            yield from _histogram_lines(self.name, self.labelnames, labels, self.buckets, counts, total)
+
+
+class CallbackGauge:
+    """
+    Value read at scrape time, e.g. from a cache's stats(). fn returns a number, or a dict of label values to numbers.
+    type is "counter" for values that only grow, such as cache hits.
+    """
+
+    def __init__(self, name: str, help: str, fn: Callable[[], Union[float, Dict[Labels, float]]],
+                 labelnames: Sequence[str] = (), type: str = "gauge"):
+        self.type = type
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+
+    def collect(self) -> Iterable[str]:
+        try:
+            values = self.fn()
+        except Exception as e:
+            logger.exception(f"Error reading gauge {self.name}: {e}")
+            return
+        if not isinstance(values, dict):
+            values = {(): values}
+        for labels, value in values.items():
+            if value is not None:
+                yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        """
+        Add a metric, or return the one already registered under its name (modules may be imported twice).
+        """
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def get(self, name: str):
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {_escape(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help, labelnames))
+
+
+def gauge(name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, help, labelnames))
+
+
+def histogram(name: str, help: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labelnames, buckets))
+
+
+def callback_gauge(name: str, help: str, fn: Callable, labelnames: Sequence[str] = (),
+                   type: str = "gauge") -> CallbackGauge:
+    return REGISTRY.register(CallbackGauge(name, help, fn, labelnames, type=type))
+
+
+class _Family:
+    """
+    A metric family rendered from data kept elsewhere, see MethodMetrics.
+    """
+
+    def __init__(self, name: str, help: str, type: str, collect: Callable[[], Iterable[str]]):
+        self.name = name
+        self.help = help
+        self.type = type
+        self.collect = collect
+
+
+class _MethodEntry:
+    __slots__ = ("calls", "latency_counts", "latency_sum", "row_counts", "row_sum")
+
+    def __init__(self):
+        self.calls: Dict[str, int] = {}  # per outcome
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.row_counts = [0] * (len(ROW_BUCKETS) + 1)
+        self.row_sum = 0
+
+
+class MethodMetrics:
+    """
+    Calls, latency and row counts of instrumented methods, rendered as <prefix>_calls_total,
+    <prefix>_duration_seconds and <prefix>_rows. The three are kept in one entry per method, so recording a call
+    takes one lock instead of three.
+    """
+    labelnames = ("component", "method")
+
+    def __init__(self, prefix: str, registry: Registry):
+        self.prefix = prefix
+        self._values: Dict[Labels, _MethodEntry] = {}
+        self._lock = threading.Lock()
+        registry.register(_Family(f"{prefix}_calls_total", "Calls of instrumented methods", "counter",
+                                  self._collect_calls))
+        registry.register(_Family(f"{prefix}_duration_seconds", "Latency of instrumented methods", "histogram",
+                                  self._collect_latency))
+        registry.register(_Family(f"{prefix}_rows", "Rows returned by instrumented methods", "histogram",
+                                  self._collect_rows))
+
+    def record(self, labels: Labels, outcome: str, seconds: float, rows: Optional[int] = None):
+        i = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = _MethodEntry()
+            entry.calls[outcome] = entry.calls.get(outcome, 0) + 1
+            entry.latency_counts[i] += 1
+            entry.latency_sum += seconds
+            if rows is not None:
+                entry.row_counts[bisect.bisect_left(ROW_BUCKETS, rows)] += 1
+                entry.row_sum += rows
+
+    def calls(self, labels: Labels, outcome: str = "ok") -> int:
+        with self._lock:
+            entry = self._values.get(labels)
+            return entry.calls.get(outcome, 0) if entry else 0
+
+    def _snapshot(self) -> list:
+        with self._lock:
+            snapshot = []
+            for labels, entry in self._values.items():
+                copy = _MethodEntry()
+                copy.calls = dict(entry.calls)
+                copy.latency_counts = list(entry.latency_counts)
+                copy.latency_sum = entry.latency_sum
+                copy.row_counts = list(entry.row_counts)
+                copy.row_sum = entry.row_sum
+                snapshot.append((labels, copy))
+            return snapshot
+
+    def _collect_calls(self) -> Iterable[str]:
+        names = self.labelnames + ("outcome",)
+        for labels, entry in self._snapshot():
+            for outcome, count in entry.calls.items():
+                yield f"{self.prefix}_calls_total{_format_labels(names, labels + (outcome,))} {count}"
+
+    def _collect_latency(self) -> Iterable[str]:
+        for labels, entry in self._snapshot():
+            yield from _histogram_lines(f"{self.prefix}_duration_seconds", self.labelnames, labels, LATENCY_BUCKETS,
+                                        entry.latency_counts, entry.latency_sum)
+
+    def _collect_rows(self) -> Iterable[str]:
+        for labels, entry in self._snapshot():
+            if any(entry.row_counts):  # Methods returning no row collection have no rows series
+                yield from _histogram_lines(f"{self.prefix}_rows", self.labelnames, labels, ROW_BUCKETS,
+                                            entry.row_counts, entry.row_sum)
+
+
+METHODS = MethodMetrics("ibtrading_method", REGISTRY)
+
+
+def _row_count(result) -> Optional[int]:
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, tuple) and result and isinstance(result[0], list):  # (rows, pagination)
+        return len(result[0])
+    rows = getattr(result, "trades", None)  # TradeRowPage
+    if isinstance(rows, list):
+        return len(rows)
+    return None
+
+
+def _record(labels: Labels, outcome: str, start: float, rows: Optional[int] = None):
+    METHODS.record(labels, outcome, time.perf_counter() - start, rows)
+
+
+def _outcome(result) -> str:
+    # Repos log and swallow their errors, returning False from save methods
+    return "failed" if result is False else "ok"
+
+
+def _timed_generator(gen, labels: Labels, start: float):
+    """
+    Times a returned generator until it is exhausted or closed; rows count the items (or batch sizes) yielded.
+    """
+    rows = 0
+    outcome = "error"
+    try:
+        for item in gen:
+            rows += len(item) if isinstance(item, list) else 1
+            yield item
+        outcome = "ok"
+    except GeneratorExit:
+        outcome = "ok"
+        raise
+    finally:
+        _record(labels, outcome, start, rows)
+
+
+def timed(component: str, name: str = None):
+    """
+    Record call counts, latency and row counts of a function or coroutine function under component and name.
+    """
+
+    def decorate(fn):
+        labels = (component, name or fn.__name__)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    result = await fn(*args, **kwargs)
+                except BaseException:
+                    _record(labels, "error", start)
+                    raise
+                _record(labels, _outcome(result), start, _row_count(result))
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                _record(labels, "error", start)
+                raise
+            if isinstance(result, types.GeneratorType):
+                return _timed_generator(result, labels, start)
+            _record(labels, _outcome(result), start, _row_count(result))
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def instrument(cls):
+    """
+    Class decorator applying timed to every public method defined on the class, labelled with the class name.
+    Does nothing when METRICS_ENABLED is off.
+    """
+    if not Settings.METRICS_ENABLED:
+        return cls
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.isfunction(value) or inspect.isasyncgenfunction(value):
+            continue
+        setattr(cls, attr, timed(cls.__name__)(value))
+    return cls
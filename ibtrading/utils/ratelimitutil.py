@@ -0,0 +1,66 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable
+
+
+class RateLimiter:
+    """
+    Thread-safe sliding-window rate limiter: at most limit calls per key within window seconds.
+    """
+
+    def __init__(self, limit: int, window: float, timer: Callable[[], float] = time.monotonic, max_keys: int = 10000):
+        self.limit = limit
+        self.window = window
+        self.timer = timer
+        self.max_keys = max_keys
+        self._calls: Dict[Hashable, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: Hashable) -> bool:
+        """
+        Record a call for key and return True, or return False (recording nothing) if key is over its limit.
+        """
+        now = self.timer()
+        with self._lock:
+            calls = self._calls.get(key)
+            if calls is None:
+                if len(self._calls) >= self.max_keys:
+                    self._prune(now)
+                calls = self._calls[key] = deque()
+            while calls and calls[0] <= now - self.window:
+                calls.popleft()
+            if len(calls) >= self.limit:
+                return False
+            calls.append(now)
+            return True
+
+    def retry_after(self, key: Hashable) -> float:
+        """
+        Seconds until key may call again, 0 if it may call now.
+        """
+        now = self.timer()
+        with self._lock:
+            calls = self._calls.get(key)
+            if not calls or len(calls) < self.limit:
+                return 0.0
+            return max(0.0, calls[-self.limit] + self.window - now)
+
+    def reset(self, key: Hashable = None):
+        with self._lock:
+            if key is None:
+                self._calls.clear()
+            else:
+                self._calls.pop(key, None)
+
+    def _prune(self, now: float):
+        """
+        Forget keys with no calls left in the window, so one-off keys do not accumulate.
+        """
+        for key in [k for k, calls in self._calls.items() if not calls or calls[-1] <= now - self.window]:
+            del self._calls[key]
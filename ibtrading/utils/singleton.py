@@ -3,6 +3,8 @@
 -- Email: asokpant@gmail.com
 -- Created on: 20/03/2025
 """
+import threading
+
 import nest_asyncio
 
 nest_asyncio.apply()
@@ -21,8 +23,11 @@ def singleton(cls):
 
 class Singleton(type):
     _instances = {}
+    _lock = threading.RLock()
 
     def __call__(cls, *args, **kwargs):
         if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
+            with Singleton._lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
         return cls._instances[cls]
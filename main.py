@@ -19,7 +19,12 @@ nest_asyncio.apply()
 from fastapi import FastAPI
 from pyngrok import ngrok
 
-from ibtrading.api import health_router, auth_router, trade_router, trade_router_v2
+from ibtrading.api import health_router, auth_router, trade_router, trade_router_v2, webhook_router, metrics_router, \
+    admin_router
+from ibtrading.api.metrics_middleware import MetricsMiddleware, SqlProfilerMiddleware
+from ibtrading.repo.order_repo import OrderRepo
+from ibtrading.repo.webhook_queue import WebhookQueue
+from ibtrading.service import helper
 from ibtrading.settings import Settings
 from ibtrading.utils import loggerutil
 
@@ -43,6 +48,26 @@ app.include_router(health_router.router, prefix="")
 app.include_router(auth_router.router, prefix="")
 app.include_router(trade_router.router, prefix="")
 app.include_router(trade_router_v2.router)
+app.include_router(webhook_router.router)
+app.include_router(admin_router.router)
+if Settings.SQL_PROFILER_ENABLED:
+    app.add_middleware(SqlProfilerMiddleware)
+if Settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router.router)
+
+
+@app.on_event("startup")
+async def startup():
+    helper.get_webhook_service().start()
+    helper.get_auth_service().session_store.start_sweeper(Settings.SESSION_SWEEP_INTERVAL_SECONDS)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    helper.get_webhook_service().stop()
+    helper.get_auth_service().session_store.stop_sweeper()
+    await helper.close_async_datasource()
 
 
 def setup_ngrok():
@@ -55,13 +80,43 @@ def setup_ngrok():
         logger.exception(f"Error setting up ngrok: {e}")
 
 
+def prepare_workers(workers: int):
+    """
+    Run the startup tasks (table migration, user seeding, PnL checkpoint back-fill, webhook queue recovery) once
+    in this process, then configure the worker processes to skip them and to split the default connection pool
+    between them.
+    """
+    helper.get_datasource()
+    helper.get_auth_service()
+    OrderRepo(helper.get_datasource()).backfill_pnl_checkpoints()
+    if Settings.WEBHOOK_INGEST_MODE.lower() == "queue":
+        queue = WebhookQueue(Settings.WEBHOOK_QUEUE_PATH, max_attempts=Settings.WEBHOOK_QUEUE_MAX_ATTEMPTS)
+        logger.info(f"Recovered {queue.recover()} unfinished webhooks.")
+        queue.close()
+    helper.get_datasource().engine.dispose()
+
+    os.environ["STARTUP_TASKS"] = "false"
+    # An explicit DATABASE_POOL_SIZE/DATABASE_MAX_OVERFLOW is taken as the size for each worker
+    os.environ.setdefault("DATABASE_POOL_SIZE", str(max(2, Settings.DATABASE_POOL_SIZE // workers)))
+    os.environ.setdefault("DATABASE_MAX_OVERFLOW", str(max(2, Settings.DATABASE_MAX_OVERFLOW // workers)))
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="IB Trading API")
     parser.add_argument('--enable-ngrok', action='store_true', help="Enable ngrok tunnel")
+    parser.add_argument('--workers', type=int, default=Settings.API_WORKERS,
+                        help="Number of worker processes (needs SESSION_BACKEND=db when more than 1)")
     args = parser.parse_args()
     loggerutil.setup_logging()
     if args.enable_ngrok:
         setup_ngrok()
+    if args.workers > 1:
+        if Settings.DEBUG:
+            logger.warning("DEBUG enables reload, which runs a single worker.")
+        if Settings.SESSION_BACKEND.lower() != "db":
+            logger.warning("Sessions are per process with SESSION_BACKEND=memory; tokens will not work across "
+                           "workers.")
+        prepare_workers(args.workers)
 
     uvicorn.run(
         "main:app",
@@ -69,4 +124,5 @@ if __name__ == "__main__":
         port=Settings.TV_WEBHOOK_API_PORT,
         reload=Settings.DEBUG,
         loop="asyncio",
+        workers=args.workers,
     )
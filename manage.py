@@ -0,0 +1,59 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.getcwd())
+
+from ibtrading.utils import loggerutil
+
+logger = loggerutil.get_logger(__name__)
+
+
+def rebuild_pnl_checkpoints(args) -> bool:
+    from ibtrading.service.helper import get_datasource
+    from ibtrading.repo.order_repo import OrderRepo
+
+    return OrderRepo(get_datasource()).rebuild_pnl_checkpoints()
+
+
+def rebuild_trade_groups(args) -> bool:
+    from ibtrading.service.helper import get_datasource
+    from ibtrading.repo.order_repo import OrderRepo
+
+    return OrderRepo(get_datasource()).rebuild_trade_groups()
+
+
+def explain(args) -> bool:
+    from ibtrading.service.helper import get_datasource
+    from ibtrading.repo.query_plans import main_list_statements
+
+    db = get_datasource()
+    for name, statement in main_list_statements().items():
+        print(f"{name}:")
+        for line in db.explain(statement):
+            print(f"  {line}")
+    return True
+
+
+COMMANDS = {
+    "rebuild-pnl-checkpoints": (rebuild_pnl_checkpoints,
+                                "Recompute cumulative PnL checkpoints from persisted trade groups"),
+    "rebuild-trade-groups": (rebuild_trade_groups, "Back-fill the trade_group table from the persisted trades"),
+    "explain": (explain, "Print the query plans of the main list queries"),
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IB Trading management commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        subparsers.add_parser(name, help=help_text)
+    args = parser.parse_args()
+
+    command, _ = COMMANDS[args.command]
+    ok = command(args)
+    sys.exit(0 if ok else 1)
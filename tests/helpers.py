@@ -0,0 +1,35 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from datetime import datetime, timedelta
+
+from ibtrading.domain import ContractData, OrderData, TradeData, OrderDirection, OrderStatus, OrderType
+
+T0 = datetime(2026, 1, 5, 9, 30)
+TRADE_GROUP_COLUMNS = ("trade_id", "contract_id", "direction", "status", "entry_quantity", "exit_quantity",
+                       "entry_price", "exit_price", "total_pnl", "total_pnl_percent", "total_commission", "trade_count",
+                       "open_time", "close_time")
+
+
+def fills(legs, contract_id=1000, symbol="NQ", start=1):
+    """
+    TradeData fills for (market_action, quantity, price) legs, one minute apart.
+    """
+    contract = ContractData(contract_id=contract_id, symbol=symbol, sec_type="FUT", exchange="CME", currency="USD",
+                            vt_symbol=f"{symbol}-{contract_id}")
+    trades = []
+    for i, (market_action, quantity, price) in enumerate(legs):
+        perm_id = contract_id * 1000 + start + i
+        direction = OrderDirection.BUY if market_action in ("ENTRY_LONG", "EXIT_SHORT") else OrderDirection.SELL
+        trade_time = T0 + timedelta(minutes=start + i)
+        order = OrderData(order_id=perm_id, perm_id=perm_id, client_id=1, account_id="DU1", contract_id=contract_id,
+                          order_type=OrderType.MARKET, direction=direction, market_action=market_action,
+                          quantity=quantity, status=OrderStatus.Filled, filled_quantity=quantity,
+                          avg_fill_price=price, is_active=False, order_time=trade_time)
+        trades.append(TradeData(order_id=perm_id, client_id=1, account_id="DU1", contract_id=contract_id,
+                               direction=direction, market_action=market_action, quantity=quantity, price=price,
+                               avg_price=price, trade_time=trade_time, status=OrderStatus.Filled, commission=1.0,
+                               order=order, contract=contract))
+    return trades
@@ -0,0 +1,49 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import threading
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+import anyio
+
+from ibtrading.domain import User, ErrorCode
+from ibtrading.service.auth_service import AuthService
+from ibtrading.service.session_store import InMemorySessionStore
+from ibtrading.utils.cacheutil import TTLCache
+
+
+class TestAuthorizeAsync(TestCase):
+    def setUp(self):
+        self.service = AuthService.__new__(AuthService)  # Without the user database or the singleton
+        self.service.principal_cache = TTLCache(maxsize=10, ttl=60)
+        self.service.session_store = InMemorySessionStore()
+        self.threads = []
+        authorize = self.service.authorize
+
+        def record_thread(token):
+            self.threads.append(threading.get_ident())
+            return authorize(token)
+
+        self.service.authorize = record_thread
+
+    def test_authorizes_off_the_event_loop(self):
+        self.service.session_store.add_session("alice", "t1", datetime.now() + timedelta(hours=1))
+        self.service.principal_cache.set("t1", User(username="alice", role="admin"))
+
+        async def authorize():
+            return threading.get_ident(), await self.service.authorize_async("t1")
+
+        loop_thread, res = anyio.run(authorize)
+        self.assertFalse(res.error)
+        self.assertEqual((res.session.user.username, res.session.role), ("alice", "admin"))
+        self.assertEqual(len(self.threads), 1)
+        self.assertNotEqual(self.threads[0], loop_thread)
+
+    def test_removed_session_is_unauthorized(self):
+        self.service.principal_cache.set("t1", User(username="alice", role="admin"))
+        res = anyio.run(self.service.authorize_async, "t1")
+        self.assertTrue(res.error)
+        self.assertEqual(res.code, ErrorCode.UNAUTHORIZED)
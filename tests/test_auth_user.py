@@ -5,8 +5,8 @@ from ibtrading.service.user_service import UserService
 from ibtrading.service.auth_service import AuthService
 
 # Setup DB and services
-db = DataSource().get_session()
-user_service = UserService(UserRepository(db))
+db = DataSource()
+user_service = UserService(UserRepository(db.get_session))
 auth_service = AuthService()
 
 # 🔐 Create a test user
@@ -0,0 +1,99 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import functools
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ibtrading.model import TradeRecord, TradeGroupRecord
+from ibtrading.model.pnl_checkpoint_record import PnlCheckpointRecord
+from ibtrading.repo.datasource import Base, DataSource
+from ibtrading.repo.order_repo import OrderRepo
+from tests.helpers import fills, TRADE_GROUP_COLUMNS
+
+# (contract_id, symbol, minute, market_action, quantity, price): NQ and ES trade sets interleaved in time
+LEGS = [(1000, "NQ", 1, "ENTRY_LONG", 2, 100.0), (2000, "ES", 2, "ENTRY_SHORT", 1, 50.0),
+        (1000, "NQ", 3, "EXIT_LONG", 2, 104.0), (1000, "NQ", 4, "ENTRY_SHORT", 1, 110.0),
+        (2000, "ES", 5, "EXIT_SHORT", 1, 47.25), (1000, "NQ", 6, "EXIT_SHORT", 1, 107.5),
+        (2000, "ES", 7, "ENTRY_LONG", 1, 48.0), (1000, "NQ", 8, "ENTRY_LONG", 3, 101.0),
+        (2000, "ES", 9, "EXIT_LONG", 1, 49.0)]
+
+
+class TestBulkSaveTrades(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engines = []
+        self.fills = []
+        for contract_id, symbol, minute, market_action, quantity, price in LEGS:
+            self.fills.extend(fills([(market_action, quantity, price)], contract_id=contract_id, symbol=symbol,
+                                     start=minute))
+
+    def tearDown(self):
+        for engine in self.engines:
+            engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _database(self, name):
+        engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, name)}")
+        self.engines.append(engine)
+        Base.metadata.create_all(engine)
+        db = SimpleNamespace(engine=engine, get_session=sessionmaker(bind=engine, autoflush=False))
+        db.insert_ignore = functools.partial(DataSource.insert_ignore, db)
+        return db
+
+    def _snapshot(self, db) -> dict:
+        """
+        Trade PnL, trade groups and checkpoints of a database, without the generated trade_ids: trades are
+        keyed by order_id and grouped by the order_ids sharing a trade_id.
+        """
+        with db.get_session() as sess:
+            trades = sess.query(TradeRecord).order_by(TradeRecord.order_id).all()
+            groups = sess.query(TradeGroupRecord).order_by(TradeGroupRecord.open_time).all()
+            checkpoints = (sess.query(PnlCheckpointRecord)
+                           .order_by(PnlCheckpointRecord.account_id, PnlCheckpointRecord.contract_id).all())
+            members = {}
+            for t in trades:
+                if t.trade_id:
+                    members.setdefault(t.trade_id, []).append(t.order_id)
+            return {
+                "trades": [(t.order_id, t.total_pnl, t.total_commission, t.cumulative_pnl, t.cumulative_commission)
+                           for t in trades],
+                "sets": sorted(members.values()),
+                "groups": [{name: getattr(g, name) for name in TRADE_GROUP_COLUMNS if name != "trade_id"} for g in groups],
+                "checkpoints": [(c.account_id, c.contract_id, c.cumulative_pnl, c.cumulative_commission,
+                                 c.group_count, c.last_trade_time) for c in checkpoints],
+            }
+
+    def test_bulk_save_matches_sequential_saves(self):
+        sequential = self._database("sequential.db")
+        repo = OrderRepo(sequential)
+        for fill in self.fills:
+            self.assertTrue(repo.save_trades([fill]))
+        expected = self._snapshot(sequential)
+        self.assertEqual(len(expected["sets"]), 4)
+        self.assertEqual(len(expected["groups"]), 4)
+        self.assertEqual(expected["checkpoints"][0][1:5], (0, 14.25, 8.0, 4))  # Account-wide running total
+
+        bulk = self._database("bulk.db")
+        self.assertTrue(OrderRepo(bulk).save_trades(self.fills, bulk=True))
+        self.assertEqual(self._snapshot(bulk), expected)
+
+    def test_replayed_batch_changes_nothing(self):
+        db = self._database("replay.db")
+        repo = OrderRepo(db)
+        self.assertTrue(repo.save_trades(self.fills, bulk=True))
+        with db.get_session() as sess:
+            trade_ids = sorted(sess.query(TradeRecord.order_id, TradeRecord.trade_id).all())
+        saved = self._snapshot(db)
+
+        self.assertTrue(repo.save_trades(self.fills, bulk=True))
+        self.assertEqual(self._snapshot(db), saved)
+        with db.get_session() as sess:
+            self.assertEqual(sorted(sess.query(TradeRecord.order_id, TradeRecord.trade_id).all()), trade_ids)
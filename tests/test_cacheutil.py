@@ -0,0 +1,38 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from unittest import TestCase
+
+from ibtrading.utils.cacheutil import TTLCache
+
+
+class TestTTLCache(TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.cache = TTLCache(maxsize=2, ttl=10, timer=lambda: self.now)
+
+    def test_entries_expire_after_ttl(self):
+        self.cache.set("a", 1)
+        self.now = 9.9
+        self.assertEqual(self.cache.get("a"), 1)
+        self.now = 10.0
+        self.assertIsNone(self.cache.get("a"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+        self.cache.set("c", 3)
+        self.assertIsNone(self.cache.get("b"))
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_invalidate_by_value(self):
+        self.cache.set("t1", "alice")
+        self.cache.set("t2", "bob")
+        self.assertEqual(self.cache.invalidate(lambda key, value: value == "alice"), 1)
+        self.assertIsNone(self.cache.get("t1"))
+        self.assertEqual(self.cache.get("t2"), "bob")
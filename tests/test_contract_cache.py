@@ -0,0 +1,88 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+from ib_async import Contract
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ibtrading.domain import ContractData
+from ibtrading.model import ContractRecord
+from ibtrading.repo.contract_cache import ContractCache, contract_key
+from ibtrading.repo.order_repo import OrderRepo
+
+
+def _contract(contract_id=1000, right=None) -> ContractData:
+    return ContractData(contract_id=contract_id, symbol="NQ", sec_type="FUT", exchange="CME", currency="USD",
+                        last_trade_date_or_contract_month="202612", right=right, vt_symbol=f"NQ-202612-{contract_id}")
+
+
+class TestContractCache(TestCase):
+    def test_indexes_and_stats(self):
+        cache = ContractCache()
+        cache.put(_contract())
+        self.assertEqual(cache.get(1000).symbol, "NQ")
+        self.assertEqual(cache.find(contract_key("NQ", "FUT", "CME", "USD", "202612", "")).contract_id, 1000)
+        self.assertEqual(cache.get_by_vt_symbol("NQ-202612-1000").contract_id, 1000)
+        self.assertIsNone(cache.get(1001))
+        self.assertEqual(cache.stats(), {"size": 1, "hits": 3, "misses": 1, "hit_rate": 0.75})
+
+    def test_lookups_return_copies(self):
+        cache = ContractCache()
+        cache.put(_contract())
+        cache.get(1000).symbol = "ES"
+        self.assertEqual(cache.get(1000).symbol, "NQ")
+
+    def test_invalidate_removes_every_index(self):
+        cache = ContractCache()
+        cache.put(_contract(1000))
+        cache.put(_contract(1001, right="C"))
+        cache.invalidate(1000)
+        self.assertIsNone(cache.get_by_vt_symbol("NQ-202612-1000"))
+        self.assertIsNone(cache.find(contract_key("NQ", "FUT", "CME", "USD", "202612")))
+        self.assertEqual(cache.find(contract_key("NQ", "FUT", "CME", "USD", "202612", "C")).contract_id, 1001)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+
+class TestOrderRepoContractCache(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'contracts.db')}")
+        ContractRecord.__table__.create(self.engine)
+        self.db = SimpleNamespace(get_session=sessionmaker(bind=self.engine))
+        self.repo = OrderRepo(self.db)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_saved_contract_is_served_from_cache(self):
+        self.assertTrue(self.repo.save_contact(_contract()))
+        self.engine.dispose()
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql("UPDATE contract SET symbol = 'XX'")  # Only visible on a database read
+        self.assertEqual(self.repo.get_contract_by_id(1000).symbol, "NQ")
+        self.assertIsNotNone(self.repo.get_contract_by_id(1000).created_at)
+        ib_contract = Contract(symbol="NQ", secType="FUT", exchange="CME", currency="USD",
+                               lastTradeDateOrContractMonth="202612")
+        self.assertEqual(self.repo.get_contract(ib_contract).contract_id, 1000)
+        self.assertEqual(self.repo.get_contract_by_vt_symbol("NQ-202612-1000").contract_id, 1000)
+
+    def test_warm_and_read_through(self):
+        self.assertTrue(self.repo.save_contact(_contract()))
+        repo = OrderRepo(self.db)
+        self.assertEqual(repo.warm_contract_cache(), 1)
+        self.assertEqual(repo.get_contract_by_id(1000).symbol, "NQ")
+        self.assertEqual(repo.contract_cache.stats()["hits"], 1)
+
+        repo = OrderRepo(self.db)
+        self.assertEqual(repo.get_contract_by_id(1000).symbol, "NQ")  # Miss, read from the database
+        self.assertEqual(repo.get_contract_by_id(1000).symbol, "NQ")
+        self.assertEqual(repo.contract_cache.stats()["hit_rate"], 0.5)
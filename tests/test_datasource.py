@@ -0,0 +1,42 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import os
+import tempfile
+from unittest import TestCase
+
+from sqlalchemy import create_engine, text
+
+from ibtrading.repo.datasource import DataSource, schema_fingerprint
+
+
+class TestSchemaMigration(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = DataSource.__new__(DataSource)  # Without Settings.DATABASE_URL or startup tasks
+        self.db.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'schema.db')}")
+        self.db.log_query_plans = lambda: None
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_fingerprint_saved_only_after_a_clean_migration(self):
+        # An older trade_group table whose duplicate rows block the unique trade_id index
+        with self.db.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE trade_group (id INTEGER PRIMARY KEY, trade_id INTEGER, '
+                                    'status VARCHAR(8) NOT NULL)'))
+            connection.execute(text("INSERT INTO trade_group (trade_id, status) VALUES (1, 'CLOSED'), (1, 'CLOSED')"))
+
+        self.db.create_or_migrate_tables()
+        self.assertIsNone(self.db.get_schema_fingerprint())
+        with self.db.engine.connect() as connection:
+            columns = [row[1] for row in connection.execute(text("PRAGMA table_info(trade_group)"))]
+        self.assertIn("total_pnl", columns)  # Columns are still added
+
+        with self.db.engine.begin() as connection:
+            connection.execute(text('DELETE FROM trade_group WHERE id = 2'))
+        self.db.create_or_migrate_tables()
+        self.assertEqual(self.db.get_schema_fingerprint(), schema_fingerprint())
@@ -0,0 +1,85 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import csv
+import functools
+import importlib.util
+import io
+import os
+import tempfile
+from datetime import datetime
+from types import SimpleNamespace
+from unittest import TestCase, skipUnless
+
+from sqlalchemy import Integer, Float, String, DateTime, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ibtrading.domain import TradeDataFilter
+from ibtrading.repo.datasource import Base, DataSource
+from ibtrading.repo.order_repo import OrderRepo
+from ibtrading.repo.trade_repo import TradeRepo, trade_export_columns
+from ibtrading.utils import exportutil
+from tests.helpers import fills
+
+COLUMNS = [("id", Integer()), ("avg_price", Float()), ("symbol", String()), ("trade_time", DateTime())]
+BATCHES = [[(1, 100.5, "NQ", datetime(2025, 1, 2, 10, 0)), (2, 101.0, None, None)],
+           [(3, 99.25, 1234, datetime(2025, 1, 2, 11, 0))]]
+
+
+class TestExportUtil(TestCase):
+    def test_csv_has_header_and_every_batch(self):
+        chunks = list(exportutil.encode("csv", COLUMNS, iter(BATCHES)))
+        self.assertEqual(len(chunks), 2)
+        rows = list(csv.reader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+        self.assertEqual(rows[0], ["id", "avg_price", "symbol", "trade_time"])
+        self.assertEqual([r[0] for r in rows[1:]], ["1", "2", "3"])
+
+    def test_unknown_format(self):
+        self.assertFalse(exportutil.is_supported("xml"))
+        self.assertTrue(exportutil.is_supported("csv"))
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_arrow_and_parquet_round_trip(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        arrow = pa.ipc.open_stream(b"".join(exportutil.encode("arrow", COLUMNS, iter(BATCHES)))).read_all()
+        parquet = pq.read_table(io.BytesIO(b"".join(exportutil.encode("parquet", COLUMNS, iter(BATCHES)))))
+        self.assertTrue(arrow.equals(parquet))
+        self.assertEqual(arrow.column("symbol").to_pylist(), ["NQ", None, "1234"])
+        self.assertEqual(arrow.schema.field("trade_time").type, pa.timestamp("us"))
+        empty = pa.ipc.open_stream(b"".join(exportutil.encode("arrow", COLUMNS, iter([])))).read_all()
+        self.assertEqual((empty.num_rows, empty.num_columns), (0, 4))
+
+
+class TestTradeExport(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'export.db')}")
+        Base.metadata.create_all(self.engine)
+        db = SimpleNamespace(engine=self.engine, get_session=sessionmaker(bind=self.engine, autoflush=False))
+        db.insert_ignore = functools.partial(DataSource.insert_ignore, db)
+        self.assertTrue(OrderRepo(db).save_trades(fills([("ENTRY_LONG", 2, 100.0), ("EXIT_LONG", 2, 104.0)])))
+        self.trade_repo = TradeRepo(db)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _export(self, fmt) -> bytes:
+        batches = self.trade_repo.iter_trade_rows(TradeDataFilter(), batch_size=1)
+        return b"".join(exportutil.encode(fmt, trade_export_columns(), batches))
+
+    def test_csv_writes_enum_values(self):
+        rows = list(csv.DictReader(io.StringIO(self._export("csv").decode("utf-8"))))
+        self.assertEqual([(r["status"], r["direction"], r["order_status"], r["order_direction"]) for r in rows],
+                         [("Filled", "BUY", "Filled", "BUY"), ("Filled", "SELL", "Filled", "SELL")])
+        self.assertEqual([r["contract_symbol"] for r in rows], ["NQ", "NQ"])
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow not installed")
+    def test_arrow_writes_enum_values(self):
+        import pyarrow as pa
+        table = pa.ipc.open_stream(self._export("arrow")).read_all()
+        self.assertEqual(table.column("status").to_pylist(), ["Filled", "Filled"])
+        self.assertEqual(table.column("order_direction").to_pylist(), ["BUY", "SELL"])
@@ -0,0 +1,88 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import asyncio
+from unittest import TestCase
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ibtrading.api.metrics_middleware import MetricsMiddleware, HTTP_REQUESTS
+from ibtrading.utils import metricsutil
+from ibtrading.utils.metricsutil import Counter, Histogram, MethodMetrics, Registry
+
+
+class TestMetrics(TestCase):
+    def test_render_text_format(self):
+        registry = Registry()
+        requests = registry.register(Counter("requests_total", "Requests", ("route",)))
+        latency = registry.register(Histogram("latency_seconds", "Latency", buckets=(0.1, 1)))
+        requests.inc(('/a"b',))
+        requests.inc(('/a"b',), 2)
+        latency.observe((), 0.1)
+        latency.observe((), 5)
+        lines = registry.render().splitlines()
+        self.assertIn("# TYPE requests_total counter", lines)
+        self.assertIn('requests_total{route="/a\\"b"} 3', lines)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 2', lines)
+        self.assertIn("latency_seconds_sum 5.1", lines)
+        self.assertIn("latency_seconds_count 2", lines)
+
+    def test_timed_records_calls_rows_and_errors(self):
+        registry = Registry()
+        methods = MethodMetrics("test_method", registry)
+        original, metricsutil.METHODS = metricsutil.METHODS, methods
+        try:
+            @metricsutil.timed("Repo")
+            def list_rows(n):
+                if n < 0:
+                    raise ValueError(n)
+                return list(range(n))
+
+            @metricsutil.timed("Repo")
+            def iter_rows(n):
+                yield from ([i] for i in range(n))
+
+            @metricsutil.timed("Repo")
+            async def save():
+                return False
+
+            self.assertEqual(list_rows(3), [0, 1, 2])
+            self.assertRaises(ValueError, list_rows, -1)
+            self.assertEqual(len(list(iter_rows(4))), 4)
+            self.assertFalse(asyncio.run(save()))
+        finally:
+            metricsutil.METHODS = original
+        self.assertEqual(methods.calls(("Repo", "list_rows")), 1)
+        self.assertEqual(methods.calls(("Repo", "list_rows"), "error"), 1)
+        self.assertEqual(methods.calls(("Repo", "save"), "failed"), 1)
+        lines = registry.render().splitlines()
+        self.assertIn('test_method_rows_sum{component="Repo",method="list_rows"} 3', lines)
+        self.assertIn('test_method_rows_sum{component="Repo",method="iter_rows"} 4', lines)
+        self.assertIn('test_method_duration_seconds_count{component="Repo",method="list_rows"} 2', lines)
+        self.assertFalse(any(line.startswith('test_method_rows_count{component="Repo",method="save"}')
+                             for line in lines))
+
+
+class TestMetricsMiddleware(TestCase):
+    def test_requests_are_labelled_by_route_template(self):
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        async def get_item(item_id: str):
+            return {"id": item_id}
+
+        app.add_middleware(MetricsMiddleware)
+        before = HTTP_REQUESTS.value(("GET", "/items/{item_id}", "200"))
+        unmatched = HTTP_REQUESTS.value(("GET", "unmatched", "404"))
+        with TestClient(app) as client:
+            client.get("/items/secret-1")
+            client.get("/items/secret-2")
+            client.get("/missing")
+        self.assertEqual(HTTP_REQUESTS.value(("GET", "/items/{item_id}", "200")), before + 2)
+        self.assertEqual(HTTP_REQUESTS.value(("GET", "unmatched", "404")), unmatched + 1)
+        self.assertNotIn("secret", metricsutil.REGISTRY.render())
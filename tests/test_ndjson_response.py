@@ -0,0 +1,46 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import json
+from datetime import datetime
+from unittest import TestCase
+
+from starlette.requests import Request
+
+from ibtrading.api.responses import NDJSON_MEDIA_TYPE, ndjson_lines, ndjson_response, wants_ndjson
+from ibtrading.domain.contract import ContractData
+
+
+def _request(accept: str = None) -> Request:
+    headers = [(b"accept", accept.encode())] if accept else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestNdjsonResponse(TestCase):
+    def test_wants_ndjson(self):
+        self.assertFalse(wants_ndjson(_request()))
+        self.assertFalse(wants_ndjson(_request("application/json")))
+        self.assertTrue(wants_ndjson(_request(), stream=True))
+        self.assertTrue(wants_ndjson(_request(f"{NDJSON_MEDIA_TYPE}, application/json;q=0.5")))
+
+    def test_lines_are_produced_lazily(self):
+        consumed = []
+
+        def items():
+            for i in range(3):
+                consumed.append(i)
+                yield ContractData(contract_id=i, symbol="NQ", created_at=datetime(2025, 1, 2))
+
+        lines = ndjson_lines(items())
+        first = next(lines)
+        self.assertEqual(consumed, [0])
+        self.assertTrue(first.endswith(b"\n"))
+        rows = [json.loads(line) for line in [first, *lines]]
+        self.assertEqual([r["contract_id"] for r in rows], [0, 1, 2])
+        self.assertEqual(rows[0]["symbol"], "NQ")
+
+    def test_response_media_type(self):
+        res = ndjson_response(iter([]))
+        self.assertEqual(res.media_type, NDJSON_MEDIA_TYPE)
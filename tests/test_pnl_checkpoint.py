@@ -0,0 +1,125 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import functools
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from ibtrading.domain import TradeDataFilter
+from ibtrading.model import TradeRecord
+from ibtrading.model.pnl_checkpoint_record import PnlCheckpointRecord, ACCOUNT_TOTAL_CONTRACT_ID
+from ibtrading.repo.datasource import Base, DataSource
+from ibtrading.repo.order_repo import OrderRepo
+from ibtrading.repo.trade_repo import TradeRepo
+from ibtrading.service.trade_service import TradeService, _covers_history
+from tests.helpers import fills
+
+NQ, ES = 1000, 2000
+
+
+def _legs(nq_exit_price=104.0):
+    """
+    An NQ long (PnL 8 at the default exit) closing before an ES short (PnL 2.75), then a new NQ entry.
+    """
+    return (fills([("ENTRY_LONG", 2, 100.0)], contract_id=NQ, symbol="NQ", start=1)
+            + fills([("ENTRY_SHORT", 1, 50.0)], contract_id=ES, symbol="ES", start=2)
+            + fills([("EXIT_LONG", 2, nq_exit_price)], contract_id=NQ, symbol="NQ", start=3)
+            + fills([("EXIT_SHORT", 1, 47.25)], contract_id=ES, symbol="ES", start=4)
+            + fills([("ENTRY_LONG", 1, 101.0)], contract_id=NQ, symbol="NQ", start=5))
+
+
+class TestPnlCheckpoints(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'checkpoints.db')}")
+        Base.metadata.create_all(self.engine)
+        self.db = SimpleNamespace(engine=self.engine, get_session=sessionmaker(bind=self.engine, autoflush=False))
+        self.db.insert_ignore = functools.partial(DataSource.insert_ignore, self.db)
+        self.repo = OrderRepo(self.db)
+        for fill in _legs():
+            self.assertTrue(self.repo.save_trades([fill]))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _checkpoints(self) -> dict:
+        with self.db.get_session() as sess:
+            return {c.contract_id: (c.cumulative_pnl, c.cumulative_commission, c.group_count)
+                    for c in sess.query(PnlCheckpointRecord)}
+
+    def _cumulative(self) -> dict:
+        with self.db.get_session() as sess:
+            return {t.order_id: (t.cumulative_pnl, t.cumulative_commission) for t in sess.query(TradeRecord)}
+
+    def test_checkpoints_follow_closed_groups(self):
+        self.assertEqual(self._checkpoints(), {NQ: (8.0, 2.0, 1), ES: (2.75, 2.0, 1),
+                                               ACCOUNT_TOTAL_CONTRACT_ID: (10.75, 4.0, 2)})
+        self.assertEqual(self._cumulative(), {NQ * 1000 + 1: (8.0, 2.0), NQ * 1000 + 3: (8.0, 2.0),
+                                              ES * 1000 + 2: (10.75, 4.0), ES * 1000 + 4: (10.75, 4.0),
+                                              NQ * 1000 + 5: (None, None)})
+
+    def test_repricing_applies_delta_and_restamps_later_groups(self):
+        # A late price correction of the NQ exit, after the NQ set has been followed by a new entry
+        self.assertTrue(self.repo.save_trades(_legs(nq_exit_price=105.0)[2:3]))
+        self.assertEqual(self._checkpoints(), {NQ: (10.0, 2.0, 1), ES: (2.75, 2.0, 1),
+                                               ACCOUNT_TOTAL_CONTRACT_ID: (12.75, 4.0, 2)})
+        cumulative = self._cumulative()
+        self.assertEqual(cumulative[NQ * 1000 + 3], (10.0, 2.0))
+        self.assertEqual(cumulative[ES * 1000 + 4], (12.75, 4.0))  # The later ES group is restamped
+
+        # Rebuilding from scratch gives the incrementally maintained values
+        with self.db.get_session() as sess:
+            sess.query(PnlCheckpointRecord).delete()
+            sess.execute(update(TradeRecord).values(cumulative_pnl=None, cumulative_commission=None))
+            sess.commit()
+        self.assertTrue(self.repo.rebuild_pnl_checkpoints())
+        self.assertEqual(self._cumulative(), cumulative)
+        self.assertEqual(self._checkpoints(), {NQ: (10.0, 2.0, 1), ES: (2.75, 2.0, 1),
+                                               ACCOUNT_TOTAL_CONTRACT_ID: (12.75, 4.0, 2)})
+
+    def test_backfilled_group_restamps_later_groups(self):
+        # A bulk back-fill of a CL group that closed before every other group
+        cl = fills([("ENTRY_LONG", 1, 70.0), ("EXIT_LONG", 1, 71.5)], contract_id=3000, symbol="CL", start=-10)
+        self.assertTrue(self.repo.save_trades(cl, bulk=True))
+        self.assertEqual(self._checkpoints()[ACCOUNT_TOTAL_CONTRACT_ID], (12.25, 6.0, 3))
+        cumulative = self._cumulative()
+        self.assertEqual(cumulative[3000 * 1000 - 10], (1.5, 2.0))
+        self.assertEqual(cumulative[NQ * 1000 + 3], (9.5, 4.0))
+        self.assertEqual(cumulative[ES * 1000 + 4], (12.25, 6.0))
+
+        with self.db.get_session() as sess:
+            sess.execute(update(TradeRecord).values(cumulative_pnl=None, cumulative_commission=None))
+            sess.commit()
+        self.assertTrue(self.repo.rebuild_pnl_checkpoints())
+        self.assertEqual(self._cumulative(), cumulative)
+
+    def _listed_cumulative(self, filter: TradeDataFilter) -> list:
+        trades = TradeRepo(self.db).list_trades_v2(filter)
+        service = TradeService(trade_repo=None, auth_service=SimpleNamespace())  # Without the user database
+        groups = service.group_trades(trades, stored_totals=_covers_history(filter))
+        return [(g[0].contract.symbol, g[-1].cumulative_pnl) for g in groups if g[0].trade_id]
+
+    def test_listings_use_stored_totals_only_when_unfiltered(self):
+        self.assertEqual(self._listed_cumulative(TradeDataFilter()), [("NQ", 8.0), ("ES", 10.75)])
+        self.assertEqual(self._listed_cumulative(TradeDataFilter(symbols=["ES"])), [("ES", 2.75)])
+
+    def test_backfill_rebuilds_missing_totals(self):
+        self.assertFalse(self.repo.backfill_pnl_checkpoints())
+        cumulative = self._cumulative()
+        # Trades priced before the totals were stored
+        with self.db.get_session() as sess:
+            sess.query(PnlCheckpointRecord).delete()
+            sess.execute(update(TradeRecord).where(TradeRecord.contract_id == ES)
+                         .values(cumulative_pnl=None, cumulative_commission=None))
+            sess.commit()
+        self.assertTrue(self.repo.backfill_pnl_checkpoints())
+        self.assertEqual(self._cumulative(), cumulative)
+        self.assertEqual(self._checkpoints()[ACCOUNT_TOTAL_CONTRACT_ID], (10.75, 4.0, 2))
@@ -0,0 +1,33 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from unittest import TestCase
+
+from ibtrading.utils.ratelimitutil import RateLimiter
+
+
+class TestRateLimiter(TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.limiter = RateLimiter(limit=2, window=60, timer=lambda: self.now)
+
+    def test_limit_per_key_within_window(self):
+        self.assertTrue(self.limiter.allow("alice"))
+        self.now = 10
+        self.assertTrue(self.limiter.allow("alice"))
+        self.assertFalse(self.limiter.allow("alice"))
+        self.assertTrue(self.limiter.allow("bob"))
+        self.assertEqual(self.limiter.retry_after("alice"), 50)
+        self.now = 60
+        self.assertTrue(self.limiter.allow("alice"))
+        self.assertFalse(self.limiter.allow("alice"))
+
+    def test_idle_keys_are_pruned(self):
+        limiter = RateLimiter(limit=1, window=1, timer=lambda: self.now, max_keys=2)
+        limiter.allow("a")
+        limiter.allow("b")
+        self.now = 5
+        limiter.allow("c")
+        self.assertEqual(set(limiter._calls), {"c"})
@@ -0,0 +1,78 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ibtrading.model.auth_session_record import AuthSessionRecord
+from ibtrading.service.session_store import InMemorySessionStore, DbSessionStore, SessionStore
+
+
+class TestSessionStore(TestCase):
+    def test_incomplete_backend_fails_at_construction(self):
+        class NoCleanupStore(SessionStore):
+            def add_session(self, username, token, expires):
+                pass
+
+            def get_session(self, token=None):
+                return None
+
+            def remove_session(self, token):
+                return None
+
+        with self.assertRaises(TypeError):
+            NoCleanupStore()
+
+
+class TestInMemorySessionStore(TestCase):
+    def test_cleanup_removes_only_expired(self):
+        store = InMemorySessionStore()
+        now = datetime.now()
+        store.add_session("alice", "t1", now - timedelta(seconds=1))
+        store.add_session("bob", "t2", now + timedelta(hours=1))
+        store.add_session("carol", "t3", now - timedelta(seconds=5))
+        store.remove_session("t3")
+        self.assertEqual(store.cleanup_expired(), 1)
+        self.assertEqual(set(store.sessions), {"t2"})
+        self.assertEqual(store.get_session("t2").username, "bob")
+
+    def test_readded_token_keeps_new_expiry(self):
+        store = InMemorySessionStore()
+        now = datetime.now()
+        store.add_session("alice", "t1", now - timedelta(seconds=1))
+        store.add_session("alice", "t1", now + timedelta(hours=1))
+        self.assertEqual(store.cleanup_expired(), 0)
+        self.assertIsNotNone(store.get_session("t1"))
+
+
+class TestDbSessionStore(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'sessions.db')}")
+        AuthSessionRecord.__table__.create(self.engine)
+        self.store = DbSessionStore(sessionmaker(bind=self.engine))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_session_round_trip(self):
+        self.store.add_session("alice", "t1", datetime.now() + timedelta(hours=1))
+        session = DbSessionStore(sessionmaker(bind=self.engine)).get_session("t1")  # As seen by another worker
+        self.assertEqual((session.username, session.access_token), ("alice", "t1"))
+        self.assertEqual(self.store.remove_session("t1").username, "alice")
+        self.assertIsNone(self.store.get_session("t1"))
+
+    def test_expired_sessions_are_hidden_and_swept(self):
+        self.store.add_session("alice", "t1", datetime.now() - timedelta(seconds=1))
+        self.store.add_session("bob", "t2", datetime.now() + timedelta(hours=1))
+        self.assertIsNone(self.store.get_session("t1"))
+        self.assertEqual(self.store.cleanup_expired(), 1)
+        self.assertIsNotNone(self.store.get_session("t2"))
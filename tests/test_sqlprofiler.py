@@ -0,0 +1,99 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+from datetime import datetime
+from unittest import TestCase
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from ibtrading.repo.sqlprofiler import SqlProfiler, normalize, parameter_shape, OTHER_STATEMENTS
+
+
+class TestNormalize(TestCase):
+    def test_values_and_parameter_lists_are_collapsed(self):
+        self.assertEqual(normalize("SELECT *\n  FROM t WHERE id IN (?, ?, ?) AND name = 'x''y' AND n > 10"),
+                         "SELECT * FROM t WHERE id IN (?...) AND name = ? AND n > ?")
+        self.assertEqual(normalize("SELECT * FROM t WHERE id IN (?)"),
+                         normalize("SELECT * FROM t WHERE id IN (?, ?, ?)"))
+        self.assertEqual(normalize("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)"),
+                         "INSERT INTO t (a, b) VALUES (?...)")
+        self.assertEqual(normalize("SELECT t1.id FROM t1 WHERE t1.x = :x_1 AND y = %(y)s"),
+                         "SELECT t1.id FROM t1 WHERE t1.x = ? AND y = ?")
+
+    def test_parameter_shape_has_no_values(self):
+        self.assertEqual(parameter_shape((1, "secret", datetime(2025, 1, 1))), "(int, str, datetime)")
+        self.assertEqual(parameter_shape({"password": "secret"}), "{password: str}")
+        self.assertEqual(parameter_shape([(1, "a"), (2, "b")], executemany=True), "[2 x (int, str)]")
+
+
+class TestSqlProfiler(TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        with self.engine.begin() as connection:
+            connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)"))
+            connection.execute(text("INSERT INTO item (id, name) VALUES (1, 'a'), (2, 'b')"))
+        self.profiler = SqlProfiler(slow_query_ms=1000, n_plus_one_threshold=3, max_statements=10)
+        self.profiler.attach(self.engine)
+
+    def tearDown(self):
+        self.profiler.detach()
+        self.engine.dispose()
+
+    def _select_items(self, n: int):
+        with self.engine.connect() as connection:
+            for i in range(n):
+                connection.execute(text("SELECT name FROM item WHERE id = :id"), {"id": i}).all()
+
+    def test_statements_are_aggregated(self):
+        self._select_items(4)
+        [stats] = [s for s in self.profiler.statements() if s["statement"].startswith("SELECT name")]
+        self.assertEqual(stats["statement"], "SELECT name FROM item WHERE id = ?")
+        self.assertEqual(stats["count"], 4)
+        self.assertEqual(stats["n_plus_one"], 0)  # Outside a scope
+        self.assertGreaterEqual(stats["max_ms"], stats["mean_ms"])
+
+    def test_n_plus_one_is_flagged_once_per_scope(self):
+        with self.profiler.scope("GET /items"):
+            self._select_items(5)
+        with self.profiler.scope("GET /other"):
+            self._select_items(2)
+        [stats] = [s for s in self.profiler.statements(sort="n_plus_one", limit=1)]
+        self.assertEqual(stats["n_plus_one"], 1)
+        self.assertEqual(stats["last_scope"], "GET /other")
+
+    def test_slow_queries_are_kept_with_parameter_shapes(self):
+        self.profiler.slow_query_seconds = 0
+        with self.profiler.scope(lambda: "resolved later"):
+            self._select_items(1)
+        slow = self.profiler.slow_queries()[0]
+        self.assertEqual(slow["parameters"], "(int)")
+        self.assertEqual(slow["scope"], "resolved later")
+        self.profiler.reset()
+        self.assertEqual(self.profiler.slow_queries(), [])
+        self.assertEqual(self.profiler.statements(), [])
+
+    def test_statement_table_is_bounded(self):
+        self.profiler.max_statements = 2
+        for i in range(5):
+            self.profiler.record(f"SELECT * FROM t{chr(97 + i)}", 0.001)
+        statements = {s["statement"]: s["count"] for s in self.profiler.statements()}
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(statements[OTHER_STATEMENTS], 3)
+
+    def test_failed_statements_leave_no_start_times(self):
+        with self.engine.connect() as connection:
+            for _ in range(3):
+                with self.assertRaises(OperationalError):
+                    connection.execute(text("SELECT * FROM missing"))
+            self.assertEqual(connection.info.get("sql_profiler_start"), [])
+            connection.execute(text("SELECT 1"))
+            self.assertEqual(connection.info.get("sql_profiler_start"), [])
+
+    def test_detach_stops_recording(self):
+        self.profiler.detach()
+        self.assertFalse(self.profiler.enabled)
+        self._select_items(1)
+        self.assertEqual(self.profiler.statements(), [])
@@ -0,0 +1,202 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import functools
+import os
+import tempfile
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from ibtrading.domain import TradeGroupFilter, TradeDataFilter, Pagination
+from ibtrading.model import TradeGroupRecord, TradeRecord
+from ibtrading.repo.datasource import Base, DataSource
+from ibtrading.repo.order_repo import OrderRepo
+from ibtrading.repo.trade_ledger import LedgerTrade
+from ibtrading.repo.trade_repo import TradeRepo
+from ibtrading.service import tradepnl
+from tests.helpers import fills, T0, TRADE_GROUP_COLUMNS
+
+
+class TestSummarizeTradeGroup(TestCase):
+    def _trade(self, id, market_action, quantity, avg_price, trade_id=None, total_pnl=None, total_commission=None):
+        return SimpleNamespace(id=id, market_action=market_action, quantity=quantity, avg_price=avg_price,
+                               commission=1.0, trade_time=T0 + timedelta(minutes=id), created_at=T0,
+                               account_id="DU1", contract_id=1000, trade_id=trade_id, total_pnl=total_pnl,
+                               total_commission=total_commission)
+
+    def test_open_group(self):
+        values = tradepnl.summarize_trade_group([self._trade(1, "ENTRY_SHORT", 2, 100.0),
+                                                 self._trade(2, "ENTRY_SHORT", 1, 103.0)])
+        self.assertEqual(values["status"], tradepnl.TRADE_GROUP_OPEN)
+        self.assertEqual(values["direction"], "SHORT")
+        self.assertEqual((values["entry_quantity"], values["entry_price"]), (3, 101.0))
+        self.assertIsNone(values["trade_id"])
+        self.assertIsNone(values["total_pnl"])
+        self.assertIsNone(values["close_time"])
+        self.assertEqual(values["total_commission"], 2.0)
+
+    def test_closed_group(self):
+        trades = [self._trade(1, "ENTRY_LONG", 2, 100.0, 7, 10.0, 2.0),
+                  self._trade(2, "EXIT_LONG", 2, 105.0, 7, 10.0, 2.0)]
+        values = tradepnl.summarize_trade_group(trades)
+        self.assertEqual(values["status"], tradepnl.TRADE_GROUP_CLOSED)
+        self.assertEqual((values["trade_id"], values["direction"]), (7, "LONG"))
+        self.assertEqual((values["entry_price"], values["exit_price"]), (100.0, 105.0))
+        self.assertEqual((values["total_pnl"], values["total_pnl_percent"]), (10.0, 5.0))
+        self.assertEqual(values["close_time"], trades[-1].trade_time)
+
+
+class TestTradeGroupTable(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engines = []
+        self.db = self._database("trade_groups.db")
+        self.repo = OrderRepo(self.db)
+
+    def tearDown(self):
+        for engine in self.engines:
+            engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _database(self, name):
+        engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, name)}")
+        self.engines.append(engine)
+        Base.metadata.create_all(engine)
+        db = SimpleNamespace(engine=engine, get_session=sessionmaker(bind=engine, autoflush=False))
+        db.insert_ignore = functools.partial(DataSource.insert_ignore, db)
+        return db
+
+    def _groups(self, db=None):
+        with (db or self.db).get_session() as sess:
+            rows = sess.query(TradeGroupRecord).order_by(TradeGroupRecord.open_time).all()
+            return [{name: getattr(r, name) for name in TRADE_GROUP_COLUMNS} for r in rows]
+
+    def test_group_row_written_on_close(self):
+        trades = fills([("ENTRY_LONG", 1, 100.0), ("ENTRY_LONG", 1, 102.0), ("EXIT_LONG", 2, 106.0)])
+        self.repo.save_trades(trades[:1])
+        self.repo.save_trades(trades[1:2])
+        self.assertEqual(self._groups(), [])
+        groups, summary, _ = TradeRepo(self.db).list_trade_groups(TradeGroupFilter())
+        self.assertEqual([(g.status, g.entry_quantity, g.entry_price, g.trade_count) for g in groups],
+                         [(tradepnl.TRADE_GROUP_OPEN, 2, 101.0, 2)])
+        self.assertEqual((groups[0].contract.symbol, groups[0].open_time), ("NQ", trades[0].trade_time))
+        self.assertEqual(summary.open_count, 1)
+
+        self.repo.save_trades(trades[2:])
+        groups = self._groups()
+        self.assertEqual(len(groups), 1)
+        group = groups[0]
+        self.assertEqual(group["status"], tradepnl.TRADE_GROUP_CLOSED)
+        self.assertIsNotNone(group["trade_id"])
+        self.assertEqual((group["exit_quantity"], group["exit_price"], group["trade_count"]), (2, 106.0, 3))
+        self.assertEqual(group["open_time"], trades[0].trade_time)
+        self.assertEqual(group["close_time"], trades[2].trade_time)
+        groups, summary, _ = TradeRepo(self.db).list_trade_groups(TradeGroupFilter())
+        self.assertEqual([g.status for g in groups], [tradepnl.TRADE_GROUP_CLOSED])
+        self.assertEqual((summary.closed_count, summary.open_count), (1, 0))
+
+    def test_bulk_save_and_rebuild_match_incremental(self):
+        legs = [("ENTRY_LONG", 2, 100.0), ("EXIT_LONG", 2, 104.0), ("ENTRY_SHORT", 1, 110.0),
+                ("EXIT_SHORT", 1, 107.5), ("ENTRY_LONG", 3, 101.0)]
+        trades = fills(legs) + fills(legs[:2], contract_id=2000, symbol="ES")
+        for fill in trades:
+            self.repo.save_trades([fill])
+        incremental = self._groups()
+        self.assertEqual([g["status"] for g in incremental], [tradepnl.TRADE_GROUP_CLOSED] * 3)
+
+        with self.db.get_session() as sess:
+            sess.query(TradeGroupRecord).delete()
+            sess.add(TradeGroupRecord(contract_id=1000, status=tradepnl.TRADE_GROUP_OPEN))  # Written by older versions
+            sess.commit()
+        self.assertTrue(self.repo.rebuild_trade_groups())
+        self.assertEqual(self._groups(), incremental)
+
+        # Bulk pricing stamps other trade_ids, the groups are the same
+        bulk_db = self._database("bulk.db")
+        self.assertTrue(OrderRepo(bulk_db).save_trades(trades, bulk=True))
+        without_ids = lambda groups: [{k: v for k, v in g.items() if k != "trade_id"} for g in groups]
+        self.assertEqual(without_ids(self._groups(bulk_db)), without_ids(incremental))
+
+    def test_list_trade_groups(self):
+        legs = [("ENTRY_LONG", 1, 100.0), ("EXIT_LONG", 1, 104.0), ("ENTRY_LONG", 1, 100.0), ("EXIT_LONG", 1, 98.0),
+                ("ENTRY_SHORT", 1, 100.0)]
+        for fill in fills(legs) + fills(legs[:2], contract_id=2000, symbol="ES", start=10):
+            self.repo.save_trades([fill])
+        trade_repo = TradeRepo(self.db)
+
+        groups, summary, pagination = trade_repo.list_trade_groups(
+            TradeGroupFilter(symbols=["NQ"], pagination=Pagination(limit=2)))
+        self.assertEqual([g.status for g in groups], [tradepnl.TRADE_GROUP_CLOSED] * 2)
+        self.assertEqual(groups[0].contract.symbol, "NQ")
+        self.assertIsNotNone(pagination.next_cursor)
+        self.assertEqual((summary.closed_count, summary.open_count, summary.win_count, summary.loss_count),
+                         (2, 1, 1, 1))
+        self.assertEqual(summary.win_rate, 50.0)
+
+        rest, _, pagination = trade_repo.list_trade_groups(
+            TradeGroupFilter(symbols=["NQ"], pagination=Pagination(limit=2, next_cursor=pagination.next_cursor)))
+        self.assertEqual([g.status for g in rest], [tradepnl.TRADE_GROUP_OPEN])
+        self.assertEqual((rest[0].direction, rest[0].entry_quantity, rest[0].trade_count), ("SHORT", 1, 1))
+        self.assertIsNone(pagination.next_cursor)
+
+        back, _, pagination = trade_repo.list_trade_groups(
+            TradeGroupFilter(symbols=["NQ"], pagination=Pagination(limit=2, prev_cursor=pagination.prev_cursor)))
+        self.assertEqual([g.id for g in back], [g.id for g in groups])
+        self.assertIsNone(pagination.prev_cursor)
+
+        groups, summary, _ = trade_repo.list_trade_groups(TradeGroupFilter(status=tradepnl.TRADE_GROUP_OPEN))
+        self.assertEqual([g.contract.symbol for g in groups], ["NQ"])
+        self.assertEqual(summary.open_count, 1)
+
+        groups, summary, _ = trade_repo.list_trade_groups(TradeGroupFilter(status=tradepnl.TRADE_GROUP_CLOSED))
+        self.assertEqual(len(groups), 3)
+        self.assertEqual(summary.closed_count, 3)
+        with self.assertRaises(ValueError):
+            trade_repo.list_trade_groups(TradeGroupFilter(status="PENDING"))
+
+    def test_open_groups_read_only_trailing_trades(self):
+        legs = [("ENTRY_LONG", 2, 100.0), ("EXIT_LONG", 2, 104.0), ("ENTRY_SHORT", 1, 110.0)]
+        for fill in fills(legs) + fills(legs[:2], contract_id=2000, symbol="ES", start=10):
+            self.repo.save_trades([fill])
+        with self.db.get_session() as sess:  # Trades saved before they were priced
+            sess.execute(update(TradeRecord).where(TradeRecord.order_id == 1000001).values(trade_id=None))
+            sess.commit()
+
+        read = []
+        from_record = LedgerTrade.from_record
+        with patch.object(LedgerTrade, "from_record", side_effect=lambda t, market_action=None: (
+                read.append(t.order_id) or from_record(t, market_action))):
+            groups, summary, _ = TradeRepo(self.db).list_trade_groups(TradeGroupFilter())
+            self.assertEqual(read, [1000003])  # Only the trades after each contract's last close
+            self.assertEqual(([g.status for g in groups], summary.open_count),
+                             ([tradepnl.TRADE_GROUP_CLOSED, tradepnl.TRADE_GROUP_OPEN, tradepnl.TRADE_GROUP_CLOSED], 1))
+            read.clear()
+            TradeRepo(self.db).list_trade_groups(TradeGroupFilter(symbols=["ES"]))
+            self.assertEqual(read, [])
+
+    def test_trade_pages_keep_groups_whole(self):
+        legs = [("ENTRY_LONG", 1, 100.0), ("ENTRY_LONG", 1, 102.0), ("EXIT_LONG", 2, 106.0)]
+        for fill in fills(legs) + fills(legs[:1], contract_id=2000, symbol="ES", start=10):
+            self.repo.save_trades([fill])
+        trade_repo = TradeRepo(self.db)
+
+        first, pagination = trade_repo.list_trades_page(TradeDataFilter(pagination=Pagination(limit=1)))
+        self.assertEqual([t.order_id for t in first], [1000001, 1000002, 1000003])  # Extended to the whole group
+        self.assertIsNone(pagination.prev_cursor)
+        rest, pagination = trade_repo.list_trades_page(
+            TradeDataFilter(pagination=Pagination(limit=1, next_cursor=pagination.next_cursor)))
+        self.assertEqual([t.order_id for t in rest], [2000010])
+        self.assertIsNone(pagination.next_cursor)
+
+        back, pagination = trade_repo.list_trades_page(
+            TradeDataFilter(pagination=Pagination(limit=1, prev_cursor=pagination.prev_cursor)))
+        self.assertEqual([t.order_id for t in back], [t.order_id for t in first])
+        self.assertIsNone(pagination.prev_cursor)
+        self.assertIsNotNone(pagination.next_cursor)
@@ -0,0 +1,151 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import functools
+import os
+import tempfile
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import TestCase
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ibtrading.model import TradeRecord, TradeGroupRecord
+from ibtrading.repo.datasource import Base, DataSource
+from ibtrading.repo.order_repo import OrderRepo
+from ibtrading.repo.trade_ledger import TradeLedger, LedgerTrade, is_set_boundary, current_trade_set
+from tests.helpers import fills, T0
+
+NQ = 1000
+
+
+def _trade(id, market_action, quantity=1):
+    return LedgerTrade(id=id, contract_id=NQ, market_action=market_action, quantity=quantity, avg_price=100.0,
+                       trade_time=T0 + timedelta(minutes=id), created_at=T0)
+
+
+class TestTradeLedger(TestCase):
+    def test_set_boundaries(self):
+        self.assertTrue(is_set_boundary(_trade(1, "EXIT_LONG"), _trade(2, "ENTRY_SHORT")))
+        self.assertTrue(is_set_boundary(_trade(1, None), _trade(2, "EXIT_LONG")))
+        self.assertFalse(is_set_boundary(_trade(1, "ENTRY_LONG"), _trade(2, "ENTRY_LONG")))
+        self.assertFalse(is_set_boundary(_trade(1, "ENTRY_LONG"), _trade(2, "EXIT_LONG")))
+        self.assertFalse(is_set_boundary(_trade(1, "EXIT_LONG"), _trade(2, "EXIT_LONG")))
+
+        trades = [_trade(1, "ENTRY_LONG"), _trade(2, "EXIT_LONG"), _trade(3, "ENTRY_SHORT"), _trade(4, "ENTRY_SHORT")]
+        self.assertEqual([t.id for t in current_trade_set(trades)], [3, 4])
+        self.assertEqual(current_trade_set([]), [])
+
+    def test_record_keeps_only_the_current_set(self):
+        ledger = TradeLedger(loader=lambda contract_id: [])
+        for t in (_trade(1, "ENTRY_LONG", 2), _trade(2, "EXIT_LONG"), _trade(3, "EXIT_LONG")):
+            ledger.record(t)
+        self.assertEqual([t.id for t in ledger.trades(NQ)], [1, 2, 3])
+
+        ledger.record(_trade(5, "ENTRY_SHORT"))
+        self.assertEqual([t.id for t in ledger.trades(NQ)], [5])
+
+        # A fill arriving late, timed before the current set, is ordered in and starts the set
+        ledger.record(_trade(4, "ENTRY_SHORT"))
+        self.assertEqual([t.id for t in ledger.trades(NQ)], [4, 5])
+        self.assertEqual([t.id for t in ledger.trades(NQ, until=T0 + timedelta(minutes=4))], [4])
+
+        # A late update to an earlier set is returned but not kept
+        late = ledger.record(_trade(2, "EXIT_LONG"))
+        self.assertEqual(late.id, 2)
+        self.assertIsNone(ledger.find(NQ, 2))
+        self.assertEqual(ledger.size(), 2)
+
+    def test_record_keeps_pricing_fields(self):
+        ledger = TradeLedger(loader=lambda contract_id: [])
+        entry = ledger.record(_trade(1, "ENTRY_LONG"))
+        entry.trade_id, entry.total_pnl = 7, 3.5
+        ledger.record(LedgerTrade(id=1, contract_id=NQ, quantity=2, trade_time=entry.trade_time))
+        self.assertEqual((entry.quantity, entry.market_action, entry.trade_id, entry.total_pnl),
+                         (2, "ENTRY_LONG", 7, 3.5))
+
+
+class TestOrderRepoLedger(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'ledger.db')}")
+        Base.metadata.create_all(self.engine)
+        self.db = SimpleNamespace(engine=self.engine, get_session=sessionmaker(bind=self.engine, autoflush=False))
+        self.db.insert_ignore = functools.partial(DataSource.insert_ignore, self.db)
+        self.repo = OrderRepo(self.db)
+        self.fills = fills([("ENTRY_LONG", 2, 100.0), ("EXIT_LONG", 2, 104.0), ("ENTRY_LONG", 1, 101.0),
+                             ("EXIT_LONG", 1, 103.0)])
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _sets(self) -> list:
+        """
+        The order_ids of each priced trade set, and the PnL of their trade_group rows.
+        """
+        with self.db.get_session() as sess:
+            members = {}
+            for t in sess.query(TradeRecord).order_by(TradeRecord.order_id):
+                if t.trade_id:
+                    members.setdefault(t.trade_id, []).append(t.order_id)
+            groups = {g.trade_id: g.total_pnl for g in sess.query(TradeGroupRecord)}
+        return sorted((order_ids, groups.get(trade_id)) for trade_id, order_ids in members.items())
+
+    def test_loads_the_current_set_from_the_database(self):
+        for fill in self.fills[:3]:
+            self.assertTrue(self.repo.save_trades([fill]))
+
+        restarted = OrderRepo(self.db)
+        self.assertEqual(restarted.trade_ledger.size(), 0)
+        self.assertEqual(restarted.warm_trade_ledger(days=100000), 1)
+        self.assertEqual([t.order_id for t in restarted.trade_ledger.trades(NQ)], [NQ * 1000 + 3])
+        self.assertEqual([t.order_id for t in restarted.trade_ledger.trades(NQ, until=T0)], [])
+
+        self.assertTrue(restarted.save_trades(self.fills[3:]))
+        self.assertEqual(self._sets(), [([NQ * 1000 + 1, NQ * 1000 + 2], 8.0), ([NQ * 1000 + 3, NQ * 1000 + 4], 2.0)])
+
+    def test_failed_save_invalidates_the_ledger(self):
+        self.assertTrue(self.repo.save_trades(self.fills[:1]))
+        save_trade_group = self.repo._save_trade_group
+
+        def fail(*args):
+            raise RuntimeError("Lost connection")
+
+        # The exit prices the set in the ledger before the transaction fails and rolls back
+        self.repo._save_trade_group = fail
+        self.assertFalse(self.repo.save_trades(self.fills[1:2]))
+        self.assertEqual(self.repo.trade_ledger.size(), 0)
+        self.assertEqual(self._sets(), [])
+
+        self.repo._save_trade_group = save_trade_group
+        self.assertTrue(self.repo.save_trades(self.fills[1:2]))
+        self.assertEqual(self._sets(), [([NQ * 1000 + 1, NQ * 1000 + 2], 8.0)])
+
+    def test_exit_checks_a_stale_ledger_against_the_database(self):
+        other = OrderRepo(self.db)  # Another process writing to the same database
+        self.assertTrue(self.repo.save_trades(self.fills[:1]))
+        self.assertTrue(other.save_trades(self.fills[1:3]))
+        self.assertEqual([t.order_id for t in self.repo.trade_ledger.trades(NQ)], [NQ * 1000 + 1])
+
+        # This ledger still holds the first entry, which the other process has closed
+        self.assertTrue(self.repo.save_trades(self.fills[3:]))
+        self.assertEqual(self._sets(), [([NQ * 1000 + 1, NQ * 1000 + 2], 8.0), ([NQ * 1000 + 3, NQ * 1000 + 4], 2.0)])
+        self.assertEqual([t.order_id for t in self.repo.trade_ledger.trades(NQ)],
+                         [NQ * 1000 + 3, NQ * 1000 + 4])
+
+    def test_current_ledger_is_kept(self):
+        self.assertTrue(self.repo.save_trades(self.fills[:1]))  # Loads the contract's ledger
+        invalidated, loaded = [], []
+        self.repo.trade_ledger.invalidate = invalidated.append
+        load_trade_set = self.repo._load_trade_set
+        self.repo._load_trade_set = lambda *args, **kwargs: loaded.append(args) or load_trade_set(*args, **kwargs)
+        for fill in self.fills[1:]:
+            self.assertTrue(self.repo.save_trades([fill]))
+        # Each exit found the ledger matching the database and priced its set without reading it back
+        self.assertEqual((invalidated, loaded), ([], []))
+        self.assertEqual([t.order_id for t in self.repo.trade_ledger.trades(NQ)], [NQ * 1000 + 3, NQ * 1000 + 4])
+        self.assertEqual(self._sets(), [([NQ * 1000 + 1, NQ * 1000 + 2], 8.0), ([NQ * 1000 + 3, NQ * 1000 + 4], 2.0)])
@@ -0,0 +1,133 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import functools
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+import anyio
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ibtrading.domain import TradeDataFilter, Pagination, ListTradeRequest, ErrorCode
+from ibtrading.repo.datasource import Base, DataSource
+from ibtrading.repo.order_repo import OrderRepo
+from ibtrading.repo.trade_repo import TradeRepo
+from ibtrading.service.trade_service import TradeService
+from ibtrading.utils import cursorutil, jsonutil
+from tests.helpers import fills, T0
+
+NQ, ES = 1000, 2000
+
+
+async def _authorized(token):
+    return SimpleNamespace(error=False)
+
+
+def _pagination(limit=1, next_cursor=None, prev_cursor=None) -> Pagination:
+    cursors = {"next_cursor": next_cursor, "prev_cursor": prev_cursor}
+    return Pagination(limit=limit, **{name: cursor for name, cursor in cursors.items() if cursor})
+
+
+class TestCursor(TestCase):
+    def test_round_trip(self):
+        cursor = cursorutil.encode_cursor(T0, 42)
+        self.assertEqual(cursorutil.decode_cursor(cursor), (T0, 42))
+        self.assertIsNone(cursorutil.encode_cursor(None, 42))
+        self.assertIsNone(cursorutil.decode_cursor(""))
+        with self.assertRaises(ValueError):
+            cursorutil.decode_cursor("not-a-cursor")
+
+
+class TestTradePagination(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'pages.db')}")
+        Base.metadata.create_all(self.engine)
+        self.db = SimpleNamespace(engine=self.engine, get_session=sessionmaker(bind=self.engine, autoflush=False))
+        self.db.insert_ignore = functools.partial(DataSource.insert_ignore, self.db)
+        # Closed groups NQ 3.0, ES 2.0, NQ 2.0 and ES -1.0 (commission 2.0 each), then an open NQ entry
+        legs = (fills([("ENTRY_LONG", 1, 100.0), ("EXIT_LONG", 1, 103.0)], contract_id=NQ, symbol="NQ", start=1)
+                + fills([("ENTRY_LONG", 1, 50.0), ("EXIT_LONG", 1, 52.0)], contract_id=ES, symbol="ES", start=3)
+                + fills([("ENTRY_LONG", 2, 100.0), ("EXIT_LONG", 2, 101.0)], contract_id=NQ, symbol="NQ", start=5)
+                + fills([("ENTRY_LONG", 1, 50.0), ("EXIT_LONG", 1, 49.0)], contract_id=ES, symbol="ES", start=7)
+                + fills([("ENTRY_LONG", 1, 100.0)], contract_id=NQ, symbol="NQ", start=9))
+        order_repo = OrderRepo(self.db)
+        for fill in legs:
+            self.assertTrue(order_repo.save_trades([fill]))
+        self.order_ids = [fill.order_id for fill in legs]
+        self.trade_repo = TradeRepo(self.db)
+        self.service = TradeService(trade_repo=self.trade_repo, auth_service=SimpleNamespace(
+            authorize_async=_authorized))
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def _page(self, limit=1, next_cursor=None, prev_cursor=None, **criteria):
+        return self.trade_repo.list_trades_page(TradeDataFilter(
+            pagination=_pagination(limit, next_cursor, prev_cursor), **criteria))
+
+    def test_pages_round_trip_with_whole_groups(self):
+        forward, pagination = [], Pagination()
+        while True:
+            trades, pagination = self._page(next_cursor=pagination.next_cursor)
+            forward.append([t.order_id for t in trades])
+            if pagination.next_cursor is None:
+                break
+        # Each page of limit 1 is extended to the whole trade group of its first trade
+        self.assertEqual(forward, [self.order_ids[i:i + 2] for i in range(0, len(self.order_ids), 2)])
+
+        backward = []
+        while pagination.prev_cursor is not None:
+            trades, pagination = self._page(prev_cursor=pagination.prev_cursor)
+            backward.append([t.order_id for t in trades])
+        self.assertEqual(backward, forward[-2::-1])
+
+    def test_pages_match_the_listing(self):
+        listed, pagination = [], Pagination()
+        while True:
+            trades, pagination = self._page(limit=3, next_cursor=pagination.next_cursor)
+            listed.extend(trades)
+            if pagination.next_cursor is None:
+                break
+        self.assertEqual(jsonutil.dumps(listed), jsonutil.dumps(self.trade_repo.list_trades_v2(TradeDataFilter())))
+
+    def test_page_size_and_invalid_cursor(self):
+        trades, pagination = self._page(limit=3)
+        self.assertEqual([t.order_id for t in trades], self.order_ids[:4])  # The second group is completed
+        trades, _ = self._page(limit=3, next_cursor=pagination.next_cursor)
+        self.assertEqual([t.order_id for t in trades], self.order_ids[4:8])
+        with self.assertRaises(ValueError):
+            self._page(next_cursor="not-a-cursor")
+
+        res = anyio.run(self.service.list_trades, ListTradeRequest(
+            filter=TradeDataFilter(pagination=Pagination(next_cursor="not-a-cursor"))))
+        self.assertEqual((res.error, res.code), (True, ErrorCode.INVALID_REQUEST))
+
+    def _cumulative_pages(self, **criteria) -> list:
+        pages, pagination = [], Pagination(limit=1)
+        while True:
+            res = anyio.run(self.service.list_trades, ListTradeRequest(
+                filter=TradeDataFilter(pagination=_pagination(next_cursor=pagination.next_cursor), **criteria)))
+            self.assertFalse(res.error)
+            pages.append([(g[-1].cumulative_pnl, g[-1].cumulative_commission) for g in res.grouped_trades
+                          if g[0].trade_id])
+            pagination = res.pagination
+            if pagination.next_cursor is None:
+                return pages
+
+    def test_cumulative_pnl_carries_over_pages(self):
+        self.assertEqual(self._cumulative_pages(), [[(3.0, 2.0)], [(5.0, 4.0)], [(7.0, 6.0)], [(6.0, 8.0)], []])
+        # Narrowed listings start each page from the groups on earlier pages
+        self.assertEqual(self._cumulative_pages(symbols=["NQ"]), [[(3.0, 2.0)], [(5.0, 4.0)], []])
+        self.assertEqual(self._cumulative_pages(symbols=["ES"]), [[(2.0, 2.0)], [(1.0, 4.0)]])
+
+        _, page = anyio.run(self.service.list_trade_rows, ListTradeRequest(filter=TradeDataFilter(
+            symbols=["ES"], pagination=_pagination(next_cursor=self._page(symbols=["ES"])[1].next_cursor))))
+        self.assertEqual([(t.order_id, t.cumulative_pnl) for t in page.trades], [(ES * 1000 + 7, 1.0),
+                                                                                  (ES * 1000 + 8, 1.0)])
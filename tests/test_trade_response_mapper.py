@@ -0,0 +1,93 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import json
+from datetime import datetime
+from unittest import TestCase
+
+from ibtrading.domain import ListTradeResponse
+from ibtrading.domain.contract import ContractData
+from ibtrading.domain.order import OrderData, RefData, OrderStatus, OrderDirection
+from ibtrading.domain.trade import TradeData
+from ibtrading.mapper.order_record_mapper import map2trade_data
+from ibtrading.mapper.trade_response_mapper import map2trade_response_content, map2compact_trade_row_response
+from ibtrading.mapper.trade_columns_mapper import TRADE_COLUMNS, ORDER_COLUMNS, CONTRACT_COLUMNS, REF_COLUMNS, \
+    map2trade_data_from_columns, map2trade_row_page_from_columns
+from ibtrading.mapper.trade_row_mapper import map2trade_row_page
+from ibtrading.model import TradeRecord, OrderRecord, ContractRecord, WebhookRecord
+from ibtrading.utils import jsonutil
+
+
+def _trade(id, trade_id, contract, ref):
+    order = OrderData(perm_id=id, contract_id=contract.contract_id, contract=contract, ref_id=ref.ref_id, ref_data=ref)
+    return TradeData(id=id, trade_id=trade_id, contract_id=contract.contract_id, order=order, contract=contract,
+                     status=OrderStatus.Filled, trade_time=datetime(2025, 1, 2, 10, id))
+
+
+class TestTradeResponseMapper(TestCase):
+    def setUp(self):
+        contract = ContractData(contract_id=1000, symbol="NQ")
+        ref = RefData(ref_id="r1", action="buy")
+        trades = [_trade(1, 7, contract, ref), _trade(2, 7, contract, ref), _trade(3, 0, contract, ref)]
+        self.res = ListTradeResponse(trades=trades, grouped_trades=[trades[:2], trades[2:]])
+
+    def test_default_content_matches_pydantic(self):
+        content = json.loads(jsonutil.dumps(map2trade_response_content(self.res)))
+        self.assertEqual(content, json.loads(self.res.model_dump_json()))
+
+
+class TestTradeRowMapper(TestCase):
+    def setUp(self):
+        contract = ContractRecord(contract_id=1000, symbol="NQ", sec_type="FUT")
+        self.rows = []
+        for i in range(1, 4):
+            dt = datetime(2025, 1, 2, 10, i)
+            webhook_log = WebhookRecord(id=i, ref_id=f"r{i}", action="buy", dt=dt, created_at=dt) if i < 3 else None
+            order = OrderRecord(perm_id=i, contract_id=1000, ref_id=f"r{i}", market_action="ENTRY_LONG",
+                                direction=OrderDirection.BUY, status=OrderStatus.Filled, order_time=dt)
+            trade = TradeRecord(id=i, trade_id=7 if i < 3 else 0, order_id=i, contract_id=1000, quantity=1,
+                                avg_price=100.0, status=OrderStatus.Filled, trade_time=dt, total_pnl=5.0,
+                                cumulative_pnl=None, created_at=dt)
+            self.rows.append((trade, order, contract, webhook_log))
+
+    def test_compact_sends_each_trade_contract_and_ref_once(self):
+        page = map2trade_row_page(self.rows)
+        page.grouped_trades = [page.trades[:2], page.trades[2:]]
+        content = json.loads(jsonutil.dumps(map2compact_trade_row_response(page)))
+        self.assertTrue(content["compact"])
+        self.assertEqual(content["grouped_trades"], [[0, 1], [2]])
+        self.assertEqual([t["id"] for t in content["trades"]], [1, 2, 3])
+        self.assertEqual(list(content["contracts"]), ["1000"])
+        self.assertEqual(list(content["refs"]), ["r1", "r2"])
+        self.assertEqual(content["refs"]["r1"]["action"], "buy")
+
+        # Trades carry the TradeData fields, without the contract and ref data sent once above
+        for trade, (t, o, c, wl) in zip(content["trades"], self.rows):
+            expected = json.loads(jsonutil.dumps(map2trade_data(trade=t, order=o, contract=c, webhook_log=wl)))
+            expected.pop("contract")
+            expected["order"].pop("contract")
+            expected["order"].pop("ref_data")
+            self.assertEqual(trade, expected)
+
+    def _column_row(self, trade, order, contract, webhook_log) -> tuple:
+        def values(record, names):
+            return tuple(getattr(record, name) if record is not None else None for name in names)
+
+        return (values(trade, TRADE_COLUMNS) + values(order, ORDER_COLUMNS) + values(contract, CONTRACT_COLUMNS)
+                + values(webhook_log, REF_COLUMNS))
+
+    def test_column_rows_map_like_orm_rows(self):
+        column_rows = [self._column_row(*row) for row in self.rows]
+        expected = [map2trade_data(trade=t, order=o, contract=c, webhook_log=wl) for t, o, c, wl in self.rows]
+        self.assertEqual(jsonutil.dumps([map2trade_data_from_columns(row) for row in column_rows]),
+                         jsonutil.dumps(expected))
+        self.assertEqual(jsonutil.dumps(map2trade_row_page_from_columns(column_rows)),
+                         jsonutil.dumps(map2trade_row_page(self.rows)))
+
+    def test_contracts_are_mapped_once(self):
+        page = map2trade_row_page(self.rows)
+        self.assertEqual(list(page.contracts), ["1000"])
+        self.assertFalse(hasattr(page.trades[0], "__dict__"))
+        self.assertEqual(page.trades[0].market_action, "ENTRY_LONG")
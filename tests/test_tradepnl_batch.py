@@ -0,0 +1,79 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import copy
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import TestCase
+
+import pandas as pd
+
+from ibtrading.service import tradepnl, tradepnl_batch
+
+ACTIONS = ["ENTRY_LONG", "EXIT_LONG", "ENTRY_SHORT", "EXIT_SHORT"]
+
+
+def generate_trades(n, seed, noise=0.1):
+    """
+    Mostly well-formed ENTRY/EXIT sequences, with missing actions, direction flips and
+    quantity mismatches injected at the given rate.
+    """
+    rng = random.Random(seed)
+    trades = []
+    t0 = datetime(2025, 1, 1)
+    side = "LONG"
+    i = 0
+    while len(trades) < n:
+        side = rng.choice(["LONG", "SHORT"])
+        entries = [rng.randint(1, 3) for _ in range(rng.randint(1, 4))]
+        legs = [("ENTRY_" + side, q) for q in entries] + [("EXIT_" + side, sum(entries))]
+        for action, quantity in legs:
+            if rng.random() < noise:
+                action = rng.choice(ACTIONS + [None])
+            if rng.random() < noise:
+                quantity += 1
+            i += 1
+            trades.append(SimpleNamespace(id=i, market_action=action, quantity=quantity,
+                                          avg_price=round(rng.uniform(100, 200) * 4) / 4,
+                                          commission=round(rng.uniform(0.5, 2.5), 2),
+                                          trade_time=t0 + timedelta(minutes=i // 2), created_at=t0 + timedelta(seconds=i),
+                                          total_pnl=None, total_commission=None, trade_id=None))
+    rng.shuffle(trades)
+    return trades[:n]
+
+
+def summarize(trade_sets):
+    return [[(t.id, t.total_pnl, t.total_commission) for t in s] for s in trade_sets]
+
+
+class TestTradePnlBatch(TestCase):
+    def assert_parity(self, trades, last_set_only=False):
+        expected = tradepnl.calculate_pnl(copy.deepcopy(trades), last_set_only=last_set_only)
+        actual = tradepnl_batch.calculate_pnl_batch(copy.deepcopy(trades), last_set_only=last_set_only)
+        self.assertEqual(summarize(expected), summarize(actual))
+        for s in filter(None, actual):
+            self.assertEqual(1, len({t.trade_id for t in s}))
+
+    def test_parity_with_clean_sequences(self):
+        for seed in range(20):
+            self.assert_parity(generate_trades(60, seed, noise=0.0))
+
+    def test_parity_with_noisy_sequences(self):
+        for seed in range(200):
+            self.assert_parity(generate_trades(random.Random(seed).randint(0, 80), seed, noise=0.2))
+
+    def test_parity_last_set_only(self):
+        for seed in range(50):
+            self.assert_parity(generate_trades(30, seed, noise=0.2), last_set_only=True)
+
+    def test_frame_matches_objects(self):
+        trades = generate_trades(200, 7, noise=0.1)
+        frame = pd.DataFrame([{c: getattr(t, c) for c in tradepnl_batch.FRAME_COLUMNS + ["id"]} for t in trades])
+        result = tradepnl_batch.calculate_pnl_frame(frame)
+        expected = {t.id: (t.total_pnl, t.total_commission)
+                    for s in tradepnl.calculate_pnl(copy.deepcopy(trades)) for t in s}
+        priced = result[result["set_no"] >= 0]
+        self.assertEqual(expected, {r.id: (r.total_pnl, r.total_commission) for r in priced.itertuples()})
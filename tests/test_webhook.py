@@ -3,9 +3,28 @@
 -- Email: asokpant@gmail.com
 -- Created on: 29/11/2024
 """
+import functools
+import os
+import tempfile
+from types import SimpleNamespace
 from unittest import TestCase
 
+import anyio
 import requests
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from ibtrading.domain import WebhookPayload
+from ibtrading.model import WebhookRecord
+from ibtrading.repo.datasource import DataSource
+from ibtrading.repo.order_repo import OrderRepo
+from ibtrading.service.webhook_service import WebhookService, INGEST_MODE_SYNC
+
+PAYLOAD = {'action': 'sell', 'contracts': '1', 'symbol': 'NQ1!', 'position_size': '0', 'market_position': 'flat',
+           'market_position_size': '0', 'time': '2024-11-29T08:03:00Z', 'close': '20900.50', 'open': '20899.00',
+           'high': '20901.50', 'low': '20899.00', 'volume': '42', 'timeframe': '1', 'exchange': 'CME_MINI_DL',
+           'timenow': '2024-11-29T08:13:20Z', 'currency': 'USD', 'sec_type': 'FUT',
+           'last_trade_date_or_contract_month': '20241220', 'message': 'Exit'}
 
 
 class TestWebhookAPI(TestCase):
@@ -22,3 +41,35 @@ class TestWebhookAPI(TestCase):
         response = requests.post(url, json=payload)
         print(response.json())
         self.assertEqual(response.status_code, 200)
+
+
+class TestWebhookDeduplication(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmpdir.name, 'webhooks.db')}")
+        WebhookRecord.__table__.create(self.engine)
+        db = SimpleNamespace(engine=self.engine, get_session=sessionmaker(bind=self.engine))
+        db.insert_ignore = functools.partial(DataSource.insert_ignore, db)
+        self.repo = OrderRepo(db)
+        self.service = WebhookService(self.repo, auth_service=SimpleNamespace(get_api_key=lambda key: key),
+                                      mode=INGEST_MODE_SYNC)
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_retried_delivery_is_reported_as_duplicate(self):
+        async def deliver_twice():
+            return [await self.service.receive("key", WebhookPayload(**PAYLOAD)) for _ in range(2)]
+
+        first, retry = anyio.run(deliver_twice)  # Stops the worker threads of run_in_threadpool on exit
+        self.assertEqual((first.error, first.message), (False, "Webhook received"))
+        self.assertEqual((retry.error, retry.message), (False, "Duplicate webhook ignored"))
+        self.assertEqual(len(list(self.repo.iter_webhook_logs())), 1)
+
+    def test_duplicate_gets_the_stored_ref_id(self):
+        saved, duplicate = self.repo.save_webhook_payload(WebhookPayload(**PAYLOAD, ref_id="first", fingerprint="f"))
+        self.assertFalse(duplicate)
+        again, duplicate = self.repo.save_webhook_payload(WebhookPayload(**PAYLOAD, ref_id="second", fingerprint="f"))
+        self.assertTrue(duplicate)
+        self.assertEqual((again.id, again.ref_id), (saved.id, "first"))
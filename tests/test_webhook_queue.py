@@ -0,0 +1,97 @@
+"""
+-- Created by: Ashok Kumar Pant
+-- Email: asokpant@gmail.com
+-- Created on: 18/10/2026
+"""
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest import TestCase
+
+from ibtrading.repo.webhook_queue import WebhookQueue
+from ibtrading.service.webhook_service import WebhookService, INGEST_MODE_QUEUE
+
+
+class TestWebhookQueue(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "queue.db")
+        self.queue = WebhookQueue(self.path)
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmpdir.cleanup()
+
+    def test_put_dedupes_on_key(self):
+        self.assertTrue(self.queue.put("a", {"action": "BUY"}))
+        self.assertFalse(self.queue.put("a", {"action": "BUY"}))
+        self.assertTrue(self.queue.put("b", {"action": "SELL"}))
+        self.assertEqual(self.queue.pending(), 2)
+
+    def test_claim_ack_keeps_key_until_purged(self):
+        self.queue.put("a", {"action": "BUY"})
+        batch = self.queue.claim(10)
+        self.assertEqual([p for _, p in batch], [{"action": "BUY"}])
+        self.assertEqual(self.queue.claim(10), [])
+        self.queue.ack([id for id, _ in batch])
+        self.assertFalse(self.queue.put("a", {"action": "BUY"}))
+
+    def test_release_and_recover_requeue(self):
+        self.queue.put("a", {"action": "BUY"})
+        self.queue.put("b", {"action": "SELL"})
+        first = self.queue.claim(1)
+        self.queue.release([id for id, _ in first])
+        self.assertEqual(self.queue.pending(), 2)
+
+        self.queue.claim(10)
+        self.queue.close()
+        self.queue = WebhookQueue(self.path)  # Restart with entries still claimed
+        self.assertEqual(self.queue.recover(), 2)
+        self.assertEqual(len(self.queue.claim(10)), 2)
+
+    def test_release_dead_letters_after_max_attempts(self):
+        self.queue.max_attempts = 2
+        self.queue.put("a", {"action": "BUY"})
+        ids = [id for id, _ in self.queue.claim(10)]
+        self.assertEqual(self.queue.release(ids), 0)
+        self.assertEqual(self.queue.pending(), 1)
+        ids = [id for id, _ in self.queue.claim(10)]
+        self.assertEqual(self.queue.release(ids), 1)
+        self.assertEqual((self.queue.pending(), self.queue.failed()), (0, 1))
+        self.assertEqual(self.queue.claim(10), [])
+        self.assertFalse(self.queue.put("a", {"action": "BUY"}))  # Still deduplicated
+
+
+class TestWebhookQueueDrain(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.queue = WebhookQueue(os.path.join(self.tmpdir.name, "queue.db"), max_attempts=2)
+        self.saved = []
+        self.service = WebhookService(SimpleNamespace(save_webhook_payloads=self._save), auth_service=object(),
+                                      mode=INGEST_MODE_QUEUE, queue=self.queue)
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmpdir.cleanup()
+
+    def _save(self, payloads):
+        # As OrderRepo.save_webhook_payloads: all or nothing
+        if any(p.symbol == "BAD" for p in payloads):
+            return []
+        self.saved.extend(p.symbol for p in payloads)
+        return payloads
+
+    def test_bad_payload_does_not_stall_the_queue(self):
+        for symbol in ("NQ", "BAD", "ES"):
+            self.queue.put(symbol, {"symbol": symbol, "action": "BUY"})
+        self.queue.put("invalid", {"symbol": "YM", "contracts": "many"})
+
+        self.assertEqual(self.service.drain(), 2)
+        self.assertEqual(self.saved, ["NQ", "ES"])
+        self.assertEqual((self.queue.pending(), self.queue.failed()), (1, 1))  # BAD retried, invalid dead-lettered
+
+        self.assertEqual(self.service.drain(), 0)
+        self.assertEqual((self.queue.pending(), self.queue.failed()), (0, 2))
+
+        self.queue.put("GC", {"symbol": "GC", "action": "BUY"})
+        self.assertEqual(self.service.drain(), 1)